@@ -0,0 +1,77 @@
+"""Recall and latency of `LSHVectorMemory` against exact scoring.
+
+Requires numpy:
+
+    python -m benchmarks.ann_retrieval --documents 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns.memory import KeywordVectorMemory, LSHVectorMemory
+from benchmarks.sparse_retrieval import _corpus
+
+console = Console()
+
+
+def _timed(call: Callable[[], object]) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+def _recall(expected: List[List[int]], found: List[List[int]], k: int) -> float:
+    hits = sum(len(set(want[:k]) & set(got[:k])) for want, got in zip(expected, found, strict=True))
+    return hits / max(1, sum(len(want[:k]) for want in expected))
+
+
+def main(
+    documents: int = typer.Option(100_000, help="Snippets in the corpus"),
+    queries: int = typer.Option(200, help="Queries per configuration"),
+    vocabulary: int = typer.Option(50_000, help="Distinct terms"),
+    limit: int = typer.Option(5, help="Top-k per query"),
+    tables: int = typer.Option(8, help="LSH tables"),
+    bits: int = typer.Option(12, help="Hyperplanes per table"),
+) -> None:
+    corpus = [{"content": text, "n": n} for n, text in enumerate(_corpus(documents, vocabulary, seed=3))]
+    # Queries are perturbed corpus snippets, so each has true near neighbours.
+    texts = [" ".join(item["content"].split()[::2]) for item in corpus[:: max(1, documents // queries)][:queries]]
+
+    def top(results) -> List[int]:
+        return [item["n"] for item, score in results if score > 0]
+
+    table = Table(title=f"ANN over {documents:,} snippets ({len(texts)} queries, top-{limit})")
+    for column in ("Scorer", "build s", "recall@1", f"recall@{limit}", "per query ms"):
+        table.add_column(column)
+
+    keyword = KeywordVectorMemory()
+    build, _ = _timed(lambda: [keyword.add(item) for item in corpus])
+    elapsed, _ = _timed(lambda: [keyword.query(text, limit=limit) for text in texts])
+    table.add_row("keyword (exact terms)", f"{build:.2f}", "-", "-", f"{elapsed / len(texts) * 1000:.3f}")
+
+    memory = LSHVectorMemory(tables=tables, bits=bits, exact_threshold=0)
+    build, _ = _timed(lambda: memory.extend(corpus))
+    elapsed, exact = _timed(lambda: [top(memory.query_exact(text, limit=limit)) for text in texts])
+    table.add_row("embedding brute force", f"{build:.2f}", "1.000", "1.000", f"{elapsed / len(texts) * 1000:.3f}")
+    for probes in (0, 1, 2, 4, 8, 16, 32):
+        elapsed, found = _timed(
+            lambda probes=probes: [top(memory.query(text, limit=limit, probes=probes)) for text in texts]
+        )
+        table.add_row(
+            f"lsh {tables}x{bits} probes={probes}",
+            "-",
+            f"{_recall(exact, found, 1):.3f}",
+            f"{_recall(exact, found, limit):.3f}",
+            f"{elapsed / len(texts) * 1000:.3f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
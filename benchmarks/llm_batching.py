@@ -0,0 +1,106 @@
+"""Throughput of BatchingLLMClient against a simulated provider with a concurrency cap.
+
+The stand-in backend sleeps `latency` per request plus `per_item` per extra prompt
+in a batch, and serves at most `--provider-slots` requests at once, as a rate-limited
+endpoint would. Callers fire `--calls` generations from `--threads` threads:
+
+    python -m benchmarks.llm_batching --calls 512 --threads 64
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns import AgentConfig
+from ai_agent_patterns.llm import BaseLLMClient, BatchingLLMClient
+
+console = Console()
+
+
+class _SimulatedProvider(BaseLLMClient):
+    def __init__(self, latency: float, per_item: float, slots: int) -> None:
+        super().__init__(name="simulated")
+        self.latency = latency
+        self.per_item = per_item
+        self.requests = 0
+        self._slots = threading.Semaphore(slots)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None) -> str:
+        return self._serve([prompt])[0]
+
+    def _serve(self, prompts: Sequence[str]) -> List[str]:
+        with self._slots:
+            with self._lock:
+                self.requests += 1
+            time.sleep(self.latency + self.per_item * (len(prompts) - 1))
+        return [f"echo:{prompt}" for prompt in prompts]
+
+
+class _BatchingProvider(_SimulatedProvider):
+    def generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        return self._serve(prompts)
+
+
+def _run(client: BaseLLMClient, calls: int, threads: int) -> Tuple[float, float, float]:
+    config = AgentConfig()
+
+    def call(index: int) -> float:
+        start = time.perf_counter()
+        client.generate(f"ticket {index}", config=config)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+    return calls / elapsed, statistics.median(latencies), latencies[int(0.99 * (len(latencies) - 1))]
+
+
+def main(
+    calls: int = typer.Option(512, help="Generations per scenario"),
+    threads: int = typer.Option(64, help="Concurrent callers"),
+    latency: float = typer.Option(0.05, help="Provider seconds per request"),
+    per_item: float = typer.Option(0.002, help="Extra provider seconds per additional prompt in a batch"),
+    provider_slots: int = typer.Option(8, help="Requests the provider serves at once"),
+    window_ms: float = typer.Option(5.0, help="Gateway batching window"),
+    max_batch: int = typer.Option(16, help="Gateway batch size cap"),
+) -> None:
+    table = Table(title=f"{calls} calls from {threads} threads, provider limited to {provider_slots} in flight")
+    for column in ("Client", "calls/s", "p50 ms", "p99 ms", "provider requests"):
+        table.add_column(column)
+    scenarios = (
+        ("direct", False, False),
+        ("gateway, pipelined", True, False),
+        ("gateway, batched", True, True),
+    )
+    for name, gateway, batches in scenarios:
+        provider = (_BatchingProvider if batches else _SimulatedProvider)(latency, per_item, provider_slots)
+        client: BaseLLMClient = provider
+        if gateway:
+            client = BatchingLLMClient(
+                provider, window_seconds=window_ms / 1000, max_batch=max_batch, max_workers=threads
+            )
+        rate, p50, p99 = _run(client, calls, threads)
+        if isinstance(client, BatchingLLMClient):
+            client.close()
+        table.add_row(name, f"{rate:,.0f}", f"{p50 * 1000:.1f}", f"{p99 * 1000:.1f}", str(provider.requests))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
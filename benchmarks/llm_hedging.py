@@ -0,0 +1,108 @@
+"""Tail latency and error rate of ResilientLLMClient against a faulty stand-in provider.
+
+The stand-in sleeps a lognormal latency around `--median-ms`, stalls for
+`--stall-ms` on a `--stall-rate` fraction of requests and fails a `--error-rate`
+fraction with a retryable 503. Callers issue `--calls` generations from
+`--threads` threads:
+
+    python -m benchmarks.llm_hedging --calls 2000 --threads 16
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns import AgentConfig, ResilienceConfig
+from ai_agent_patterns.llm import BaseLLMClient, ResilientLLMClient
+
+console = Console()
+
+
+class _ServiceUnavailableError(Exception):
+    status_code = 503
+
+
+class _FaultyProvider(BaseLLMClient):
+    def __init__(self, median: float, stall: float, stall_rate: float, error_rate: float, seed: int) -> None:
+        super().__init__(name="faulty")
+        self.median = median
+        self.stall = stall
+        self.stall_rate = stall_rate
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None) -> str:
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            latency = self.median * self._random.lognormvariate(0, 0.25)
+        if roll < self.stall_rate:
+            latency += self.stall
+        time.sleep(latency)
+        if roll > 1 - self.error_rate:
+            raise _ServiceUnavailableError("upstream unavailable")
+        return f"echo:{prompt}"
+
+
+def _run(client: BaseLLMClient, calls: int, threads: int) -> Tuple[List[float], int]:
+    config = AgentConfig()
+
+    def call(index: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            client.generate(f"ticket {index}", config=config)
+        except _ServiceUnavailableError:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(call, range(calls)))
+    latencies = sorted(latency for latency in results if latency is not None)
+    return latencies, calls - len(latencies)
+
+
+def main(
+    calls: int = typer.Option(2000, help="Generations per scenario"),
+    threads: int = typer.Option(16, help="Concurrent callers"),
+    median_ms: float = typer.Option(20.0, help="Median provider latency"),
+    stall_ms: float = typer.Option(400.0, help="Extra latency of a stalled request"),
+    stall_rate: float = typer.Option(0.03, help="Fraction of requests that stall"),
+    error_rate: float = typer.Option(0.02, help="Fraction of requests failing with a 503"),
+) -> None:
+    table = Table(title=f"{calls} calls, {stall_rate:.0%} stalls of {stall_ms:.0f} ms, {error_rate:.0%} errors")
+    for column in ("Client", "failed", "p50 ms", "p95 ms", "p99 ms", "provider requests"):
+        table.add_column(column)
+    scenarios = (
+        ("direct", None),
+        ("retries", ResilienceConfig(hedge=False, backoff_base=median_ms / 1000)),
+        ("retries + hedge", ResilienceConfig(backoff_base=median_ms / 1000)),
+    )
+    for name, settings in scenarios:
+        provider = _FaultyProvider(median_ms / 1000, stall_ms / 1000, stall_rate, error_rate, seed=7)
+        client: BaseLLMClient = provider if settings is None else ResilientLLMClient(provider, settings, seed=7)
+        latencies, failed = _run(client, calls, threads)
+        quantiles = statistics.quantiles(latencies, n=100)
+        table.add_row(
+            name,
+            str(failed),
+            f"{statistics.median(latencies) * 1000:.1f}",
+            f"{quantiles[94] * 1000:.1f}",
+            f"{quantiles[98] * 1000:.1f}",
+            str(provider.requests),
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
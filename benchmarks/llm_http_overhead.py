@@ -0,0 +1,112 @@
+"""Per-call overhead of OpenAILLMClient against a local stub Responses API.
+
+Compares building a fresh `OpenAI()` client for every call (the previous behaviour)
+with the persistent client and shared connection pool. Requires the `openai` extra:
+
+    python -m benchmarks.llm_http_overhead --calls 200
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns import AgentConfig
+from ai_agent_patterns.llm import OpenAILLMClient
+
+console = Console()
+
+_RESPONSE = json.dumps(
+    {
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": 0,
+        "model": "stub",
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_stub",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": "ok", "annotations": []}],
+            }
+        ],
+    }
+).encode("utf-8")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, *_args) -> None:
+        return
+
+
+def _measure(call: Callable[[], str], calls: int) -> List[float]:
+    call()  # warm-up: imports and the first connection
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main(calls: int = typer.Option(200, help="Calls per scenario")) -> None:
+    from openai import OpenAI
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+
+    config = AgentConfig(provider="openai", model="stub")
+    client = OpenAILLMClient(model="stub", http=config.http)
+
+    def fresh_client() -> str:
+        return OpenAI().responses.create(model="stub", input="ping").output_text
+
+    def persistent_client() -> str:
+        return client.generate("ping", config=config)
+
+    table = Table(title=f"OpenAILLMClient per-call overhead ({calls} calls)")
+    for column in ("Scenario", "mean ms", "p50 ms", "p95 ms"):
+        table.add_column(column)
+    try:
+        for label, call in (("OpenAI() per call", fresh_client), ("persistent client", persistent_client)):
+            timings = sorted(_measure(call, calls))
+            table.add_row(
+                label,
+                f"{statistics.fmean(timings):.2f}",
+                f"{timings[len(timings) // 2]:.2f}",
+                f"{timings[min(int(len(timings) * 0.95), len(timings) - 1)]:.2f}",
+            )
+    finally:
+        server.shutdown()
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
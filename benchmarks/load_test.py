@@ -0,0 +1,82 @@
+"""Offline load test of the `parallelization` pattern against SimulatedLLMClient.
+
+Each input fans out into `--subtasks` LLM calls. The simulated provider waits a
+lognormal time-to-first-token and streams at a fixed token rate, with optional
+429 and 503 injection, so the numbers reflect pool sizing and queueing rather
+than an instant mock. Compares `run_many` backends and concurrency levels,
+optionally behind the retry/hedging client:
+
+    python -m benchmarks.load_test --runs 200 --concurrency 4,16,64
+"""
+
+from __future__ import annotations
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns import AgentConfig, BatchStats, ResilienceConfig, SimulationConfig, registry
+from ai_agent_patterns.factory import resolve_llm
+from ai_agent_patterns.llm import BaseLLMClient, SimulatedLLMClient, SimulationStats
+
+console = Console()
+
+
+def main(
+    runs: int = typer.Option(200, help="Agent runs per scenario"),
+    subtasks: int = typer.Option(4, help="LLM calls each run fans out into"),
+    concurrency: str = typer.Option("4,16,64", help="Comma-separated run_many max_concurrency values"),
+    backends: str = typer.Option("thread,asyncio", help="Comma-separated run_many backends"),
+    first_token_ms: float = typer.Option(150.0, help="Median time to first token"),
+    tokens_per_second: float = typer.Option(400.0, help="Simulated decode rate"),
+    output_tokens: int = typer.Option(60, help="Mean output length"),
+    rate_limit_rate: float = typer.Option(0.0, help="Share of calls failing with a 429"),
+    error_rate: float = typer.Option(0.0, help="Share of calls failing with a 503"),
+    retries: bool = typer.Option(False, help="Wrap the provider in ResilientLLMClient"),
+) -> None:
+    simulation = SimulationConfig(
+        first_token_seconds=first_token_ms / 1000,
+        tokens_per_second=tokens_per_second,
+        output_tokens=output_tokens,
+        rate_limit_rate=rate_limit_rate,
+        error_rate=error_rate,
+    )
+    config = AgentConfig(
+        provider="simulated",
+        simulation=simulation,
+        resilience=ResilienceConfig() if retries else None,
+    )
+    agent = registry.get("parallelization").build_agent(config)
+    inputs = ["; ".join(f"ticket {run} part {part}" for part in range(subtasks)) for run in range(runs)]
+
+    provider = resolve_llm(config)
+    while isinstance(getattr(provider, "inner", None), BaseLLMClient):
+        provider = provider.inner  # type: ignore[attr-defined]
+    assert isinstance(provider, SimulatedLLMClient)
+
+    table = Table(title=f"{runs} parallelization runs x {subtasks} simulated LLM calls")
+    columns = ("backend", "concurrency", "runs/s", "completed", "failed", "requests", "429s", "503s", "busy s")
+    for column in columns:
+        table.add_column(column)
+    for backend in backends.split(","):
+        for limit in (int(value) for value in concurrency.split(",")):
+            provider.stats = SimulationStats()
+            stats = BatchStats()
+            for _ in agent.run_many(inputs, max_concurrency=limit, backend=backend, stats=stats):
+                pass
+            table.add_row(
+                backend,
+                str(limit),
+                f"{stats.throughput:,.1f}",
+                f"{stats.completed}/{runs}",
+                str(stats.failed),
+                str(provider.stats.requests),
+                str(provider.stats.rate_limited),
+                str(provider.stats.errors),
+                f"{provider.stats.busy_seconds:,.1f}",
+            )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
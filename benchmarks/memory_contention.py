@@ -0,0 +1,90 @@
+"""Query throughput of shared memory stores while threads read and write concurrently.
+
+Compares a `KeywordVectorMemory` guarded by one lock (the simplest safe option)
+with the lock-free-read `ConcurrentKeywordVectorMemory`:
+
+    python -m benchmarks.memory_contention --documents 20000 --threads 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns.memory import ConcurrentKeywordVectorMemory, KeywordVectorMemory
+from benchmarks.sparse_retrieval import _corpus
+
+console = Console()
+
+
+class LockedKeywordVectorMemory(KeywordVectorMemory):
+    """Baseline: every call holds one store-wide lock."""
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        super().__post_init__()
+
+    def add(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            super().add(item)
+
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            return super().query(text, limit)
+
+
+def _worker(memory: Any, texts: List[str], writes: List[Dict[str, Any]], write_every: int) -> List[float]:
+    latencies = []
+    for index, text in enumerate(texts):
+        if write_every and index % write_every == 0 and writes:
+            memory.add(writes.pop())
+        start = time.perf_counter()
+        memory.query(text, limit=5)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _run(factory: Callable[[], Any], corpus: List[str], texts: List[str], threads: int, write_every: int):
+    memory = factory()
+    for text in corpus:
+        memory.add({"content": text})
+    shares = [texts[offset::threads] for offset in range(threads)]
+    writes = [[{"content": text} for text in corpus[offset::threads][:200]] for offset in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(_worker, [memory] * threads, shares, writes, [write_every] * threads))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for result in results for latency in result)
+    return len(latencies) / elapsed, statistics.median(latencies), latencies[int(0.99 * (len(latencies) - 1))]
+
+
+def main(
+    documents: int = typer.Option(20_000, help="Snippets in the corpus"),
+    queries: int = typer.Option(800, help="Queries per run, split across threads"),
+    vocabulary: int = typer.Option(20_000, help="Distinct terms"),
+    threads: str = typer.Option("1,2,4,8", help="Comma-separated thread counts"),
+    write_every: int = typer.Option(10, help="Each thread adds one item every N queries (0 = read-only)"),
+) -> None:
+    corpus = _corpus(documents, vocabulary, seed=3)
+    texts = _corpus(queries, vocabulary, seed=5)
+    random.Random(0).shuffle(texts)
+    table = Table(title=f"{documents:,} snippets, {queries} queries, one write per {write_every} queries")
+    for column in ("Store", "threads", "queries/s", "p50 ms", "p99 ms"):
+        table.add_column(column)
+    for name, factory in (("locked", LockedKeywordVectorMemory), ("concurrent", ConcurrentKeywordVectorMemory)):
+        for count in (int(value) for value in threads.split(",")):
+            rate, p50, p99 = _run(factory, corpus, texts, count, write_every)
+            table.add_row(name, str(count), f"{rate:,.0f}", f"{p50 * 1000:.2f}", f"{p99 * 1000:.2f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,69 @@
+"""Footprint, recall and latency of quantized `LSHVectorMemory` vector storage.
+
+Every configuration scans all vectors (no LSH pruning), so recall differences
+come from quantization alone. Requires numpy:
+
+    python -m benchmarks.quantized_vectors --documents 200000 --queries 200
+"""
+
+from __future__ import annotations
+
+import time
+from typing import List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns.memory import LSHVectorMemory
+from benchmarks.sparse_retrieval import _corpus
+
+console = Console()
+
+
+def main(
+    documents: int = typer.Option(200_000, help="Snippets in the corpus"),
+    queries: int = typer.Option(200, help="Queries per configuration"),
+    vocabulary: int = typer.Option(50_000, help="Distinct terms"),
+    dimensions: int = typer.Option(256, help="Embedding dimensions"),
+    limit: int = typer.Option(10, help="Top-k per query"),
+    rerank: int = typer.Option(50, help="Candidates re-scored at full precision"),
+) -> None:
+    corpus = [{"content": text, "n": n} for n, text in enumerate(_corpus(documents, vocabulary, seed=3))]
+    step = max(1, documents // queries)
+    texts = [" ".join(item["content"].split()[::2]) for item in corpus[::step][:queries]]
+
+    def run(memory: LSHVectorMemory) -> tuple:
+        start = time.perf_counter()
+        found = [[item["n"] for item, score in memory.query(text, limit=limit) if score > 0] for text in texts]
+        return found, (time.perf_counter() - start) / len(texts)
+
+    table = Table(title=f"{documents:,} x {dimensions} vectors, {len(texts)} queries, top-{limit}")
+    for column in ("Storage", "vector MB", "vs float64", f"recall@{limit}", "per query ms"):
+        table.add_column(column)
+    float64_bytes = documents * dimensions * 8
+    baseline: List[List[int]] = []
+    configurations = [("float32", 0), ("float16", 0), ("float16", rerank), ("int8", 0), ("int8", rerank)]
+    for precision, candidates in configurations:
+        memory = LSHVectorMemory(
+            dimensions=dimensions, exact_threshold=documents, precision=precision, rerank=candidates
+        )
+        memory.extend(corpus)
+        found, latency = run(memory)
+        if not baseline:
+            baseline = found
+        hits = sum(len(set(want) & set(got)) for want, got in zip(baseline, found, strict=True))
+        recall = hits / max(1, sum(len(want) for want in baseline))
+        label = precision if not candidates else f"{precision} + rerank {candidates}"
+        table.add_row(
+            label,
+            f"{memory.vector_bytes() / 2**20:.1f}",
+            f"{float64_bytes / memory.vector_bytes():.1f}x",
+            f"{recall:.3f}",
+            f"{latency * 1000:.2f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,71 @@
+"""Query latency of the retrieval memory backends on a synthetic snippet corpus.
+
+Requires numpy and scipy:
+
+    python -m benchmarks.sparse_retrieval --documents 100000 --queries 200
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns.memory import KeywordVectorMemory, SparseVectorMemory
+
+console = Console()
+
+
+def _corpus(documents: int, vocabulary: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    words = [f"term{idx}" for idx in range(vocabulary)]
+    # Zipf-like weights so a few terms are common and most are rare, as in real text.
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return [" ".join(rng.choices(words, weights, k=rng.randint(8, 24))) for _ in range(documents)]
+
+
+def _timed(call: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def main(
+    documents: int = typer.Option(100_000, help="Snippets in the corpus"),
+    queries: int = typer.Option(200, help="Queries per backend"),
+    vocabulary: int = typer.Option(50_000, help="Distinct terms"),
+    limit: int = typer.Option(5, help="Top-k per query"),
+) -> None:
+    corpus = _corpus(documents, vocabulary, seed=3)
+    texts = _corpus(queries, vocabulary, seed=5)
+    table = Table(title=f"Retrieval over {documents:,} snippets ({queries} queries, top-{limit})")
+    for column in ("Backend", "build s", "per query ms", "batched per query ms"):
+        table.add_column(column)
+
+    keyword = KeywordVectorMemory()
+    build = _timed(lambda: [keyword.add({"content": text}) for text in corpus])
+    single = _timed(lambda: [keyword.query(text, limit=limit) for text in texts])
+    table.add_row("keyword", f"{build:.2f}", f"{single / queries * 1000:.3f}", "-")
+
+    for weighting in ("cosine", "bm25"):
+        memory = SparseVectorMemory(weighting=weighting)
+        build = _timed(
+            lambda memory=memory: (memory.extend({"content": text} for text in corpus), memory.matrix())
+        )
+        single = _timed(lambda memory=memory: [memory.query(text, limit=limit) for text in texts])
+        batched = _timed(lambda memory=memory: memory.query_batch(texts, limit=limit))
+        table.add_row(
+            f"sparse/{weighting}",
+            f"{build:.2f}",
+            f"{single / queries * 1000:.3f}",
+            f"{batched / queries * 1000:.3f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
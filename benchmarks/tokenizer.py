@@ -0,0 +1,88 @@
+"""Tokenizer and keyword-memory throughput on real prose (standard-library docstrings).
+
+    python -m benchmarks.tokenizer --repeat 5
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import time
+from collections import Counter
+from typing import Callable, List
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from ai_agent_patterns.memory import KeywordVectorMemory
+from ai_agent_patterns.memory.text import query_terms, tokenize
+
+console = Console()
+
+MODULES = (
+    "argparse asyncio collections concurrent.futures csv datetime decimal email functools http.client "
+    "inspect json logging os pathlib re sqlite3 statistics string subprocess threading typing unittest "
+    "urllib.request xml.etree.ElementTree zipfile"
+).split()
+
+
+def legacy_tokenize(text: str) -> List[str]:
+    """The per-character implementation `memory.text.tokenize` replaced."""
+    tokens: List[str] = []
+    for raw in text.split():
+        cleaned = "".join(ch for ch in raw.lower() if ch.isalnum())
+        if cleaned:
+            tokens.append(cleaned)
+    return tokens
+
+
+def _corpus() -> List[str]:
+    paragraphs: List[str] = []
+    for name in MODULES:
+        module = importlib.import_module(name)
+        for _member, value in inspect.getmembers(module):
+            doc = inspect.getdoc(value) if callable(value) or inspect.isclass(value) else None
+            if doc:
+                paragraphs.extend(part for part in doc.split("\n\n") if len(part.split()) >= 5)
+    return list(dict.fromkeys(paragraphs))
+
+
+def _per_second(count: int, call: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main(repeat: int = typer.Option(5, help="Timing repetitions (best is reported)")) -> None:
+    corpus = _corpus()
+    words = sum(len(text.split()) for text in corpus)
+    queries = [" ".join(text.split()[:6]) for text in corpus[::25]]
+    table = Table(title=f"{len(corpus):,} docstring paragraphs, {words:,} words")
+    for column in ("Operation", "per second", "speedup"):
+        table.add_column(column)
+
+    legacy = _per_second(len(corpus), lambda: [legacy_tokenize(text) for text in corpus], repeat)
+    current = _per_second(len(corpus), lambda: [tokenize(text) for text in corpus], repeat)
+    table.add_row("tokenize, per-character (old)", f"{legacy:,.0f} docs", "1.0x")
+    table.add_row("tokenize, translate/regex", f"{current:,.0f} docs", f"{current / legacy:.1f}x")
+
+    uncached = _per_second(len(queries), lambda: [Counter(tokenize(text)) for text in queries], repeat)
+    [query_terms(text) for text in queries]
+    cached = _per_second(len(queries), lambda: [query_terms(text) for text in queries], repeat)
+    table.add_row("query terms, computed", f"{uncached:,.0f} queries", "1.0x")
+    table.add_row("query terms, memoized", f"{cached:,.0f} queries", f"{cached / uncached:.1f}x")
+
+    build = _per_second(len(corpus), lambda: KeywordVectorMemory([{"content": t} for t in corpus]), 1)
+    memory = KeywordVectorMemory([{"content": text} for text in corpus])
+    searched = _per_second(len(queries), lambda: [memory.query(text, limit=5) for text in queries], repeat)
+    table.add_row("KeywordVectorMemory add", f"{build:,.0f} docs", "-")
+    table.add_row("KeywordVectorMemory query", f"{searched:,.0f} queries", "-")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    typer.run(main)
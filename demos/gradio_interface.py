@@ -1,24 +1,29 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Tuple
 
 import gradio as gr
 
-from ai_agent_patterns import AgentConfig, DemoConfig, registry
+from ai_agent_patterns import AgentConfig, DemoConfig, client_pool, registry
+from ai_agent_patterns.core import stream_events
 from .smart_support_triage import load_tickets, run_smart_support_demo
 
 
-def _run_pattern(pattern: str, prompt: str, provider: str, model: str, mock: bool) -> Dict[str, Any]:
+def _stream_pattern(pattern: str, prompt: str, provider: str, model: str, mock: bool) -> Iterator[Tuple[str, str]]:
     definition = registry.get(pattern)
     agent_config = AgentConfig(provider="mock" if mock else provider, model=model)
     demo_config = DemoConfig(agent_config=agent_config, input_text=prompt or "Help the customer.")
-    result = definition.demo(demo_config)
-    return {
-        "output": result.output,
-        "transcript": json.dumps(result.transcript, indent=2),
-        "markdown": result.to_markdown(),
-    }
+    sections: list[str] = []
+    for event in stream_events(lambda: definition.demo(demo_config)):
+        if event.kind == "step_started":
+            sections.append(f"**{event.step}** — ")
+        elif event.kind == "token":
+            sections[-1] += event.content
+        elif event.kind == "final" and event.result is not None:
+            yield event.result.to_markdown(), json.dumps(event.result.transcript, indent=2)
+            return
+        yield "\n\n".join(sections), "[]"
 
 
 def _run_support(ticket_id: str, provider: str, model: str, mock: bool) -> Dict[str, Any]:
@@ -58,8 +63,7 @@ def create_app() -> gr.Blocks:
             transcript_json = gr.JSON(label="Transcript")
 
             def on_run(pattern, prompt, provider, model, mock):
-                result = _run_pattern(pattern, prompt, provider, model, mock)
-                return result["markdown"], result["transcript"]
+                yield from _stream_pattern(pattern, prompt, provider, model, mock)
 
             run_button.click(
                 on_run,
@@ -90,4 +94,8 @@ def create_app() -> gr.Blocks:
 
 
 if __name__ == "__main__":
-    create_app().launch()
+    client_pool.warm_up([AgentConfig()])
+    try:
+        create_app().launch()
+    finally:
+        client_pool.shutdown()
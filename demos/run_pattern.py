@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
+from typing import Callable, Optional
 
 import typer
 from rich.console import Console
 
-from ai_agent_patterns import AgentConfig, DemoConfig, registry
+from ai_agent_patterns import AgentConfig, AgentRunResult, DemoConfig, registry
+from ai_agent_patterns.core import stream_events
 
 console = Console()
 
@@ -18,6 +19,7 @@ def main(
     model: str = typer.Option("mock-llm", help="LLM model identifier"),
     transcript_out: Optional[str] = typer.Option(None, "--transcript-out", help="Save transcript JSON"),
     list_patterns: bool = typer.Option(False, "--list", help="List available patterns and exit"),
+    stream: bool = typer.Option(False, "--stream", help="Print step events and tokens as they arrive"),
 ) -> None:
     if list_patterns:
         for metadata in sorted(registry.metadata(), key=lambda m: m.name):
@@ -27,7 +29,10 @@ def main(
     definition = registry.get(pattern)
     agent_config = AgentConfig(provider=provider, model=model)
     demo_config = DemoConfig(agent_config=agent_config, input_text=input_text or "Assist the user.")
-    result = definition.demo(demo_config)
+    if stream:
+        result = _stream_result(lambda: definition.demo(demo_config))
+    else:
+        result = definition.demo(demo_config)
     console.print(result.to_markdown())
     if transcript_out:
         with open(transcript_out, "w", encoding="utf-8") as fh:
@@ -35,5 +40,19 @@ def main(
         console.print(f"Transcript saved to {transcript_out}")
 
 
+def _stream_result(run: Callable[[], AgentRunResult]) -> AgentRunResult:
+    result: Optional[AgentRunResult] = None
+    for event in stream_events(run):
+        if event.kind == "step_started":
+            console.print(f"\n[bold]{event.step}[/] ", end="")
+        elif event.kind == "token":
+            console.print(event.content, end="", markup=False, highlight=False)
+        elif event.kind == "final":
+            result = event.result
+    console.print()
+    assert result is not None
+    return result
+
+
 if __name__ == "__main__":
     typer.run(main)
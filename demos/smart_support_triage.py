@@ -3,9 +3,11 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 from ai_agent_patterns import AgentConfig, registry
+from ai_agent_patterns.types import AgentState
+from ai_agent_patterns.workflows.dag import DagStep, declare_step, run_dag
 
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "support_tickets.json"
 
@@ -51,25 +53,16 @@ def run_smart_support_demo(ticket_id: str, *, mock: bool = True, provider: str =
     context = {"ticket": ticket, "demo": True}
     agent_config = AgentConfig(provider="mock" if mock else provider)
 
-    routing_definition = registry.get("routing")
-    routing_agent = routing_definition.build_agent(agent_config)
-    routing_result = routing_agent.run(prompt, context=context)
-    route_decision = routing_result.transcript[-1]["content"]
-
-    planning_definition = registry.get("planning")
-    planning_agent = planning_definition.build_agent(agent_config)
-    plan_result = planning_agent.run(prompt, context=context)
+    def agent_step(key: str, pattern: str, build_input: Callable[[AgentState], str], reads=()) -> DagStep:
+        agent = registry.get(pattern).build_agent(agent_config)
 
-    rag_definition = registry.get("knowledge_retrieval")
-    rag_agent = rag_definition.build_agent(agent_config)
-    rag_result = rag_agent.run(prompt, context=context)
+        def _run(state: AgentState) -> AgentState:
+            state.scratchpad[key] = agent.run(build_input(state), context=context)
+            return state
 
-    reflection_definition = registry.get("reflection")
-    reflection_agent = reflection_definition.build_agent(agent_config)
-    answer_result = reflection_agent.run(prompt + "\n\n" + rag_result.output, context=context)
+        _run.__name__ = key
+        return declare_step(_run, reads=reads, writes=[key])
 
-    priority_definition = registry.get("prioritization")
-    priority_agent = priority_definition.build_agent(agent_config)
     priority_input = "\n".join(
         [
             "Resolve production outage now",
@@ -77,7 +70,28 @@ def run_smart_support_demo(ticket_id: str, *, mock: bool = True, provider: str =
             f"Follow up with {ticket['customer']}",
         ]
     )
-    priority_result = priority_agent.run(priority_input, context=context)
+    state = run_dag(
+        [
+            agent_step("routing", "routing", lambda state: prompt),
+            agent_step("plan", "planning", lambda state: prompt),
+            agent_step("rag", "knowledge_retrieval", lambda state: prompt),
+            agent_step(
+                "answer",
+                "reflection",
+                lambda state: prompt + "\n\n" + state.scratchpad["rag"].output,
+                reads=["rag"],
+            ),
+            agent_step("priority", "prioritization", lambda state: priority_input),
+        ],
+        AgentState(input_text=prompt, context=context),
+    )
+    results = state.scratchpad
+    routing_result = results["routing"]
+    route_decision = routing_result.transcript[-1]["content"]
+    plan_result = results["plan"]
+    rag_result = results["rag"]
+    answer_result = results["answer"]
+    priority_result = results["priority"]
     priority_line = priority_result.output.splitlines()[0]
 
     transcript = {
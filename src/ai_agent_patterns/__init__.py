@@ -1,15 +1,41 @@
-from .config import AgentConfig, DemoConfig
+from .config import (
+    AgentConfig,
+    BatchingConfig,
+    CacheConfig,
+    DemoConfig,
+    EmbeddingConfig,
+    HTTPConfig,
+    MemoryConfig,
+    RateLimitConfig,
+    ResilienceConfig,
+    SessionConfig,
+    SimulationConfig,
+)
 from .core import Agent
-from .factory import resolve_llm
+from .factory import client_pool, resolve_embedder, resolve_llm, resolve_memory
 from .patterns import registry
-from .types import AgentRunResult, PatternMetadata
+from .types import AgentRunResult, BatchStats, EmbeddingClient, PatternMetadata
 
 __all__ = [
     "Agent",
     "AgentConfig",
+    "BatchingConfig",
+    "CacheConfig",
     "DemoConfig",
+    "EmbeddingConfig",
+    "HTTPConfig",
+    "MemoryConfig",
+    "RateLimitConfig",
+    "ResilienceConfig",
+    "SessionConfig",
+    "SimulationConfig",
     "AgentRunResult",
+    "BatchStats",
+    "EmbeddingClient",
     "PatternMetadata",
+    "client_pool",
+    "resolve_embedder",
     "resolve_llm",
+    "resolve_memory",
     "registry",
 ]
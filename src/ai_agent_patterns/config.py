@@ -1,7 +1,175 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CacheConfig:
+    """Response cache settings applied by `resolve_llm`.
+
+    `path` enables the persistent SQLite tier; `None` keeps responses in memory only.
+    """
+
+    max_entries: int = 1024
+    ttl_seconds: Optional[float] = None
+    path: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class HTTPConfig:
+    """Connection pool and timeout settings for HTTP-backed LLM clients.
+
+    Clients built from equal settings share one pool for the life of the process.
+    """
+
+    timeout: float = 60.0
+    connect_timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    max_retries: int = 2
+
+
+@dataclass(frozen=True, slots=True)
+class BatchingConfig:
+    """Micro-batching settings applied by `resolve_llm`.
+
+    Concurrent `generate` calls are held for up to `window_seconds` and sent
+    `max_batch` at a time, on at most `max_workers` threads.
+    """
+
+    window_seconds: float = 0.005
+    max_batch: int = 16
+    max_workers: int = 32
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitConfig:
+    """Per provider/model call limits applied by `resolve_llm`.
+
+    `requests_per_second` and `tokens_per_minute` (prompt estimate plus
+    `max_tokens`) are token buckets; `None` leaves that dimension unlimited.
+    Concurrency starts at `initial_concurrency` and adapts between
+    `min_concurrency` and `max_concurrency`: it grows by `increase` per round of
+    successful calls and is multiplied by `decrease` on a 429 or timeout.
+    """
+
+    requests_per_second: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    increase: float = 1.0
+    decrease: float = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class ResilienceConfig:
+    """Retry and hedging settings applied by `resolve_llm`.
+
+    Failed calls are retried up to `max_attempts` in total, sleeping a random
+    time up to `backoff_base * 2**attempt` (capped at `backoff_max`) between
+    attempts. With `hedge`, a call slower than the model's recent
+    `hedge_percentile` latency (over the last `latency_window` calls, once
+    `hedge_min_samples` are known) gets a duplicate request; sync attempts run on
+    at most `max_workers` threads.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.1
+    backoff_max: float = 2.0
+    hedge: bool = True
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    latency_window: int = 512
+    max_workers: int = 64
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationConfig:
+    """Timing and fault profile of the offline "simulated" provider.
+
+    `latency` picks how time-to-first-token is drawn: "fixed" at
+    `first_token_seconds`, "lognormal" around that median with `latency_sigma`,
+    or "histogram", replaying `histogram` `(seconds, weight)` buckets such as
+    measured production latencies. Output lengths are lognormal around
+    `output_tokens` with `output_tokens_sigma` (0 keeps them fixed), capped at
+    `AgentConfig.max_tokens`, and stream at `tokens_per_second` (0 is instant).
+    `rate_limit_rate` and `error_rate` are the shares of requests failing with a
+    429 or a 503. `seed` makes the draws reproducible.
+    """
+
+    latency: str = "lognormal"
+    first_token_seconds: float = 0.3
+    latency_sigma: float = 0.5
+    histogram: Tuple[Tuple[float, float], ...] = ()
+    tokens_per_second: float = 80.0
+    output_tokens: int = 120
+    output_tokens_sigma: float = 0.4
+    rate_limit_rate: float = 0.0
+    error_rate: float = 0.0
+    seed: Optional[int] = 0
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryConfig:
+    """Retrieval memory settings applied by `resolve_memory`.
+
+    `backend` is "keyword" (pure Python), "sparse" (numpy/scipy CSR matrix) or
+    "lsh" (numpy approximate nearest neighbours over hashed embeddings);
+    `weighting` selects "cosine" or "bm25" scoring for the sparse backend.
+    `lsh_tables`, `lsh_bits` and `lsh_probes` trade recall for latency on the
+    "lsh" backend, which embeds text with `AgentConfig.embedding` and stores
+    vectors at `precision` ("float32", "float16" or "int8"), optionally
+    re-scoring the best `rerank` candidates at full precision.
+    `index_path` opens a sparse index written by `memory.ingest` instead of
+    starting empty. `query_cache_size` bounds the `knowledge_retrieval` query
+    result cache; `None` disables it.
+    """
+
+    backend: str = "keyword"
+    weighting: str = "cosine"
+    index_path: Optional[str] = None
+    lsh_tables: int = 8
+    lsh_bits: int = 12
+    lsh_probes: int = 2
+    precision: str = "float32"
+    rerank: int = 0
+    query_cache_size: Optional[int] = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class EmbeddingConfig:
+    """Embedding provider settings applied by `resolve_embedder`.
+
+    `provider` "hashing" is the offline `HashingEmbedder`. Texts go to the
+    provider at most `batch_size` per call. `cache` keeps vectors under a hash of
+    their content (`None` disables it); give it a `path` to reuse them across
+    processes.
+    """
+
+    provider: str = "hashing"
+    dimensions: int = 256
+    batch_size: int = 64
+    cache: Optional[CacheConfig] = CacheConfig(max_entries=10_000)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionConfig:
+    """Per-session memory limits for `memory.sessions.SessionStore`.
+
+    `spill_path` keeps evicted sessions in SQLite so they can be rehydrated later;
+    `None` drops them. Spilled sessions not touched for `spill_ttl_seconds` are
+    pruned (`None` keeps them forever).
+    """
+
+    max_sessions: int = 10_000
+    idle_ttl_seconds: Optional[float] = None
+    max_total_tokens: Optional[int] = None
+    spill_path: Optional[str] = None
+    spill_ttl_seconds: Optional[float] = 7 * 24 * 3600.0
+    conversation_capacity: int = 20
 
 
 @dataclass(slots=True)
@@ -15,6 +183,16 @@ class AgentConfig:
     use_tools: bool = True
     budget: Optional[float] = None
     extras: Dict[str, Any] = field(default_factory=dict)
+    cache: Optional[CacheConfig] = None
+    http: HTTPConfig = field(default_factory=HTTPConfig)
+    batching: Optional[BatchingConfig] = None
+    rate_limit: Optional[RateLimitConfig] = None
+    resilience: Optional[ResilienceConfig] = None
+    single_flight: bool = False
+    simulation: SimulationConfig = field(default_factory=SimulationConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
+    sessions: SessionConfig = field(default_factory=SessionConfig)
 
 
 @dataclass(slots=True)
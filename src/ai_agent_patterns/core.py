@@ -1,8 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import inspect
+import itertools
 import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
 
 try:  # pragma: no cover - fallback when rich is unavailable
     from rich.console import Console
@@ -33,7 +50,16 @@ except ImportError:  # pragma: no cover
             return "\n".join(self._buffer)
 
 from .config import AgentConfig
-from .types import AgentRunResult, AgentState, AgentStep, LLMClient
+from .llm.base import token_sink
+from .types import (
+    AgentEvent,
+    AgentRunResult,
+    AgentState,
+    AgentStep,
+    AsyncAgentStep,
+    BatchStats,
+    LLMClient,
+)
 
 logger = logging.getLogger("ai_agent_patterns.agent")
 
@@ -48,6 +74,179 @@ class Agent:
     config: AgentConfig = field(default_factory=AgentConfig)
 
     def run(self, input_text: str, context: Optional[Dict[str, object]] = None) -> AgentRunResult:
+        observer = _run_observer.get()
+        if observer is not None:
+            return self._run_observed(input_text, context, observer)
+        state = self._initial_state(input_text, context)
+        for step in self.steps:
+            state = step(state)
+            if inspect.isawaitable(state):
+                _discard_awaitable(state)
+                raise TypeError(f"Step '{_step_name(step)}' is asynchronous; use Agent.arun instead.")
+        return self._result(state)
+
+    async def arun(
+        self,
+        input_text: str,
+        context: Optional[Dict[str, object]] = None,
+        *,
+        executor: Optional[Executor] = None,
+    ) -> AgentRunResult:
+        """Coroutine variant of `run` accepting both plain and `async def` steps.
+
+        Plain steps are offloaded to `executor` so blocking LLM calls inside them
+        do not stall the event loop shared with other concurrent runs. Without one
+        they use the loop's default executor, which caps concurrent plain steps at
+        `min(32, cpu_count + 4)`; pass an executor sized for the runs you gather.
+        """
+        state = self._initial_state(input_text, context)
+        for step in self.steps:
+            state = await _run_step_async(step, state, executor)
+        return self._result(state)
+
+    def stream(self, input_text: str, context: Optional[Dict[str, object]] = None) -> Iterator[AgentEvent]:
+        """Run the agent in a worker thread, yielding events as they happen.
+
+        Token events are produced by LLM clients that support `generate_stream`;
+        other clients surface their full response as a single token event.
+        """
+        return stream_events(lambda: self.run(input_text, context))
+
+    async def astream(
+        self,
+        input_text: str,
+        context: Optional[Dict[str, object]] = None,
+        *,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """Async-iterator variant of `stream` following the `arun` step semantics."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        def emit(event: object) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        async def driver() -> None:
+            try:
+                state = self._initial_state(input_text, context)
+                for step in self.steps:
+                    name = _step_name(step)
+                    emit(AgentEvent(kind="step_started", step=name))
+                    start = len(state.transcript)
+                    with token_sink(_token_emitter(emit, name)):
+                        state = await _run_step_async(step, state, executor)
+                    emit(_step_finished(name, state, start))
+                result = self._result(state)
+                emit(AgentEvent(kind="final", content=result.output, result=result))
+            except Exception as exc:
+                emit(exc)
+            finally:
+                emit(finished)
+
+        task = asyncio.create_task(driver())
+        try:
+            while True:
+                event = await events.get()
+                if event is finished:
+                    return
+                if isinstance(event, BaseException):
+                    raise event
+                yield event
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def run_many(
+        self,
+        inputs: Iterable[str],
+        contexts: Optional[Iterable[Optional[Dict[str, object]]]] = None,
+        *,
+        max_concurrency: int = 8,
+        ordered: bool = False,
+        backend: str = "thread",
+        stats: Optional[BatchStats] = None,
+    ) -> Iterator[AgentRunResult]:
+        """Stream results for many inputs with at most `max_concurrency` runs in flight.
+
+        `backend` is one of "thread", "process" or "asyncio". The process backend
+        rebuilds the agent in each worker from the pattern registry because step
+        closures cannot be pickled. Results carry `input_index`; with `ordered=False`
+        they are yielded as runs complete. A run that raises does not stop the
+        batch: it yields an empty result whose `error` holds the exception and is
+        counted in `stats.failed`. Pass a `BatchStats` to observe progress.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        stats = stats if stats is not None else BatchStats()
+        stats.started_at = time.perf_counter()
+        stats.finished_at = None
+        context_iter = itertools.repeat(None) if contexts is None else contexts
+        jobs = enumerate(zip(inputs, context_iter, strict=contexts is not None))
+        try:
+            with _batch_submitter(self, backend, max_concurrency) as submit:
+                inflight: deque[tuple[int, Future]] = deque()
+
+                def fill() -> None:
+                    while len(inflight) < max_concurrency:
+                        try:
+                            index, (input_text, context) = next(jobs)
+                        except StopIteration:
+                            return
+                        inflight.append((index, submit(input_text, context)))
+                        stats.submitted += 1
+
+                fill()
+                while inflight:
+                    if ordered:
+                        ready = [inflight.popleft()]
+                    else:
+                        done, _ = wait([future for _, future in inflight], return_when=FIRST_COMPLETED)
+                        ready = [pair for pair in inflight if pair[1] in done]
+                        for pair in ready:
+                            inflight.remove(pair)
+                    for index, future in ready:
+                        result = _batch_result(self.name, index, future, stats)
+                        fill()
+                        yield result
+                    fill()
+        finally:
+            stats.finished_at = time.perf_counter()
+            logger.info(
+                "run_many %s: %d/%d runs in %.2fs (%.1f runs/s, %d failed)",
+                self.name,
+                stats.completed,
+                stats.submitted,
+                stats.elapsed,
+                stats.throughput,
+                stats.failed,
+            )
+
+    def _run_observed(
+        self, input_text: str, context: Optional[Dict[str, object]], observer: "_RunObserver"
+    ) -> AgentRunResult:
+        """`run`, reporting step and token events to the enclosing `stream_events`."""
+        state = self._initial_state(input_text, context)
+        for step in self.steps:
+            if observer.cancelled.is_set():
+                raise _StreamCancelledError()
+            name = _step_name(step)
+            observer.emit(AgentEvent(kind="step_started", step=name))
+            start = len(state.transcript)
+            # Agents run inside a step stream their tokens but not their own step events.
+            nested = _run_observer.set(None)
+            try:
+                with token_sink(_token_emitter(observer.emit, name)):
+                    state = step(state)
+            finally:
+                _run_observer.reset(nested)
+            if inspect.isawaitable(state):
+                _discard_awaitable(state)
+                raise TypeError(f"Step '{name}' is asynchronous; use Agent.astream instead.")
+            observer.emit(_step_finished(name, state, start))
+        return self._result(state)
+
+    def _initial_state(self, input_text: str, context: Optional[Dict[str, object]]) -> AgentState:
         state = AgentState(
             input_text=input_text,
             context=dict(context or {}),
@@ -55,8 +254,9 @@ class Agent:
             transcript=[],
         )
         state.context.setdefault("agent_config", self.config)
-        for step in self.steps:
-            state = step(state)
+        return state
+
+    def _result(self, state: AgentState) -> AgentRunResult:
         if state.output is None:
             state.output = state.scratchpad.get("final_output", "")
         return AgentRunResult(pattern=self.name, output=state.output or "", transcript=state.transcript)
@@ -72,6 +272,58 @@ class Agent:
         return console.export_text()
 
 
+@dataclass
+class _RunObserver:
+    emit: Callable[[Any], None]
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+
+class _StreamCancelledError(Exception):
+    """Raised between steps once the consumer of `stream_events` has gone away."""
+
+
+_run_observer: contextvars.ContextVar[Optional[_RunObserver]] = contextvars.ContextVar(
+    "ai_agent_patterns_run_observer", default=None
+)
+
+
+def stream_events(run: Callable[[], AgentRunResult]) -> Iterator[AgentEvent]:
+    """Call `run()` in a worker thread, yielding the events of the `Agent.run` it makes.
+
+    `run` is typically a pattern's `demo`, so a stream sees the same input and
+    context as a plain call. The final event carries the result `run` returns.
+    """
+    events: queue.Queue = queue.Queue()
+    observer = _RunObserver(events.put)
+    finished = object()
+
+    def worker() -> None:
+        _run_observer.set(observer)
+        try:
+            result = run()
+            events.put(AgentEvent(kind="final", content=result.output, result=result))
+        except _StreamCancelledError:
+            return
+        except BaseException as exc:
+            events.put(exc)
+        finally:
+            events.put(finished)
+
+    run_in_context = contextvars.copy_context().run
+    thread = threading.Thread(target=run_in_context, args=(worker,), name="agent-stream", daemon=True)
+    thread.start()
+    try:
+        while True:
+            event = events.get()
+            if event is finished:
+                return
+            if isinstance(event, BaseException):
+                raise event
+            yield event
+    finally:
+        observer.cancelled.set()
+
+
 def llm_step(agent: Agent, prompt_builder) -> AgentStep:
     """Utility to build a step fetching LLM output."""
 
@@ -86,6 +338,33 @@ def llm_step(agent: Agent, prompt_builder) -> AgentStep:
     return _run
 
 
+def async_llm_step(agent: Agent, prompt_builder) -> AsyncAgentStep:
+    """Async counterpart of `llm_step` awaiting `LLMClient.agenerate`."""
+
+    async def _run(state: AgentState) -> AgentState:
+        prompt = prompt_builder(state)
+        response = await agent.llm.agenerate(prompt, config=agent.config, context=state.context)
+        state.transcript.append({"step": prompt_builder.__name__, "content": response})
+        state.scratchpad[f"{prompt_builder.__name__}_output"] = response
+        state.output = response
+        return state
+
+    return _run
+
+
+def map_in_threads(fn: Callable[[Any], Any], items: Sequence[Any], *, max_workers: int = 4) -> List[Any]:
+    """`[fn(item) for item in items]` on up to `max_workers` threads, in order.
+
+    Each call runs in a copy of the caller's context, so context variables such as
+    the streaming token sink reach LLM calls made from the worker threads.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(items), max_workers)) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+
 def write_transcript_step(name: str, content_builder) -> AgentStep:
     """Log-only step without LLM interaction."""
 
@@ -106,3 +385,118 @@ def finalizer_step(field: str = "output") -> AgentStep:
         return state
 
     return _run
+
+
+@contextmanager
+def _batch_submitter(agent: Agent, backend: str, max_workers: int) -> Iterator[Callable[..., Future]]:
+    if backend == "thread":
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{agent.name}-run")
+        try:
+            yield lambda input_text, context: executor.submit(agent.run, input_text, context)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    elif backend == "process":
+        from .patterns import registry
+
+        registry.get(agent.name)
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_process_worker,
+            initargs=(agent.name, agent.config),
+        )
+        try:
+            yield lambda input_text, context: executor.submit(_run_in_process_worker, input_text, context)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    elif backend == "asyncio":
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name=f"{agent.name}-loop", daemon=True)
+        thread.start()
+        # Plain steps get one thread per run in flight, not the loop's default executor's cap.
+        steps = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{agent.name}-step")
+        pending: set[Future] = set()
+
+        def submit(input_text: str, context: Optional[Dict[str, object]]) -> Future:
+            future = asyncio.run_coroutine_threadsafe(agent.arun(input_text, context, executor=steps), loop)
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+            return future
+
+        try:
+            yield submit
+        finally:
+            for future in list(pending):
+                future.cancel()
+            wait(list(pending))
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+            steps.shutdown(wait=True)
+    else:
+        raise ValueError(f"Unsupported run_many backend: {backend}")
+
+
+def _batch_result(name: str, index: int, future: Future, stats: BatchStats) -> AgentRunResult:
+    """Result of one `run_many` input; a run that raised becomes a result carrying `error`."""
+    try:
+        result = future.result()
+    except Exception as exc:
+        stats.failed += 1
+        result = AgentRunResult(pattern=name, output="", transcript=[], error=exc)
+    else:
+        stats.completed += 1
+    result.input_index = index
+    return result
+
+
+_process_agent: Optional[Agent] = None
+
+
+def _init_process_worker(pattern: str, config: AgentConfig) -> None:
+    global _process_agent
+    from .patterns import registry
+
+    _process_agent = registry.get(pattern).build_agent(config)
+
+
+def _run_in_process_worker(input_text: str, context: Optional[Dict[str, Any]]) -> AgentRunResult:
+    assert _process_agent is not None, "process worker was not initialised"
+    return _process_agent.run(input_text, context)
+
+
+def _token_emitter(emit: Callable[[Any], None], step: str) -> Callable[[str], None]:
+    def _emit(delta: str) -> None:
+        emit(AgentEvent(kind="token", step=step, content=delta))
+
+    return _emit
+
+
+def _step_finished(name: str, state: AgentState, start: int) -> AgentEvent:
+    content = "\n".join(str(entry.get("content", "")) for entry in state.transcript[start:])
+    return AgentEvent(kind="step_finished", step=name, content=content)
+
+
+def _step_name(step) -> str:
+    return getattr(step, "__name__", type(step).__name__)
+
+
+def _is_async_step(step) -> bool:
+    if inspect.iscoroutinefunction(step):
+        return True
+    return callable(step) and inspect.iscoroutinefunction(type(step).__call__)
+
+
+async def _run_step_async(step, state: AgentState, executor: Optional[Executor] = None) -> AgentState:
+    if _is_async_step(step):
+        return await step(state)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, contextvars.copy_context().run, step, state)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _discard_awaitable(awaitable) -> None:
+    close = getattr(awaitable, "close", None)
+    if close is not None:
+        close()
@@ -1,16 +1,210 @@
 from __future__ import annotations
 
-from .config import AgentConfig
-from .llm import LiteLLMClient, MockLLMClient, OpenAILLMClient
-from .types import LLMClient
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+from .config import AgentConfig, EmbeddingConfig, MemoryConfig
+from .llm import (
+    BatchingLLMClient,
+    CachingLLMClient,
+    LiteLLMClient,
+    MockLLMClient,
+    OpenAILLMClient,
+    RateLimitedLLMClient,
+    ResilientLLMClient,
+    SimulatedLLMClient,
+    SingleFlightLLMClient,
+    shared_rate_limiter,
+)
+from .llm.cache import shared_response_cache
+from .llm.embeddings import CachingEmbeddingClient
+from .llm.http import close_shared_http_pools
+from .memory import (
+    ConcurrentKeywordVectorMemory,
+    HashingEmbedder,
+    LSHVectorMemory,
+    SearchableMemoryStore,
+    SparseVectorMemory,
+)
+from .types import EmbeddingClient, LLMClient
+
+
+@dataclass
+class ClientPoolStats:
+    hits: int = 0
+    builds: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.builds
+        return self.hits / total if total else 0.0
+
+
+class ClientPool:
+    """Thread-safe registry of LLM clients keyed by provider, model and client settings.
+
+    Every agent built with an equivalent `AgentConfig` shares one client, so build
+    cost and connection setup are paid once per process.
+    """
+
+    def __init__(self) -> None:
+        self.stats = ClientPoolStats()
+        self._clients: Dict[Tuple[Hashable, ...], LLMClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, config: AgentConfig) -> LLMClient:
+        key = self.key(config)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.stats.hits += 1
+                return client
+            client = self._clients[key] = _build_client(config)
+            self.stats.builds += 1
+            self.stats.size = len(self._clients)
+            return client
+
+    def warm_up(self, configs: Iterable[AgentConfig]) -> None:
+        """Build clients ahead of the first request, e.g. at service start-up."""
+        for config in configs:
+            self.get(config)
+
+    def shutdown(self) -> None:
+        """Close and drop every pooled client, then close the shared HTTP connection pools."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self.stats.size = 0
+        for client in clients:
+            _close_client(client)
+        close_shared_http_pools()
+
+    @staticmethod
+    def key(config: AgentConfig) -> Tuple[Hashable, ...]:
+        return (
+            config.provider.lower(),
+            config.model,
+            config.http,
+            config.cache,
+            config.batching,
+            config.rate_limit,
+            config.resilience,
+            config.single_flight,
+            config.simulation,
+        )
+
+
+client_pool = ClientPool()
 
 
 def resolve_llm(config: AgentConfig) -> LLMClient:
+    return client_pool.get(config)
+
+
+def _build_client(config: AgentConfig) -> LLMClient:
+    client = _provider_client(config)
+    if config.rate_limit is not None:
+        limiter = shared_rate_limiter(config.provider.lower(), config.model, config.rate_limit)
+        client = RateLimitedLLMClient(client, limiter)
+    if config.resilience is not None:
+        client = ResilientLLMClient(client, config.resilience)
+    if config.batching is not None:
+        client = BatchingLLMClient(
+            client,
+            window_seconds=config.batching.window_seconds,
+            max_batch=config.batching.max_batch,
+            max_workers=config.batching.max_workers,
+        )
+    if config.single_flight:
+        client = SingleFlightLLMClient(client)
+    if config.cache is not None:
+        client = CachingLLMClient(client, shared_response_cache(config.cache))
+    return client
+
+
+def _close_client(client: object) -> None:
+    """Close each layer of a `_build_client` stack that owns threads (batching, hedging)."""
+    while client is not None:
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+        client = getattr(client, "inner", None)
+
+
+def _provider_client(config: AgentConfig) -> LLMClient:
     provider = config.provider.lower()
     if provider in {"mock", "test"}:
         return MockLLMClient()
+    if provider == "simulated":
+        return SimulatedLLMClient(config.simulation)
     if provider == "openai":
-        return OpenAILLMClient(model=config.model)
+        return OpenAILLMClient(model=config.model, http=config.http)
     if provider in {"litellm", "router"}:
-        return LiteLLMClient(model=config.model)
+        return LiteLLMClient(model=config.model, http=config.http)
     raise ValueError(f"Unsupported LLM provider: {config.provider}")
+
+
+def resolve_memory(config: AgentConfig) -> SearchableMemoryStore:
+    """Build the retrieval store for `config.memory`, empty unless it names an index."""
+    if config.memory.index_path is not None:
+        from .memory.ingest import open_index
+
+        return open_index(config.memory.index_path, weighting=config.memory.weighting)
+    return memory_backend(config.memory, config.embedding)
+
+
+def memory_backend(
+    memory: MemoryConfig, embedding: Optional[EmbeddingConfig] = None
+) -> SearchableMemoryStore:
+    """Empty store of the kind `memory.backend` names; `index_path` is not consulted.
+
+    The "keyword" store publishes each write before returning, so callers read
+    their own writes.
+    """
+    backend = memory.backend.lower()
+    if backend == "keyword":
+        return ConcurrentKeywordVectorMemory(flush_interval=0)
+    if backend == "sparse":
+        return SparseVectorMemory(weighting=memory.weighting)
+    if backend == "lsh":
+        return LSHVectorMemory(
+            embedder=shared_embedder(embedding or EmbeddingConfig()),
+            tables=memory.lsh_tables,
+            bits=memory.lsh_bits,
+            probes=memory.lsh_probes,
+            precision=memory.precision,
+            rerank=memory.rerank,
+        )
+    raise ValueError(f"Unsupported memory backend: {memory.backend}")
+
+
+_embedders: Dict[EmbeddingConfig, EmbeddingClient] = {}
+_embedders_lock = threading.Lock()
+
+
+def resolve_embedder(config: AgentConfig) -> EmbeddingClient:
+    """Embedding client for `config.embedding`, cached unless its `cache` is `None`."""
+    return shared_embedder(config.embedding)
+
+
+def shared_embedder(embedding: EmbeddingConfig) -> EmbeddingClient:
+    """Process-wide embedding client per `EmbeddingConfig`, so cached vectors are shared."""
+    with _embedders_lock:
+        client = _embedders.get(embedding)
+        if client is None:
+            client = _embedders[embedding] = _build_embedder(embedding)
+        return client
+
+
+def _build_embedder(embedding: EmbeddingConfig) -> EmbeddingClient:
+    provider = embedding.provider.lower()
+    if provider == "hashing":
+        client: EmbeddingClient = HashingEmbedder(dimensions=embedding.dimensions)
+    else:
+        raise ValueError(f"Unsupported embedding provider: {embedding.provider}")
+    if embedding.cache is None:
+        return client
+    cache = shared_response_cache(embedding.cache, namespace="embedding")
+    return CachingEmbeddingClient(client, cache, batch_size=embedding.batch_size)
@@ -1,11 +1,58 @@
-from .base import BaseLLMClient
+from .base import BaseLLMClient, LLMError, active_token_sink, estimate_tokens, token_sink
+from .batching import BatchingLLMClient, BatchingStats
+from .cache import CacheStats, CachingLLMClient, ResponseCache
+from .embeddings import CachingEmbeddingClient, embedding_key
+from .http import HTTPPool, shared_http_pool
 from .mock import MockLLMClient
 from .openai import OpenAILLMClient
 from .litellm import LiteLLMClient
+from .ratelimit import (
+    RateLimitedLLMClient,
+    RateLimiter,
+    RateLimitStats,
+    TokenBucket,
+    shared_rate_limiter,
+)
+from .resilience import LatencyTracker, ResilienceStats, ResilientLLMClient, is_retryable
+from .simulated import (
+    SimulatedLLMClient,
+    SimulatedRateLimitError,
+    SimulatedServerError,
+    SimulationStats,
+)
+from .singleflight import SingleFlightLLMClient, SingleFlightStats
 
 __all__ = [
     "BaseLLMClient",
+    "BatchingLLMClient",
+    "BatchingStats",
+    "CacheStats",
+    "CachingLLMClient",
+    "ResponseCache",
+    "CachingEmbeddingClient",
+    "embedding_key",
+    "HTTPPool",
+    "shared_http_pool",
+    "LLMError",
+    "active_token_sink",
+    "estimate_tokens",
+    "token_sink",
     "MockLLMClient",
     "OpenAILLMClient",
     "LiteLLMClient",
+    "RateLimitedLLMClient",
+    "RateLimiter",
+    "RateLimitStats",
+    "TokenBucket",
+    "shared_rate_limiter",
+    "LatencyTracker",
+    "ResilienceStats",
+    "ResilientLLMClient",
+    "is_retryable",
+    "SimulatedLLMClient",
+    "SimulatedRateLimitError",
+    "SimulatedServerError",
+    "SimulationStats",
+    "SingleFlightLLMClient",
+    "SingleFlightStats",
 ]
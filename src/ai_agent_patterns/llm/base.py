@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import math
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Protocol
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Protocol, Sequence
 
 from ..config import AgentConfig
 
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token cost of `text` (about four characters per token)."""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN)) if text else 0
+
 
 class LLMError(RuntimeError):
     pass
@@ -15,6 +28,61 @@ class SupportsGenerate(Protocol):
     def generate(self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None) -> str:
         ...
 
+    async def agenerate(
+        self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        ...
+
+
+class SupportsGenerateBatch(Protocol):
+    """Client able to send several prompts with the same settings in one provider request."""
+
+    def generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        ...
+
+
+TokenSink = Callable[[str], None]
+
+_token_sink: ContextVar[Optional[TokenSink]] = ContextVar("ai_agent_patterns_token_sink", default=None)
+
+
+@contextmanager
+def token_sink(sink: Optional[TokenSink]) -> Iterator[None]:
+    """Route streamed token deltas of `generate` calls in this context to `sink`."""
+    token = _token_sink.set(sink)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+def active_token_sink() -> Optional[TokenSink]:
+    return _token_sink.get()
+
+
+def request_key(
+    client: Any, prompt: str, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Stable digest identifying a generation request.
+
+    Covers provider, model, prompt, temperature and max_tokens, plus the
+    `intent` hint because some clients (e.g. the mock) shape replies on it.
+    """
+    model = config.extras.get("model", getattr(client, "model", config.model))
+    intent = (context or {}).get("intent")
+    payload = json.dumps(
+        [client.name, model, prompt, config.temperature, config.max_tokens, intent],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 @dataclass
 class BaseLLMClient:
@@ -23,6 +91,54 @@ class BaseLLMClient:
     def generate(self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None) -> str:
         raise NotImplementedError
 
+    async def agenerate(
+        self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async counterpart of `generate`; offloads to a worker thread unless overridden."""
+        return await asyncio.to_thread(self.generate, prompt, config=config, context=context)
+
+    def generate_stream(
+        self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Yield the response incrementally; the default emits a single chunk."""
+        yield self.generate(prompt, config=config, context=context)
+
+    async def agenerate_stream(
+        self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        yield await self.agenerate(prompt, config=config, context=context)
+
+    def collect_stream(
+        self,
+        sink: TokenSink,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Forward `generate_stream` chunks to `sink` and return the joined text."""
+        parts = []
+        with token_sink(None):
+            for chunk in self.generate_stream(prompt, config=config, context=context):
+                sink(chunk)
+                parts.append(chunk)
+        return "".join(parts)
+
+    async def acollect_stream(
+        self,
+        sink: TokenSink,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        parts = []
+        with token_sink(None):
+            async for chunk in self.agenerate_stream(prompt, config=config, context=context):
+                sink(chunk)
+                parts.append(chunk)
+        return "".join(parts)
+
     @staticmethod
     def require_env(keys: list[str]) -> None:
         missing = [key for key in keys if not os.getenv(key)]
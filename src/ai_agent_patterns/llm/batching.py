@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from ..config import AgentConfig
+from .base import BaseLLMClient, LLMError, active_token_sink
+
+
+@dataclass
+class BatchingStats:
+    requests: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _Request:
+    prompt: str
+    config: AgentConfig
+    context: Optional[Dict[str, Any]]
+    future: "Future[str]"
+
+
+class BatchingLLMClient(BaseLLMClient):
+    """Coalesces concurrent `generate` calls into batched requests to `inner`.
+
+    Calls arriving within `window_seconds` of the first queued call (or until
+    `max_batch` are queued) leave together. Requests whose `AgentConfig`s are
+    equal in every field, `extras` included, are sent as one `inner.generate_batch` call when `inner` implements it, and
+    otherwise as a burst of concurrent `inner.generate` calls on `max_workers`
+    threads. Each caller blocks on (or, from `agenerate`, awaits) its own
+    result. Streaming calls, and calls made under a token sink, bypass the
+    queue.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLMClient,
+        *,
+        window_seconds: float = 0.005,
+        max_batch: int = 16,
+        max_workers: int = 32,
+    ) -> None:
+        if max_batch <= 0:
+            raise ValueError("max_batch must be positive")
+        if window_seconds < 0:
+            raise ValueError("window_seconds must not be negative")
+        super().__init__(name=inner.name)
+        self.inner = inner
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.stats = BatchingStats()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-batch")
+        self._queue: List[_Request] = []
+        self._ready = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.inner, "model", None)
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return self.inner.generate(prompt, config=config, context=context)
+        return self.submit(prompt, config=config, context=context).result()
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return await self.inner.agenerate(prompt, config=config, context=context)
+        return await asyncio.wrap_future(self.submit(prompt, config=config, context=context))
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        return self.inner.generate_stream(prompt, config=config, context=context)
+
+    def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        return self.inner.agenerate_stream(prompt, config=config, context=context)
+
+    def submit(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> "Future[str]":
+        """Queue a generation and return the future its batch will resolve."""
+        request = _Request(prompt, config, context, Future())
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("BatchingLLMClient is closed")
+            self._queue.append(request)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name="llm-batch-dispatcher", daemon=True
+                )
+                self._dispatcher.start()
+            self._ready.notify()
+        return request.future
+
+    def close(self) -> None:
+        """Send whatever is queued, then stop the dispatcher and worker threads."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._ready:
+                while not self._queue and not self._closed:
+                    self._ready.wait()
+                if not self._queue:
+                    return
+                deadline = time.monotonic() + self.window_seconds
+                while len(self._queue) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+                batch, self._queue = self._queue[: self.max_batch], self._queue[self.max_batch :]
+                self.stats.requests += len(batch)
+                self.stats.batches += 1
+                self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+            for group in _group(batch).values():
+                self._send(group)
+
+    def _send(self, group: List[_Request]) -> None:
+        generate_batch = getattr(self.inner, "generate_batch", None)
+        if generate_batch is None or len(group) == 1:
+            for request in group:
+                self._executor.submit(self._run_one, request)
+        else:
+            self._executor.submit(self._run_batch, generate_batch, group)
+
+    def _run_one(self, request: _Request) -> None:
+        if not request.future.set_running_or_notify_cancel():
+            return
+        try:
+            response = self.inner.generate(request.prompt, config=request.config, context=request.context)
+        except BaseException as exc:
+            request.future.set_exception(exc)
+        else:
+            request.future.set_result(response)
+
+    @staticmethod
+    def _run_batch(generate_batch: Any, group: List[_Request]) -> None:
+        live = [request for request in group if request.future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            responses = list(
+                generate_batch(
+                    [request.prompt for request in live],
+                    config=live[0].config,
+                    contexts=[request.context for request in live],
+                )
+            )
+            if len(responses) != len(live):
+                raise LLMError(f"generate_batch returned {len(responses)} responses for {len(live)} prompts")
+        except BaseException as exc:
+            for request in live:
+                request.future.set_exception(exc)
+            return
+        for request, response in zip(live, responses, strict=True):
+            request.future.set_result(response)
+
+
+def _group(batch: List[_Request]) -> Dict[Tuple[Hashable, ...], List[_Request]]:
+    """Split `batch` into runs that one provider request can carry under one config.
+
+    The batch is sent with its first request's config, so requests are keyed on
+    every `AgentConfig` field rather than just model and sampling settings.
+    """
+    groups: Dict[Tuple[Hashable, ...], List[_Request]] = {}
+    for request in batch:
+        key = tuple(_hashable(getattr(request.config, field.name)) for field in fields(request.config))
+        groups.setdefault(key, []).append(request)
+    return groups
+
+
+def _hashable(value: Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
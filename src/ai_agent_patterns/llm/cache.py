@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from ..config import AgentConfig, CacheConfig
+from .base import BaseLLMClient, active_token_sink, request_key
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SQLiteResponseStore:
+    """Persistent response tier shared by threads and worker processes via WAL.
+
+    Each process holds one connection, serialized by a lock, so short-lived
+    thread pools do not accumulate connections and file descriptors.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0) -> None:
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[str, Optional[float]]]:
+        """`(value, expires_at)` stored under `key`, or `None` if missing or expired."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM responses WHERE key = ? AND expires_at <= ?", (key, now))
+                return None
+            return value, expires_at
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        return self._execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time() if now is None else now,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None and self._pid == os.getpid():
+            conn.close()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> int:
+        with self._lock:
+            return self._connection().execute(sql, params).rowcount
+
+    def _connection(self) -> sqlite3.Connection:
+        """The process's connection; the caller holds `_lock`."""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+
+_PURGE_EVERY = 256
+
+
+class ResponseCache:
+    """Size-bounded LRU with optional TTL in front of an optional SQLite tier.
+
+    Entries promoted from the SQLite tier keep their stored expiry, and every
+    `_PURGE_EVERY` expiring writes sweep expired rows off disk.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = SQLiteResponseStore(path) if path else None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._writes_since_purge = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "ResponseCache":
+        return cls(max_entries=config.max_entries, ttl_seconds=config.ttl_seconds, path=config.path)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    self.stats.memory_hits += 1
+                    return value
+                del self._entries[key]
+        stored = self.store.get(key, now) if self.store is not None else None
+        with self._lock:
+            if stored is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self.stats.disk_hits += 1
+        # Keep the disk entry's deadline: re-caching must not extend its life.
+        value, expires_at = stored
+        self._remember(key, value, expires_at)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = self._expiry(time.time())
+        self._remember(key, value, expires_at)
+        if self.store is None:
+            return
+        self.store.set(key, value, expires_at)
+        if expires_at is None:
+            return
+        with self._lock:
+            self._writes_since_purge += 1
+            purge = self._writes_since_purge >= _PURGE_EVERY
+            if purge:
+                self._writes_since_purge = 0
+        if purge:
+            self.store.purge_expired()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def _expiry(self, now: float) -> Optional[float]:
+        return now + self.ttl_seconds if self.ttl_seconds is not None else None
+
+    def _remember(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+
+_shared_caches: Dict[Tuple[str, CacheConfig], ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_response_cache(config: CacheConfig, namespace: str = "llm") -> ResponseCache:
+    """Process-wide cache per `namespace` and `CacheConfig`, so agents built separately share hits.
+
+    Namespaces keep, e.g., LLM responses and embeddings from splitting one cache's
+    capacity and statistics when their settings happen to be equal.
+    """
+    key = (namespace, config)
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = ResponseCache.from_config(config)
+        return cache
+
+
+class CachingLLMClient(BaseLLMClient):
+    """Serves repeated prompts from a `ResponseCache` before calling `inner`."""
+
+    def __init__(self, inner: BaseLLMClient, cache: Optional[ResponseCache] = None) -> None:
+        super().__init__(name=inner.name)
+        self.inner = inner
+        self.cache = cache or ResponseCache()
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.inner, "model", None)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        key = request_key(self.inner, prompt, config, context)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.inner.generate(prompt, config=config, context=context)
+        self.cache.set(key, response)
+        return response
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        key = request_key(self.inner, prompt, config, context)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.inner.agenerate(prompt, config=config, context=context)
+        self.cache.set(key, response)
+        return response
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        key = request_key(self.inner, prompt, config, context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for chunk in self.inner.generate_stream(prompt, config=config, context=context):
+            parts.append(chunk)
+            yield chunk
+        self.cache.set(key, "".join(parts))
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        key = request_key(self.inner, prompt, config, context)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        async for chunk in self.inner.agenerate_stream(prompt, config=config, context=context):
+            parts.append(chunk)
+            yield chunk
+        self.cache.set(key, "".join(parts))
+
+    def _lookup(self, key: str) -> Optional[str]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            sink = active_token_sink()
+            if sink is not None:
+                sink(cached)
+        return cached
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from ..types import EmbeddingClient
+from .cache import CacheStats, ResponseCache
+
+
+def embedding_key(client: EmbeddingClient, text: str) -> str:
+    """Content address of `text` under `client`: same text, model and size, same key."""
+    digest = hashlib.sha256(f"{client.name}\0{client.dimensions}\0{text}".encode("utf-8")).hexdigest()
+    return f"embedding:{digest}"
+
+
+def encode_vector(vector: Sequence[float]) -> str:
+    return base64.b64encode(array("d", vector).tobytes()).decode("ascii")
+
+
+def decode_vector(payload: str) -> List[float]:
+    values = array("d")
+    values.frombytes(base64.b64decode(payload))
+    return values.tolist()
+
+
+class CachingEmbeddingClient:
+    """Batches texts into `inner` calls and serves repeats from a `ResponseCache`.
+
+    Vectors are cached under `embedding_key`, so re-embedding unchanged content
+    (for example when a corpus is re-ingested) never reaches `inner`, and a
+    cache with a `path` keeps that true across processes. Misses are
+    de-duplicated and sent `batch_size` texts per call. `embed_query` bypasses
+    the cache, so one-off search queries do not evict document vectors.
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingClient,
+        cache: Optional[ResponseCache] = None,
+        batch_size: int = 64,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.inner = inner
+        self.name = inner.name
+        self.dimensions = inner.dimensions
+        self.cache = cache or ResponseCache()
+        self.batch_size = batch_size
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_batch([text])[0]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed `text` with `inner` without reading or filling the cache."""
+        vector = list(self.inner.embed_batch([text])[0])
+        with self._lock:
+            self.requests += 1
+        return vector
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        texts = list(texts)
+        keys = [embedding_key(self.inner, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in found or key in missing:
+                continue
+            cached = self.cache.get(key)
+            if cached is None:
+                missing[key] = text
+            else:
+                found[key] = decode_vector(cached)
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start : start + self.batch_size]
+            vectors = self.inner.embed_batch([text for _key, text in chunk])
+            with self._lock:
+                self.requests += 1
+            for (key, _text), vector in zip(chunk, vectors, strict=True):
+                vector = list(vector)
+                found[key] = vector
+                self.cache.set(key, encode_vector(vector))
+        return [found[key] for key in keys]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import HTTPConfig
+from .base import LLMError
+
+
+class HTTPPool:
+    """Process-lifetime httpx clients built from an `HTTPConfig`.
+
+    The sync client is shared by every thread. Async clients hold connections bound
+    to the event loop that opened them, so one is kept per running loop. `module`
+    names the httpx distribution the consuming SDK was built against.
+    """
+
+    def __init__(self, config: Optional[HTTPConfig] = None, module: str = "httpx") -> None:
+        self.config = config or HTTPConfig()
+        self.module = module
+        self._client: Any = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def client(self) -> Any:
+        with self._lock:
+            if self._client is None:
+                httpx = self._httpx()
+                self._client = httpx.Client(**self._client_options(httpx))
+            return self._client
+
+    def async_client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                httpx = self._httpx()
+                client = self._async_clients[loop] = httpx.AsyncClient(**self._client_options(httpx))
+            return client
+
+    def close(self) -> None:
+        """Close the sync client and the async client of every loop that is still open."""
+        with self._lock:
+            client, self._client = self._client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients = weakref.WeakKeyDictionary()
+        if client is not None:
+            client.close()
+        for loop, async_client in async_clients:
+            _aclose_on(loop, async_client)
+
+    def _httpx(self) -> Any:
+        try:
+            return importlib.import_module(self.module)
+        except ImportError as exc:  # pragma: no cover - import guard
+            raise LLMError(f"{self.module} package is not installed.") from exc
+
+    def _client_options(self, httpx: Any) -> Dict[str, Any]:
+        config = self.config
+        return {
+            "timeout": httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        }
+
+
+def _aclose_on(loop: asyncio.AbstractEventLoop, client: Any) -> None:
+    """Close `client` on the loop its connections belong to; a closed loop took them along."""
+    if loop.is_closed():
+        return
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if current is loop:
+        loop.create_task(client.aclose())
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        loop.run_until_complete(client.aclose())
+
+
+_shared_pools: Dict[Tuple[HTTPConfig, str], HTTPPool] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_http_pool(config: Optional[HTTPConfig] = None, module: str = "httpx") -> HTTPPool:
+    """Process-wide pool per `HTTPConfig`, so separately built clients reuse connections."""
+    key = (config or HTTPConfig(), module)
+    with _shared_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = _shared_pools[key] = HTTPPool(*key)
+        return pool
+
+
+def close_shared_http_pools() -> None:
+    """Close and forget every pool handed out by `shared_http_pool`."""
+    with _shared_lock:
+        pools = list(_shared_pools.values())
+        _shared_pools.clear()
+    for pool in pools:
+        pool.close()
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
-from ..config import AgentConfig
-from .base import BaseLLMClient, LLMError
+from ..config import AgentConfig, HTTPConfig
+from .base import BaseLLMClient, LLMError, active_token_sink
+from .http import HTTPPool, shared_http_pool
+
+_session_lock = threading.Lock()
 
 
 class LiteLLMClient(BaseLLMClient):
-    """Thin wrapper around litellm router."""
+    """Thin wrapper around litellm router.
+
+    Sync calls go through the process-wide connection pool for `http`, installed as
+    `litellm.client_session` unless the application set its own. Async calls rely
+    on litellm's per-loop client cache.
+    """
 
-    def __init__(self, model: str = "gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        *,
+        http: Optional[HTTPConfig] = None,
+        pool: Optional[HTTPPool] = None,
+    ) -> None:
         super().__init__(name="litellm")
         self.model = model
+        self.pool = pool or shared_http_pool(http)
 
     def generate(
         self,
@@ -20,15 +36,66 @@ class LiteLLMClient(BaseLLMClient):
         config: AgentConfig,
         context: Optional[Dict[str, Any]] = None,
     ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return self.collect_stream(sink, prompt, config=config, context=context)
+        response = self._litellm().completion(**self._request(prompt, config))
+        return response["choices"][0]["message"]["content"]
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        for chunk in self._litellm().completion(**self._request(prompt, config), stream=True):
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return await self.acollect_stream(sink, prompt, config=config, context=context)
+        response = await self._litellm().acompletion(**self._request(prompt, config))
+        return response["choices"][0]["message"]["content"]
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        stream = await self._litellm().acompletion(**self._request(prompt, config), stream=True)
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    def _litellm(self) -> Any:
         try:
-            from litellm import completion
+            import litellm
         except ImportError as exc:  # pragma: no cover - import guard
             raise LLMError("litellm package is not installed.") from exc
 
-        response = completion(
-            model=config.extras.get("model", self.model),
-            messages=[{"role": "user", "content": prompt}],
-            temperature=config.temperature,
-            max_tokens=config.max_tokens,
-        )
-        return response["choices"][0]["message"]["content"]
+        with _session_lock:
+            if litellm.client_session is None:
+                litellm.client_session = self.pool.client()
+        return litellm
+
+    def _request(self, prompt: str, config: AgentConfig) -> Dict[str, Any]:
+        return {
+            "model": config.extras.get("model", self.model),
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "timeout": self.pool.config.timeout,
+        }
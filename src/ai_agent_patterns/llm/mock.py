@@ -2,18 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import random
-from typing import Any, Dict, Optional
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from ..config import AgentConfig
-from .base import BaseLLMClient
+from .base import BaseLLMClient, active_token_sink
+
+_WORD_CHUNK = re.compile(r"\S+\s*")
 
 
 class MockLLMClient(BaseLLMClient):
-    """Deterministic mock used for demos/tests."""
+    """Deterministic mock used for demos/tests.
+
+    `chunk_size` sets how many words each `generate_stream` chunk carries.
+    """
 
-    def __init__(self, name: str = "mock-llm", seed: int = 13) -> None:
+    def __init__(self, name: str = "mock-llm", seed: int = 13, chunk_size: int = 1) -> None:
         super().__init__(name=name)
         self.random = random.Random(seed)
+        self.chunk_size = max(chunk_size, 1)
 
     def generate(
         self,
@@ -22,6 +29,33 @@ class MockLLMClient(BaseLLMClient):
         config: AgentConfig,
         context: Optional[Dict[str, Any]] = None,
     ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return self.collect_stream(sink, prompt, config=config, context=context)
+        return self._respond(prompt, context)
+
+    def generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        contexts = contexts or [None] * len(prompts)
+        return [self._respond(prompt, context) for prompt, context in zip(prompts, contexts, strict=True)]
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        words = _WORD_CHUNK.findall(self._respond(prompt, context))
+        for start in range(0, len(words), self.chunk_size):
+            yield "".join(words[start : start + self.chunk_size])
+
+    def _respond(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
         context = context or {}
         digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
         intent = context.get("intent")
@@ -43,3 +77,12 @@ class MockLLMClient(BaseLLMClient):
         ]
         idx = int(digest, 16) % len(actions)
         return f"[mock-response-{digest}] {actions[idx]}"
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        return self.generate(prompt, config=config, context=context)
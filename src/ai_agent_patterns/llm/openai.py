@@ -1,17 +1,41 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
-from ..config import AgentConfig
-from .base import BaseLLMClient, LLMError
+from ..config import AgentConfig, HTTPConfig
+from .base import BaseLLMClient, LLMError, active_token_sink
+from .http import HTTPPool, shared_http_pool
+
+_TEXT_DELTA = "response.output_text.delta"
 
 
 class OpenAILLMClient(BaseLLMClient):
-    """OpenAI API integration (requires `openai` package)."""
+    """OpenAI API integration (requires `openai` package).
+
+    SDK clients are built on first use and kept for the life of the instance, on top
+    of the process-wide connection pool for `http`; async clients are kept per loop.
+    Pass `pool` to use a dedicated `HTTPPool` instead.
+    """
 
-    def __init__(self, model: str = "gpt-4o-mini") -> None:
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        *,
+        http: Optional[HTTPConfig] = None,
+        pool: Optional[HTTPPool] = None,
+    ) -> None:
         super().__init__(name="openai")
         self.model = model
+        self.http = pool.config if pool is not None else http or HTTPConfig()
+        self.pool = pool
+        self._client: Any = None
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
 
     def generate(
         self,
@@ -20,17 +44,95 @@ class OpenAILLMClient(BaseLLMClient):
         config: AgentConfig,
         context: Optional[Dict[str, Any]] = None,
     ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return self.collect_stream(sink, prompt, config=config, context=context)
+        completion = self.client().responses.create(**self._request(prompt, config))
+        return completion.output_text  # type: ignore[attr-defined]
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        stream = self.client().responses.create(**self._request(prompt, config), stream=True)
+        for event in stream:
+            if event.type == _TEXT_DELTA:
+                yield event.delta
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return await self.acollect_stream(sink, prompt, config=config, context=context)
+        completion = await self.async_client().responses.create(**self._request(prompt, config))
+        return completion.output_text  # type: ignore[attr-defined]
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        stream = await self.async_client().responses.create(**self._request(prompt, config), stream=True)
+        async for event in stream:
+            if event.type == _TEXT_DELTA:
+                yield event.delta
+
+    def client(self) -> Any:
+        """Return the persistent `OpenAI` client, creating it on first use."""
+        with self._lock:
+            if self._client is None:
+                openai = self._sdk()
+                self._client = openai.OpenAI(
+                    http_client=self.pool.client(), max_retries=self.http.max_retries
+                )
+            return self._client
+
+    def async_client(self) -> Any:
+        """Return the `AsyncOpenAI` client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                openai = self._sdk()
+                client = self._async_clients[loop] = openai.AsyncOpenAI(
+                    http_client=self.pool.async_client(), max_retries=self.http.max_retries
+                )
+            return client
+
+    def _sdk(self) -> Any:
         try:
-            from openai import OpenAI
+            import openai
         except ImportError as exc:  # pragma: no cover - import guard
             raise LLMError("openai package is not installed.") from exc
 
         self.require_env(["OPENAI_API_KEY"])
-        client = OpenAI()
-        completion = client.responses.create(
-            model=config.extras.get("model", self.model),
-            input=prompt,
-            temperature=config.temperature,
-            max_output_tokens=config.max_tokens,
-        )
-        return completion.output_text  # type: ignore[attr-defined]
+        if self.pool is None:
+            self.pool = shared_http_pool(self.http, _http_module(openai))
+        return openai
+
+    def _request(self, prompt: str, config: AgentConfig) -> Dict[str, Any]:
+        return {
+            "model": config.extras.get("model", self.model),
+            "input": prompt,
+            "temperature": config.temperature,
+            "max_output_tokens": config.max_tokens,
+        }
+
+
+def _http_module(openai: Any) -> str:
+    """Package providing the httpx client classes the installed SDK accepts."""
+    default = getattr(openai, "DefaultHttpxClient", None)
+    for cls in getattr(default, "__mro__", ()):
+        if cls.__name__ == "Client":
+            return cls.__module__.partition(".")[0]
+    return "httpx"
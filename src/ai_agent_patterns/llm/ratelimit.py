@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..config import AgentConfig, RateLimitConfig
+from .base import BaseLLMClient, estimate_tokens
+
+
+@dataclass
+class RateLimitStats:
+    requests: int = 0
+    overloads: int = 0
+    in_flight: int = 0
+    queue_depth: int = 0
+    peak_queue_depth: int = 0
+    waited: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    concurrency_limit: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.wait_seconds / self.requests if self.requests else 0.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` per second up to `capacity`.
+
+    `reserve` never blocks: it takes the tokens, possibly into debt, and returns
+    how long the caller must wait before using them, so threads can `sleep` and
+    coroutines can `asyncio.sleep` on the same bucket. `clock` supplies the
+    current time in seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+_Waiter = Union[threading.Event, Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]]
+
+
+class RateLimiter:
+    """Request-rate, token-rate and adaptive concurrency limits for one provider/model.
+
+    Concurrency follows AIMD: each success raises the limit by `increase / limit`
+    (about `increase` per round of `limit` requests) up to `max_concurrency`, and
+    a 429 or timeout multiplies it by `decrease`, at most once per round: calls
+    that started before the last cut do not cut again. Waiters are served in
+    arrival order whether they are threads (`acquire`) or coroutines
+    (`aacquire`), so one limiter can be shared by both.
+    """
+
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.config = config
+        self.requests = TokenBucket(config.requests_per_second) if config.requests_per_second else None
+        self.tokens = (
+            TokenBucket(config.tokens_per_minute / 60.0, config.tokens_per_minute)
+            if config.tokens_per_minute
+            else None
+        )
+        self.stats = RateLimitStats(concurrency_limit=float(config.initial_concurrency))
+        self._limit = float(config.initial_concurrency)
+        self._last_cut = float("-inf")
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), self.config.min_concurrency)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until a request costing `tokens` may start; returns its start time."""
+        started = time.monotonic()
+        time.sleep(self._reserve(tokens))
+        with self._lock:
+            waiter = self._enqueue(threading.Event())
+        if waiter is not None:
+            waiter.wait()
+        return self._admitted(started)
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        started = time.monotonic()
+        await asyncio.sleep(self._reserve(tokens))
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._enqueue((loop, loop.create_future()))
+        if waiter is not None:
+            try:
+                await waiter[1]
+            except asyncio.CancelledError:
+                with self._lock:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                        self.stats.queue_depth = len(self._waiters)
+                    else:
+                        self._release_slot()
+                raise
+        return self._admitted(started)
+
+    def release(self, started: float, *, overloaded: bool = False) -> None:
+        """Return the slot of a request admitted at `started`, adapting the limit."""
+        config = self.config
+        with self._lock:
+            if overloaded:
+                self.stats.overloads += 1
+                if started > self._last_cut:
+                    self._limit = max(float(config.min_concurrency), self._limit * config.decrease)
+                    self._last_cut = time.monotonic()
+            else:
+                self._limit = min(float(config.max_concurrency), self._limit + config.increase / self._limit)
+            self.stats.concurrency_limit = self._limit
+            self._release_slot()
+
+    def _reserve(self, tokens: int) -> float:
+        delay = self.requests.reserve() if self.requests is not None else 0.0
+        if self.tokens is not None and tokens:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def _enqueue(self, waiter: Any) -> Optional[Any]:
+        """Take a slot now (returning `None`) or queue `waiter` for one."""
+        if not self._waiters and self.stats.in_flight < self.limit:
+            self.stats.in_flight += 1
+            return None
+        self._waiters.append(waiter)
+        self.stats.queue_depth = len(self._waiters)
+        self.stats.peak_queue_depth = max(self.stats.peak_queue_depth, self.stats.queue_depth)
+        return waiter
+
+    def _release_slot(self) -> None:
+        self.stats.in_flight -= 1
+        while self._waiters and self.stats.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            self.stats.in_flight += 1
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                loop.call_soon_threadsafe(_wake, future)
+        self.stats.queue_depth = len(self._waiters)
+
+    def _admitted(self, started: float) -> float:
+        now = time.monotonic()
+        waited = now - started
+        with self._lock:
+            self.stats.requests += 1
+            if waited > 0.0005:
+                self.stats.waited += 1
+                self.stats.wait_seconds += waited
+                self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        return now
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Whether `exc` signals provider overload: HTTP 429 or a timeout."""
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "status", None) == 429:
+        return True
+    return type(exc).__name__ in {"RateLimitError", "APITimeoutError", "Timeout", "ReadTimeout"}
+
+
+_limiters: Dict[Tuple[str, str, RateLimitConfig], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(provider: str, model: str, config: RateLimitConfig) -> RateLimiter:
+    """Process-wide limiter per provider, model and `RateLimitConfig`."""
+    key = (provider, model, config)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(config)
+        return limiter
+
+
+class RateLimitedLLMClient(BaseLLMClient):
+    """Admits calls to `inner` through a `RateLimiter` and feeds back their outcome.
+
+    A call costs one request plus its estimated prompt tokens and `max_tokens`
+    against `tokens_per_minute`. Exceptions are re-raised; those `is_overload`
+    recognises shrink the concurrency limit. When `inner` supports
+    `generate_batch`, so does this client, with one batch admitted as one request.
+    """
+
+    def __init__(self, inner: BaseLLMClient, limiter: RateLimiter) -> None:
+        super().__init__(name=inner.name)
+        self.inner = inner
+        self.limiter = limiter
+        if getattr(inner, "generate_batch", None) is not None:
+            self.generate_batch = self._generate_batch
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.inner, "model", None)
+
+    @property
+    def stats(self) -> RateLimitStats:
+        return self.limiter.stats
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        started = self.limiter.acquire(_cost(prompt, config))
+        overloaded = False
+        try:
+            return self.inner.generate(prompt, config=config, context=context)
+        except BaseException as exc:
+            overloaded = is_overload(exc)
+            raise
+        finally:
+            self.limiter.release(started, overloaded=overloaded)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        started = await self.limiter.aacquire(_cost(prompt, config))
+        overloaded = False
+        try:
+            return await self.inner.agenerate(prompt, config=config, context=context)
+        except BaseException as exc:
+            overloaded = is_overload(exc)
+            raise
+        finally:
+            self.limiter.release(started, overloaded=overloaded)
+
+    def _generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        tokens = sum(estimate_tokens(prompt) for prompt in prompts) + config.max_tokens * len(prompts)
+        started = self.limiter.acquire(tokens)
+        overloaded = False
+        try:
+            return self.inner.generate_batch(prompts, config=config, contexts=contexts)  # type: ignore[attr-defined]
+        except BaseException as exc:
+            overloaded = is_overload(exc)
+            raise
+        finally:
+            self.limiter.release(started, overloaded=overloaded)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        started = self.limiter.acquire(_cost(prompt, config))
+        overloaded = False
+        try:
+            yield from self.inner.generate_stream(prompt, config=config, context=context)
+        except BaseException as exc:
+            overloaded = is_overload(exc)
+            raise
+        finally:
+            self.limiter.release(started, overloaded=overloaded)
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        started = await self.limiter.aacquire(_cost(prompt, config))
+        overloaded = False
+        try:
+            async for chunk in self.inner.agenerate_stream(prompt, config=config, context=context):
+                yield chunk
+        except BaseException as exc:
+            overloaded = is_overload(exc)
+            raise
+        finally:
+            self.limiter.release(started, overloaded=overloaded)
+
+
+def _cost(prompt: str, config: AgentConfig) -> int:
+    return estimate_tokens(prompt) + config.max_tokens
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+from ..config import AgentConfig, ResilienceConfig
+from .base import BaseLLMClient, LLMError, active_token_sink
+from .ratelimit import is_overload
+
+_RETRYABLE_NAMES = {
+    "APIConnectionError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "APIError",
+}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether another attempt may succeed: overload, connection trouble or a 5xx."""
+    if isinstance(exc, LLMError):
+        return False
+    if is_overload(exc) or isinstance(exc, ConnectionError):
+        return True
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and status >= 500:
+        return True
+    return type(exc).__name__ in _RETRYABLE_NAMES
+
+
+class LatencyTracker:
+    """Sliding window of the last `window` successful call latencies, in seconds."""
+
+    def __init__(self, window: int = 512) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The `q` quantile (0-1) of the window, or `None` while it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@dataclass
+class ResilienceStats:
+    calls: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+
+
+class ResilientLLMClient(BaseLLMClient):
+    """Retries failed calls to `inner` and hedges slow ones.
+
+    Retryable failures (`is_retryable`) are retried up to `max_attempts` times
+    with full-jitter exponential backoff. Once a model has `hedge_min_samples`
+    latencies recorded, a call still running after that model's
+    `hedge_percentile` latency gets a second, identical request and the first
+    success wins. Sync attempts run on a pool of `max_workers` threads while
+    the caller waits; the hedge delay counts from when the first attempt
+    starts, so pool queueing does not trigger hedges. Async losers are
+    cancelled; a sync loser cannot be interrupted, so it keeps its worker
+    until it returns and its result is dropped. Streams and calls
+    under a token sink go straight to `inner`, since a repeat would re-emit
+    tokens.
+    """
+
+    def __init__(
+        self,
+        inner: BaseLLMClient,
+        config: Optional[ResilienceConfig] = None,
+        *,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(name=inner.name)
+        self.inner = inner
+        self.config = config or ResilienceConfig()
+        self.stats = ResilienceStats()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._random = random.Random(seed)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        if getattr(inner, "generate_batch", None) is not None:
+            self.generate_batch = self._generate_batch
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.inner, "model", None)
+
+    def tracker(self, config: AgentConfig) -> LatencyTracker:
+        """Latency window of the model `config` resolves to for this client."""
+        model = str(config.extras.get("model", getattr(self.inner, "model", None) or config.model))
+        with self._lock:
+            tracker = self._trackers.get(model)
+            if tracker is None:
+                tracker = self._trackers[model] = LatencyTracker(self.config.latency_window)
+            return tracker
+
+    def hedge_delay(self, config: AgentConfig) -> Optional[float]:
+        """Seconds to wait before hedging a call under `config`; `None` disables the hedge."""
+        if not self.config.hedge:
+            return None
+        tracker = self.tracker(config)
+        if len(tracker) < self.config.hedge_min_samples:
+            return None
+        return tracker.percentile(self.config.hedge_percentile)
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return self.inner.generate(prompt, config=config, context=context)
+        self._count("calls")
+        tracker = self.tracker(config)
+        call = functools.partial(self.inner.generate, prompt, config=config, context=context)
+        for attempt in itertools.count():
+            try:
+                return self._hedged(call, config, tracker)
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+            time.sleep(self._backoff(attempt))
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return await self.inner.agenerate(prompt, config=config, context=context)
+        self._count("calls")
+        tracker = self.tracker(config)
+        call = functools.partial(self.inner.agenerate, prompt, config=config, context=context)
+        for attempt in itertools.count():
+            try:
+                return await self._ahedged(call, config, tracker)
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+            await asyncio.sleep(self._backoff(attempt))
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        return self.inner.generate_stream(prompt, config=config, context=context)
+
+    def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        return self.inner.agenerate_stream(prompt, config=config, context=context)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        self._count("calls")
+        generate_batch = self.inner.generate_batch  # type: ignore[attr-defined]
+        for attempt in itertools.count():
+            try:
+                return generate_batch(prompts, config=config, contexts=contexts)
+            except Exception as exc:
+                if not self._should_retry(exc, attempt):
+                    raise
+            time.sleep(self._backoff(attempt))
+
+    def _hedged(self, call: Callable[[], str], config: AgentConfig, tracker: LatencyTracker) -> str:
+        delay = self.hedge_delay(config)
+        if delay is None:
+            return self._timed(call, tracker)
+        executor = self._pool()
+        started = threading.Event()
+
+        def first() -> str:
+            started.set()
+            return self._timed(call, tracker)
+
+        primary = executor.submit(first)
+        # The hedge delay runs from when the attempt starts, not from when it was queued.
+        started.wait()
+        done, pending = wait({primary}, timeout=delay)
+        if not done:
+            self._count("hedges")
+            pending.add(executor.submit(self._timed, call, tracker))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        while True:
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+            if not pending:
+                raise error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    async def _ahedged(
+        self, call: Callable[[], Any], config: AgentConfig, tracker: LatencyTracker
+    ) -> str:
+        delay = self.hedge_delay(config)
+        primary = asyncio.ensure_future(self._atimed(call, tracker))
+        if delay is None:
+            return await primary
+        done, pending = await asyncio.wait({primary}, timeout=delay)
+        if not done:
+            self._count("hedges")
+            pending.add(asyncio.ensure_future(self._atimed(call, tracker)))
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        try:
+            while True:
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            self._count("hedge_wins")
+                        return task.result()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _timed(call: Callable[[], str], tracker: LatencyTracker) -> str:
+        start = time.perf_counter()
+        result = call()
+        tracker.record(time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    async def _atimed(call: Callable[[], Any], tracker: LatencyTracker) -> str:
+        start = time.perf_counter()
+        result = await call()
+        tracker.record(time.perf_counter() - start)
+        return result
+
+    def _should_retry(self, exc: BaseException, attempt: int) -> bool:
+        if attempt + 1 >= self.config.max_attempts or not is_retryable(exc):
+            self._count("failures")
+            return False
+        self._count("retries")
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.config.backoff_max, self.config.backoff_base * 2**attempt)
+        with self._lock:
+            return self._random.uniform(0, ceiling)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers, thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
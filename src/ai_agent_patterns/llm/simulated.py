@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..config import AgentConfig, SimulationConfig
+from .base import BaseLLMClient, active_token_sink
+
+_WORDS = ("agent", "ticket", "billing", "outage", "runbook", "escalate", "summary", "plan")
+
+
+class SimulatedRateLimitError(Exception):
+    """Injected HTTP 429; `is_overload` and `is_retryable` treat it like a provider's."""
+
+    status_code = 429
+
+
+class SimulatedServerError(Exception):
+    """Injected HTTP 503, retryable like a provider's."""
+
+    status_code = 503
+
+
+@dataclass
+class SimulationStats:
+    requests: int = 0
+    rate_limited: int = 0
+    errors: int = 0
+    output_tokens: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class _Plan:
+    """What one simulated request will do, drawn up front so sync and async agree."""
+
+    first_token: float
+    tokens: int
+    fault: Optional[Exception]
+
+
+class SimulatedLLMClient(BaseLLMClient):
+    """Offline provider with realistic timing and faults, for load tests.
+
+    Each request waits a time-to-first-token drawn from `SimulationConfig.latency`
+    ("fixed", "lognormal" or "histogram" replay), then emits a sampled number of
+    output tokens at `tokens_per_second`, sleeping for real (`time.sleep` or
+    `asyncio.sleep`) so thread pools, event loops, timeouts and queues behave as
+    they would against a network API. A `rate_limit_rate` share of requests fails
+    at once with `SimulatedRateLimitError`, and an `error_rate` share fails with
+    `SimulatedServerError` after the first-token wait. All draws come from one
+    generator seeded by `seed`, so a single-threaded run is reproducible.
+    `sleep` replaces `time.sleep` on the sync paths, e.g. to record waits in tests.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulationConfig] = None,
+        *,
+        name: str = "simulated",
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__(name=name)
+        config = config or SimulationConfig()
+        self.config = config
+        self._sleep = sleep
+        self.stats = SimulationStats()
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._histogram: Optional[Tuple[List[float], List[float]]] = None
+        if config.latency == "histogram":
+            if not config.histogram:
+                raise ValueError("histogram latency needs SimulationConfig.histogram")
+            values = [value for value, _weight in config.histogram]
+            cumulative = list(itertools.accumulate(weight for _value, weight in config.histogram))
+            self._histogram = (values, cumulative)
+        elif config.latency not in {"fixed", "lognormal"}:
+            raise ValueError(f"Unsupported latency distribution: {config.latency}")
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return self.collect_stream(sink, prompt, config=config, context=context)
+        plan = self._plan(config)
+        self._wait(plan.first_token, plan)
+        self._wait(self._decode_seconds(plan.tokens), None)
+        return self._text(prompt, plan.tokens)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        sink = active_token_sink()
+        if sink is not None:
+            return await self.acollect_stream(sink, prompt, config=config, context=context)
+        plan = self._plan(config)
+        await self._await(plan.first_token, plan)
+        await self._await(self._decode_seconds(plan.tokens), None)
+        return self._text(prompt, plan.tokens)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        plan = self._plan(config)
+        self._wait(plan.first_token, plan)
+        for index, chunk in enumerate(self._chunks(prompt, plan.tokens)):
+            if index:
+                self._wait(self._decode_seconds(1), None)
+            yield chunk
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        plan = self._plan(config)
+        await self._await(plan.first_token, plan)
+        for index, chunk in enumerate(self._chunks(prompt, plan.tokens)):
+            if index:
+                await self._await(self._decode_seconds(1), None)
+            yield chunk
+
+    def generate_batch(
+        self,
+        prompts: Sequence[str],
+        *,
+        config: AgentConfig,
+        contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+    ) -> List[str]:
+        """Decode all `prompts` in one request, which lasts as long as its longest output."""
+        plan = self._plan(config)
+        with self._lock:
+            extra = [self._length(config) for _ in prompts[1:]]
+            if plan.fault is None:
+                self.stats.output_tokens += sum(extra)
+        lengths = [plan.tokens, *extra]
+        self._wait(plan.first_token, plan)
+        self._wait(self._decode_seconds(max(lengths)), None)
+        return [self._text(prompt, tokens) for prompt, tokens in zip(prompts, lengths, strict=True)]
+
+    def _plan(self, config: AgentConfig) -> _Plan:
+        settings = self.config
+        with self._lock:
+            self.stats.requests += 1
+            draw = self._random.random()
+            if draw < settings.rate_limit_rate:
+                self.stats.rate_limited += 1
+                return _Plan(0.0, 0, SimulatedRateLimitError("simulated rate limit (429)"))
+            first_token = self._first_token()
+            tokens = self._length(config)
+            if draw < settings.rate_limit_rate + settings.error_rate:
+                self.stats.errors += 1
+                return _Plan(first_token, tokens, SimulatedServerError("simulated server error (503)"))
+            self.stats.output_tokens += tokens
+            return _Plan(first_token, tokens, None)
+
+    def _length(self, config: AgentConfig) -> int:
+        """Sampled output length, capped at `max_tokens`; the caller holds `_lock`."""
+        mean, sigma = self.config.output_tokens, self.config.output_tokens_sigma
+        tokens = mean * self._random.lognormvariate(0, sigma) if sigma else mean
+        return max(1, min(round(tokens), config.max_tokens))
+
+    def _first_token(self) -> float:
+        settings = self.config
+        if self._histogram is not None:
+            values, cumulative = self._histogram
+            index = bisect.bisect_right(cumulative, self._random.random() * cumulative[-1])
+            return values[min(index, len(values) - 1)]
+        if settings.latency == "lognormal":
+            return settings.first_token_seconds * self._random.lognormvariate(0, settings.latency_sigma)
+        return settings.first_token_seconds
+
+    def _decode_seconds(self, tokens: int) -> float:
+        rate = self.config.tokens_per_second
+        return tokens / rate if rate else 0.0
+
+    def _wait(self, seconds: float, plan: Optional[_Plan]) -> None:
+        if seconds > 0:
+            self._sleep(seconds)
+            self._busy(seconds)
+        if plan is not None and plan.fault is not None:
+            raise plan.fault
+
+    async def _await(self, seconds: float, plan: Optional[_Plan]) -> None:
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+            self._busy(seconds)
+        if plan is not None and plan.fault is not None:
+            raise plan.fault
+
+    def _busy(self, seconds: float) -> None:
+        with self._lock:
+            self.stats.busy_seconds += seconds
+
+    @staticmethod
+    def _chunks(prompt: str, tokens: int) -> Iterator[str]:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        yield f"[sim-{digest}]"
+        for index in range(1, tokens):
+            yield " " + _WORDS[(int(digest, 16) + index) % len(_WORDS)]
+
+    def _text(self, prompt: str, tokens: int) -> str:
+        return "".join(self._chunks(prompt, tokens))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from ..config import AgentConfig
+from .base import BaseLLMClient, active_token_sink, request_key
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    leaders: int = 0
+    suppressed: int = 0
+
+    @property
+    def suppression_rate(self) -> float:
+        return self.suppressed / self.calls if self.calls else 0.0
+
+
+class _LeaderCancelledError(Exception):
+    """The call a follower was waiting on was cancelled; the follower goes again."""
+
+
+class SingleFlightLLMClient(BaseLLMClient):
+    """Shares one in-flight `inner` call among concurrent identical requests.
+
+    Requests are identified by `request_key`. The first caller for a key (the
+    leader) calls `inner`; callers arriving before it finishes wait for the
+    same result or exception instead of sending their own. Threads and
+    coroutines, on any event loop, share the same table of in-flight calls.
+    Nothing is kept once the call completes; pair with `CachingLLMClient` to
+    serve later repeats. Streams and calls under a token sink are not shared.
+    """
+
+    def __init__(self, inner: BaseLLMClient) -> None:
+        super().__init__(name=inner.name)
+        self.inner = inner
+        self.stats = SingleFlightStats()
+        self._flights: Dict[str, "Future[str]"] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.inner, "model", None)
+
+    def generate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return self.inner.generate(prompt, config=config, context=context)
+        key = request_key(self.inner, prompt, config, context)
+        while True:
+            flight, leader = self._join(key)
+            if not leader:
+                try:
+                    return flight.result()
+                except _LeaderCancelledError:
+                    continue
+            try:
+                response = self.inner.generate(prompt, config=config, context=context)
+            except BaseException as exc:
+                self._land(key, flight, exc=exc)
+                raise
+            self._land(key, flight, response=response)
+            return response
+
+    async def agenerate(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if active_token_sink() is not None:
+            return await self.inner.agenerate(prompt, config=config, context=context)
+        key = request_key(self.inner, prompt, config, context)
+        while True:
+            flight, leader = self._join(key)
+            if not leader:
+                try:
+                    # Shielded: cancelling this follower must not cancel the shared call.
+                    return await asyncio.shield(asyncio.wrap_future(flight))
+                except _LeaderCancelledError:
+                    continue
+            try:
+                response = await self.inner.agenerate(prompt, config=config, context=context)
+            except asyncio.CancelledError:
+                self._land(key, flight, exc=_LeaderCancelledError())
+                raise
+            except BaseException as exc:
+                self._land(key, flight, exc=exc)
+                raise
+            self._land(key, flight, response=response)
+            return response
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[str]:
+        return self.inner.generate_stream(prompt, config=config, context=context)
+
+    def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        config: AgentConfig,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        return self.inner.agenerate_stream(prompt, config=config, context=context)
+
+    def _join(self, key: str) -> Tuple["Future[str]", bool]:
+        """The in-flight call for `key`, and whether the caller must make it."""
+        with self._lock:
+            self.stats.calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats.suppressed += 1
+                return flight, False
+            flight = self._flights[key] = Future()
+            self.stats.leaders += 1
+            return flight, True
+
+    def _land(
+        self,
+        key: str,
+        flight: "Future[str]",
+        *,
+        response: Optional[str] = None,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            del self._flights[key]
+        if exc is not None:
+            flight.set_exception(exc)
+        else:
+            flight.set_result(response)  # type: ignore[arg-type]
@@ -1,5 +1,32 @@
-from .base import MemoryStore
-from .conversation import ConversationBuffer
+from .ann import LSHVectorMemory
+from .base import MemoryStore, MutableMemoryStore, SearchableMemoryStore
+from .concurrent import ConcurrentConversationBuffer, ConcurrentKeywordVectorMemory
+from .conversation import ConversationBuffer, ConversationStats, estimate_tokens
+from .embedding import HashingEmbedder
+from .persistent import PersistentVectorMemory
+from .query_cache import CachedMemoryStore, QueryCacheStats
+from .sessions import Session, SessionStats, SessionStore, shared_session_store
+from .sparse import SparseVectorMemory
 from .vector import KeywordVectorMemory
 
-__all__ = ["MemoryStore", "ConversationBuffer", "KeywordVectorMemory"]
+__all__ = [
+    "MemoryStore",
+    "SearchableMemoryStore",
+    "MutableMemoryStore",
+    "ConversationBuffer",
+    "ConversationStats",
+    "estimate_tokens",
+    "KeywordVectorMemory",
+    "ConcurrentKeywordVectorMemory",
+    "ConcurrentConversationBuffer",
+    "SparseVectorMemory",
+    "PersistentVectorMemory",
+    "LSHVectorMemory",
+    "CachedMemoryStore",
+    "QueryCacheStats",
+    "HashingEmbedder",
+    "Session",
+    "SessionStats",
+    "SessionStore",
+    "shared_session_store",
+]
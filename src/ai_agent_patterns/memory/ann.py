@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..types import EmbeddingClient
+from .base import MemoryStore
+from .embedding import HashingEmbedder
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+PRECISIONS = ("float32", "float16", "int8")
+DEQUANTIZE_ROWS = 4096
+
+
+def _probe_sequence(margins: Sequence[float]) -> Iterator[Tuple[int, ...]]:
+    """Bit subsets to flip, cheapest first by summed projection margin.
+
+    The shift/expand enumeration of multi-probe LSH: `margins` must be sorted
+    ascending and subsets are yielded as positions into it, starting with the
+    single cheapest flip. Every one of the 2**len(margins) - 1 subsets appears once.
+    """
+    if not margins:
+        return
+    heap = [(margins[0], (0,))]
+    while heap:
+        cost, subset = heapq.heappop(heap)
+        yield subset
+        last = subset[-1]
+        if last + 1 < len(margins):
+            heapq.heappush(heap, (cost - margins[last] + margins[last + 1], subset[:-1] + (last + 1,)))
+            heapq.heappush(heap, (cost + margins[last + 1], subset + (last + 1,)))
+
+
+@dataclass
+class LSHVectorMemory(MemoryStore):
+    """Approximate nearest-neighbour memory over text embeddings (requires numpy).
+
+    Items are embedded with `embedder`, any `EmbeddingClient` (a `HashingEmbedder`
+    of `dimensions` by default, or a `CachingEmbeddingClient`), and bucketed
+    in `tables` random-hyperplane LSH tables of `bits` bits each. A query scores only
+    the items sharing a bucket with it, visiting its own bucket plus `probes` nearby
+    buckets per table (multi-probe LSH): raise `probes` or `tables` for recall, lower
+    them for latency. Below `exact_threshold` items every item is scored, which is
+    both exact and cheaper than probing. Vectors are normalised on the way in and
+    candidates are ranked by cosine.
+
+    `precision` stores the vectors as "float32", "float16" (2x smaller) or
+    per-row-scaled "int8" (about 4x smaller), in one contiguous array that is
+    dequantized while scoring. With `rerank`, the best `rerank` candidates are
+    re-embedded and re-scored at full precision before the top `limit` is taken.
+    Query texts go through the embedder's `embed_query` when it has one (as
+    `CachingEmbeddingClient` does), keeping them out of the document cache.
+
+    `upsert`, `delete` and `ttl_seconds` behave as in `KeywordVectorMemory`: rows
+    are masked by tombstone and expiry while scoring, and `compact` (automatic
+    past `compact_ratio` tombstones) rebuilds the arrays and buckets from the
+    stored vectors without re-embedding.
+    """
+
+    dimensions: int = 256
+    tables: int = 8
+    bits: int = 12
+    probes: int = 2
+    exact_threshold: int = 1024
+    seed: int = 0
+    embedder: Optional[EmbeddingClient] = None
+    precision: str = "float32"
+    rerank: int = 0
+    compact_ratio: float = 0.25
+    _items: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False)
+    _embeddings: Any = field(default=None, init=False, repr=False)
+    _scales: Any = field(default=None, init=False, repr=False)
+    _planes: Any = field(default=None, init=False, repr=False)
+    _weights: Any = field(default=None, init=False, repr=False)
+    _buckets: List[Dict[int, List[int]]] = field(default_factory=list, init=False, repr=False)
+    _dead: Any = field(default=None, init=False, repr=False)
+    _expires: Any = field(default=None, init=False, repr=False)
+    _expiring: int = field(default=0, init=False, repr=False)
+    _tombstones: int = field(default=0, init=False, repr=False)
+    _keys: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _row_keys: Dict[int, str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if np is None:
+            raise ImportError(
+                "LSHVectorMemory requires numpy; "
+                "pip install 'ai-agent-design-pattern-collection[vector]'."
+            )
+        if not 0 < self.bits <= 62:
+            raise ValueError("bits must be between 1 and 62")
+        if self.precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision: {self.precision}")
+        if self.embedder is None:
+            self.embedder = HashingEmbedder(self.dimensions, seed=self.seed)
+        self.dimensions = self.embedder.dimensions
+        rng = np.random.default_rng(self.seed)
+        self._planes = rng.standard_normal((self.tables * self.bits, self.dimensions)).astype(np.float32)
+        self._weights = np.left_shift(np.int64(1), np.arange(self.bits, dtype=np.int64))
+        self._embeddings = np.zeros((16, self.dimensions), dtype=self.precision)
+        self._scales = np.ones(16, dtype=np.float32)
+        self._dead = np.zeros(16, dtype=bool)
+        self._expires = np.full(16, np.inf)
+        self._buckets = [{} for _ in range(self.tables)]
+
+    def __len__(self) -> int:
+        return len(self._items) - self._tombstones
+
+    def add(self, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self.extend([item], ttl_seconds=ttl_seconds)
+
+    def upsert(self, key: str, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        """Store `item` under `key`, replacing the item previously stored under it."""
+        row = len(self._items)
+        self.extend([item], ttl_seconds=ttl_seconds)
+        previous = self._keys.get(key)
+        self._keys[key] = row
+        self._row_keys[row] = key
+        if previous is not None:
+            self._row_keys.pop(previous, None)
+            self._kill(previous)
+
+    def delete(self, key: str) -> bool:
+        """Remove the item stored under `key`; `False` if there is none."""
+        row = self._keys.pop(key, None)
+        if row is None:
+            return False
+        self._row_keys.pop(row, None)
+        self._kill(row)
+        return True
+
+    def purge_expired(self) -> int:
+        """Tombstone every item whose TTL has passed; returns how many."""
+        if not self._expiring:
+            return 0
+        rows = len(self._items)
+        expired = np.flatnonzero((self._expires[:rows] <= time.monotonic()) & ~self._dead[:rows])
+        for row in expired.tolist():
+            key = self._row_keys.pop(row, None)
+            if key is not None:
+                del self._keys[key]
+        self._dead[expired] = True
+        self._tombstones += len(expired)
+        if self._tombstones > self.compact_ratio * len(self._items):
+            self.compact()
+        return len(expired)
+
+    def compact(self) -> None:
+        """Drop tombstoned and expired rows, renumbering the survivors."""
+        rows = len(self._items)
+        survivors = np.flatnonzero(self._live(slice(0, rows)))
+        renumbered = {int(row): fresh for fresh, row in enumerate(survivors.tolist())}
+        self._embeddings = self._embeddings[survivors]
+        self._scales = self._scales[survivors]
+        self._expires = self._expires[survivors]
+        self._dead = np.zeros(len(survivors), dtype=bool)
+        self._items = [self._items[row] for row in survivors.tolist()]
+        self._row_keys = {renumbered[row]: key for row, key in self._row_keys.items() if row in renumbered}
+        self._keys = {key: row for row, key in self._row_keys.items()}
+        self._expiring = int(np.isfinite(self._expires).sum())
+        self._tombstones = 0
+        self._buckets = [{} for _ in range(self.tables)]
+        self._bucket(0, self._dequantize(np.arange(len(survivors))))
+
+    def extend(self, items: Iterable[Dict[str, Any]], *, ttl_seconds: Optional[float] = None) -> None:
+        """Embed and bucket `items`, hashing them against all tables in one product."""
+        batch = list(items)
+        if not batch:
+            return
+        vectors = np.asarray(
+            self.embedder.embed_batch([str(item.get("content", "")) for item in batch]), dtype=np.float32
+        ).reshape(len(batch), self.dimensions)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        start = len(self._items)
+        self._reserve(start + len(batch))
+        self._store(start, vectors)
+        if ttl_seconds is not None:
+            self._expires[start : start + len(batch)] = time.monotonic() + ttl_seconds
+            self._expiring += len(batch)
+        self._items.extend(batch)
+        self._bucket(start, vectors)
+
+    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
+        if not (self._tombstones or self._expiring):
+            return self._items[-limit:]
+        rows = np.flatnonzero(self._live(slice(0, len(self._items))))
+        return [self._items[row] for row in rows[-limit:].tolist()] if limit > 0 else []
+
+    def query(
+        self, text: str, limit: int = 3, probes: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Approximate top `limit` items by cosine; ties keep insertion order.
+
+        `probes` overrides the instance setting for this call.
+        """
+        if limit <= 0:
+            return []
+        vector = self._embed_query(text)
+        if len(self._items) <= self.exact_threshold:
+            return self._rank(None, vector, limit)
+        return self._rank(self._candidates(vector, self.probes if probes is None else probes), vector, limit)
+
+    def query_exact(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        """Brute-force cosine over every item; the reference `query` approximates."""
+        if limit <= 0:
+            return []
+        vector = self._embed_query(text)
+        return self._rank(None, vector, limit)
+
+    def embeddings(self) -> Any:
+        """Stored unit vectors dequantized to float32, one row per item."""
+        return self._dequantize(np.arange(len(self._items)))
+
+    def vector_bytes(self) -> int:
+        """Bytes held by the stored vectors (and int8 row scales)."""
+        rows = len(self._items)
+        scales = self._scales[:rows].nbytes if self.precision == "int8" else 0
+        return self._embeddings[:rows].nbytes + scales
+
+    def _bucket(self, start: int, vectors: Any) -> None:
+        for offset, row in enumerate(self._codes(vectors).tolist()):
+            for buckets, code in zip(self._buckets, row, strict=True):
+                buckets.setdefault(code, []).append(start + offset)
+
+    def _kill(self, row: int) -> None:
+        if self._dead[row]:
+            return
+        self._dead[row] = True
+        self._tombstones += 1
+        if self._tombstones > self.compact_ratio * len(self._items):
+            self.compact()
+
+    def _live(self, rows: Any) -> Any:
+        """Boolean mask of `rows` (a slice or index array) neither deleted nor expired."""
+        live = ~self._dead[rows]
+        if self._expiring:
+            live &= self._expires[rows] > time.monotonic()
+        return live
+
+    def _embed_query(self, text: str) -> Any:
+        embed_query = getattr(self.embedder, "embed_query", None)
+        raw = embed_query(text) if embed_query is not None else self.embedder.embed_batch([text])[0]
+        vector = np.asarray(raw, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _reserve(self, rows: int) -> None:
+        if rows > len(self._embeddings):
+            capacity = max(rows, 2 * len(self._embeddings))
+            grown = np.zeros((capacity, self.dimensions), dtype=self._embeddings.dtype)
+            grown[: len(self._items)] = self._embeddings[: len(self._items)]
+            scales = np.ones(capacity, dtype=np.float32)
+            scales[: len(self._items)] = self._scales[: len(self._items)]
+            dead = np.zeros(capacity, dtype=bool)
+            dead[: len(self._items)] = self._dead[: len(self._items)]
+            expires = np.full(capacity, np.inf)
+            expires[: len(self._items)] = self._expires[: len(self._items)]
+            self._embeddings, self._scales, self._dead, self._expires = grown, scales, dead, expires
+
+    def _store(self, start: int, vectors: Any) -> None:
+        rows = slice(start, start + len(vectors))
+        if self.precision == "int8":
+            peaks = np.abs(vectors).max(axis=1)
+            scales = np.where(peaks > 0, peaks / 127.0, 1.0).astype(np.float32)
+            self._embeddings[rows] = np.rint(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        else:
+            self._embeddings[rows] = vectors
+
+    def _dequantize(self, indices: Any) -> Any:
+        rows = self._embeddings[indices].astype(np.float32)
+        if self.precision == "int8":
+            rows *= self._scales[indices, None]
+        return rows
+
+    def _scores(self, rows: Any, vector: Any) -> Any:
+        """Dot products of the stored `rows` (a slice or index array) with `vector`."""
+        if self.precision == "float32":
+            return self._embeddings[rows] @ vector
+        if isinstance(rows, slice):
+            # Dequantize a cache-sized block at a time so the product still runs in BLAS.
+            start, stop, _step = rows.indices(len(self._items))
+            scores = np.empty(stop - start, dtype=np.float32)
+            block = np.empty((min(DEQUANTIZE_ROWS, stop - start), self.dimensions), dtype=np.float32)
+            for offset in range(start, stop, DEQUANTIZE_ROWS):
+                count = min(DEQUANTIZE_ROWS, stop - offset)
+                np.copyto(block[:count], self._embeddings[offset : offset + count], casting="unsafe")
+                np.matmul(block[:count], vector, out=scores[offset - start : offset - start + count])
+        else:
+            scores = self._embeddings[rows].astype(np.float32) @ vector
+        if self.precision == "int8":
+            # Scale after the product: one multiply per row instead of per component.
+            scores *= self._scales[rows]
+        return scores
+
+    def _exact_scores(self, indices: Any, vector: Any) -> Any:
+        texts = [str(self._items[index].get("content", "")) for index in indices.tolist()]
+        rows = np.asarray(self.embedder.embed_batch(texts), dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(rows, axis=1)
+        return np.divide(rows @ vector, norms, out=np.zeros(len(texts), dtype=np.float32), where=norms > 0)
+
+    def _projections(self, vectors: Any) -> Any:
+        return (vectors @ self._planes.T).reshape(len(vectors), self.tables, self.bits)
+
+    def _codes(self, vectors: Any) -> Any:
+        return (self._projections(vectors) > 0).astype(np.int64) @ self._weights
+
+    def _candidates(self, vector: Any, probes: int) -> Any:
+        projections = self._projections(vector[None, :])[0]
+        codes = (projections > 0).astype(np.int64) @ self._weights
+        hits: List[List[int]] = []
+        for table, (buckets, code) in enumerate(zip(self._buckets, codes.tolist(), strict=True)):
+            hits.append(buckets.get(code, []))
+            if probes <= 0:
+                continue
+            margins = np.abs(projections[table])
+            order = np.argsort(margins, kind="stable")
+            flips = self._weights[order].tolist()
+            for subset in itertools.islice(_probe_sequence(margins[order].tolist()), probes):
+                probe = code
+                for position in subset:
+                    probe ^= flips[position]
+                hits.append(buckets.get(probe, []))
+        return np.unique(np.fromiter(itertools.chain.from_iterable(hits), dtype=np.int64))
+
+    def _rank(self, indices: Any, vector: Any, limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Top `limit` of `indices` (every item when `None`) by dot product with `vector`."""
+        if indices is None:
+            scores = self._scores(slice(0, len(self._items)), vector)
+            indices = np.arange(len(self._items))
+        else:
+            scores = self._scores(indices, vector)
+        filtered = bool(self._tombstones or self._expiring)
+        if filtered:
+            live = self._live(indices)
+            indices, scores = indices[live], scores[live]
+        indices, scores = self._best(indices, scores, max(limit, self.rerank))
+        if self.rerank and len(indices):
+            indices, scores = self._best(indices, self._exact_scores(indices, vector), limit)
+        order = np.lexsort((indices, -scores))[:limit]
+        results = [(self._items[index], float(scores[pos])) for pos, index in zip(order, indices[order], strict=True)]
+        if len(results) < limit:
+            matched = set(indices.tolist())
+            live = self._live(slice(0, len(self._items))) if filtered else None
+            for index, item in enumerate(self._items):
+                if index not in matched and (live is None or live[index]):
+                    results.append((item, 0.0))
+                    if len(results) == limit:
+                        break
+        return results
+
+    @staticmethod
+    def _best(indices: Any, scores: Any, keep: int) -> Tuple[Any, Any]:
+        """Positive-scoring entries, cut to the `keep` best plus any ties with the last."""
+        positive = scores > 0
+        indices, scores = indices[positive], scores[positive]
+        if len(scores) > keep:
+            threshold = scores[np.argpartition(scores, -keep)[-keep]]
+            chosen = scores >= threshold
+            indices, scores = indices[chosen], scores[chosen]
+        return indices, scores
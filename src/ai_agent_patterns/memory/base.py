@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 
 class MemoryStore(Protocol):
@@ -9,3 +9,22 @@ class MemoryStore(Protocol):
 
     def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
         ...
+
+
+class SearchableMemoryStore(MemoryStore, Protocol):
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        ...
+
+
+class MutableMemoryStore(SearchableMemoryStore, Protocol):
+    def upsert(self, key: str, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        ...
+
+    def delete(self, key: str) -> bool:
+        ...
+
+    def purge_expired(self) -> int:
+        ...
+
+    def compact(self) -> None:
+        ...
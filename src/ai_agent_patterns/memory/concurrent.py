@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..llm.base import estimate_tokens
+from .base import MemoryStore
+from .conversation import ConversationStats
+from .vector import KeywordVectorMemory, _deadline, _KeywordIndex
+
+
+class _Flusher:
+    """One daemon thread that publishes stores' queued writes at their deadlines.
+
+    Stores are held weakly, so a store dropped with writes still queued is not
+    kept alive by its pending deadline.
+    """
+
+    def __init__(self) -> None:
+        self._due: List[Tuple[float, int, "weakref.ref[ConcurrentKeywordVectorMemory]"]] = []
+        self._order = itertools.count()
+        self._ready = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, store: "ConcurrentKeywordVectorMemory", at: float) -> None:
+        with self._ready:
+            heapq.heappush(self._due, (at, next(self._order), weakref.ref(store)))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="keyword-memory-flusher", daemon=True)
+                self._thread.start()
+            self._ready.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._due:
+                    self._ready.wait()
+                at, _order, ref = self._due[0]
+                remaining = at - time.monotonic()
+                if remaining > 0:
+                    self._ready.wait(remaining)
+                    continue
+                heapq.heappop(self._due)
+            store = ref()
+            if store is not None:
+                store.flush()
+
+
+_flusher = _Flusher()
+
+
+@dataclass
+class ConcurrentKeywordVectorMemory(KeywordVectorMemory):
+    """`KeywordVectorMemory` that many threads can query while others write.
+
+    Every backing list is append-only, so the first `n` rows of an index form an
+    immutable snapshot. Queries read the published `(index, n)` pair once, never
+    take a lock and never look past row `n`. Writers queue adds and upserts under
+    a lock and publish them `batch_size` at a time, or from a shared flusher
+    thread `flush_interval` seconds after the first queued write (`0` publishes
+    every write at once, so a writer reads its own writes). Readers never
+    publish; a batching writer that must read its own writes right away calls
+    `flush()`. An upsert's replacement is published
+    before the old row is tombstoned. Compaction builds a new index on a
+    background thread and publishes it with the same single store.
+    """
+
+    batch_size: int = 64
+    flush_interval: float = 0.005
+    _pending: List[Tuple[Dict[str, Any], Optional[str], Optional[float]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _snapshot: Tuple[_KeywordIndex, int] = field(default=None, init=False, repr=False)  # type: ignore[assignment]
+    _deferred: Optional[List[int]] = field(default=None, init=False, repr=False)
+    _compacting: bool = field(default=False, init=False, repr=False)
+    _flush_at: Optional[float] = field(default=None, init=False, repr=False)
+    _write_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._snapshot = (self._index, 0)
+        super().__post_init__()
+        self.flush()
+
+    def __len__(self) -> int:
+        index, size = self._snapshot
+        return size - index.tombstones
+
+    def add(self, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self.extend([item], ttl_seconds=ttl_seconds)
+
+    def extend(self, items: Iterable[Dict[str, Any]], *, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = _deadline(ttl_seconds)
+        self._enqueue([(item, None, expires_at) for item in items])
+
+    def upsert(self, key: str, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self._enqueue([(item, key, _deadline(ttl_seconds))])
+
+    def delete(self, key: str) -> bool:
+        with self._write_lock:
+            self._publish()
+            return super().delete(key)
+
+    def purge_expired(self) -> int:
+        with self._write_lock:
+            self._publish()
+            return super().purge_expired()
+
+    def compact(self) -> None:
+        with self._write_lock:
+            self._publish()
+            super().compact()
+            self._snapshot = (self._index, len(self._index.items))
+
+    def flush(self) -> None:
+        """Publish queued writes to readers now."""
+        with self._write_lock:
+            self._publish()
+
+    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
+        index, size = self._snapshot
+        return self._fetch(index, size, limit)
+
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        index, size = self._snapshot
+        return self._query(index, size, text, limit)
+
+    def _enqueue(self, writes: List[Tuple[Dict[str, Any], Optional[str], Optional[float]]]) -> None:
+        with self._write_lock:
+            self._pending.extend(writes)
+            if len(self._pending) >= self.batch_size or self.flush_interval <= 0:
+                self._publish()
+            elif self._flush_at is None:
+                self._flush_at = time.monotonic() + self.flush_interval
+                _flusher.schedule(self, self._flush_at)
+
+    def _publish(self) -> None:
+        """Make queued writes visible; the caller holds `_write_lock`."""
+        self._flush_at = None
+        pending, self._pending = self._pending, []
+        self._deferred = []
+        try:
+            for item, key, expires_at in pending:
+                self._append(item, key, expires_at)
+        finally:
+            deferred, self._deferred = self._deferred, None
+            # Publishing is a single attribute store: readers see all of the batch or none of it.
+            self._snapshot = (self._index, len(self._index.items))
+        for row in deferred:
+            self._kill(row)
+
+    def _kill(self, row: int) -> None:
+        if self._deferred is not None:
+            self._deferred.append(row)
+        else:
+            super()._kill(row)
+
+    def _schedule_compaction(self) -> None:
+        if self._compacting:
+            return
+        self._compacting = True
+
+        def run() -> None:
+            try:
+                self.compact()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, name="keyword-memory-compaction", daemon=True).start()
+
+
+@dataclass(frozen=True)
+class _ConversationSnapshot:
+    entries: Tuple[Tuple[Dict[str, Any], int], ...] = ()
+    tokens: int = 0
+
+
+@dataclass
+class ConcurrentConversationBuffer(MemoryStore):
+    """`ConversationBuffer` whose readers work on an immutable snapshot.
+
+    Writers rebuild the (at most `capacity`-entry) tuple under a lock and swap it
+    in; `fetch` and `tokens` read whichever snapshot is current without locking.
+    `extend` applies several turns in one swap.
+    """
+
+    capacity: int = 20
+    max_tokens: Optional[int] = None
+    stats: ConversationStats = field(default_factory=ConversationStats)
+    _snapshot: _ConversationSnapshot = field(default_factory=_ConversationSnapshot, init=False, repr=False)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        self.extend([item])
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        added = [(item, estimate_tokens(str(item.get("content", "")))) for item in items]
+        with self._write_lock:
+            entries = self._snapshot.entries + tuple(added)
+            tokens = self._snapshot.tokens + sum(count for _item, count in added)
+            start = 0
+            while len(entries) - start > self.capacity or (
+                self.max_tokens is not None and tokens > self.max_tokens and len(entries) - start > 1
+            ):
+                tokens -= entries[start][1]
+                start += 1
+            self._snapshot = _ConversationSnapshot(entries[start:], tokens)
+            self.stats.added += len(added)
+            self.stats.evicted += start
+            self.stats.entries = len(entries) - start
+            self.stats.tokens = tokens
+
+    def fetch(self, limit: int = 5, token_budget: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Newest entries, oldest first, up to `limit` and within `token_budget` tokens."""
+        selected: List[Dict[str, Any]] = []
+        spent = 0
+        for item, tokens in reversed(self._snapshot.entries):
+            if len(selected) >= limit:
+                break
+            if token_budget is not None and spent + tokens > token_budget:
+                break
+            selected.append(item)
+            spent += tokens
+        selected.reverse()
+        return selected
+
+    @property
+    def tokens(self) -> int:
+        return self._snapshot.tokens
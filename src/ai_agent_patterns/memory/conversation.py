@@ -1,20 +1,61 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
+from ..llm.base import estimate_tokens
 from .base import MemoryStore
 
 
+@dataclass
+class ConversationStats:
+    entries: int = 0
+    tokens: int = 0
+    added: int = 0
+    evicted: int = 0
+
+
 @dataclass
 class ConversationBuffer(MemoryStore):
+    """Recent conversation turns with a running token estimate.
+
+    Holds at most `capacity` entries and, when `max_tokens` is set, evicts the oldest
+    turns once the total estimate exceeds it. Both evictions are O(1).
+    """
+
     capacity: int = 20
-    _items: List[Dict[str, Any]] = field(default_factory=list)
+    max_tokens: Optional[int] = None
+    _items: Deque[Tuple[Dict[str, Any], int]] = field(default_factory=deque)
+    stats: ConversationStats = field(default_factory=ConversationStats)
 
     def add(self, item: Dict[str, Any]) -> None:
-        self._items.append(item)
-        if len(self._items) > self.capacity:
-            self._items.pop(0)
+        tokens = estimate_tokens(str(item.get("content", "")))
+        self._items.append((item, tokens))
+        self.stats.tokens += tokens
+        self.stats.added += 1
+        while len(self._items) > self.capacity or (
+            self.max_tokens is not None and self.stats.tokens > self.max_tokens and len(self._items) > 1
+        ):
+            _evicted, evicted_tokens = self._items.popleft()
+            self.stats.tokens -= evicted_tokens
+            self.stats.evicted += 1
+        self.stats.entries = len(self._items)
+
+    def fetch(self, limit: int = 5, token_budget: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Newest entries, oldest first, up to `limit` and within `token_budget` tokens."""
+        selected: List[Dict[str, Any]] = []
+        spent = 0
+        for item, tokens in reversed(self._items):
+            if len(selected) >= limit:
+                break
+            if token_budget is not None and spent + tokens > token_budget:
+                break
+            selected.append(item)
+            spent += tokens
+        selected.reverse()
+        return selected
 
-    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
-        return self._items[-limit:]
+    @property
+    def tokens(self) -> int:
+        return self.stats.tokens
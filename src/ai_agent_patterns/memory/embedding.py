@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from .text import tokenize
+
+
+@dataclass
+class HashingEmbedder:
+    """Deterministic bag-of-words embedding with no model or network access.
+
+    Each token is hashed (BLAKE2b, so results are stable across processes, unlike
+    `hash`) to one of `dimensions` buckets with a +1/-1 sign, and the summed vector
+    is L2-normalised. Dot products then approximate the cosine similarity of the
+    term-count vectors that `KeywordVectorMemory` scores exactly. It implements
+    `EmbeddingClient` and serves as the offline provider.
+    """
+
+    dimensions: int = 256
+    seed: int = 0
+    _slots: Dict[str, Tuple[int, float]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+
+    @property
+    def name(self) -> str:
+        return f"hashing-{self.seed}"
+
+    def _slot(self, token: str) -> Tuple[int, float]:
+        slot = self._slots.get(token)
+        if slot is None:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8, salt=self.seed.to_bytes(8, "little"))
+            value = int.from_bytes(digest.digest(), "little")
+            slot = self._slots[token] = (value % self.dimensions, 1.0 if value >> 63 else -1.0)
+        return slot
+
+    def embed(self, text: str) -> List[float]:
+        weights: Dict[int, float] = {}
+        for token in tokenize(text):
+            index, sign = self._slot(token)
+            weights[index] = weights.get(index, 0.0) + sign
+        vector = [0.0] * self.dimensions
+        norm = math.sqrt(sum(value * value for value in weights.values()))
+        if norm:
+            for index, value in weights.items():
+                vector[index] = value / norm
+        return vector
+
+    def embed_batch(self, texts: Iterable[str]) -> List[List[float]]:
+        return [self.embed(text) for text in texts]
@@ -0,0 +1,368 @@
+"""Streaming corpus ingestion into an on-disk `SparseVectorMemory` index.
+
+An index directory holds a manifest of source fingerprints and one generation
+subdirectory with the raw term-frequency matrix as `.npy` arrays (opened with
+`mmap_mode="r"`), the chunk records and the vocabulary. Each `ingest_corpus` run
+writes a new generation and then atomically replaces the manifest that points to
+it, so readers and later runs never see a mix of old and new files. Re-running
+`ingest_corpus` re-tokenizes only new or changed sources and copies the rows of
+unchanged ones from the previous index.
+
+    python -m ai_agent_patterns.memory.ingest docs/ .index/knowledge
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .sparse import SparseVectorMemory, np, sparse
+from .text import tokenize
+
+INDEX_VERSION = 2
+TEXT_SUFFIXES = (".txt", ".md", ".rst")
+
+_MANIFEST = "manifest.json"
+_VOCABULARY = "vocabulary.json"
+_CHUNKS = "chunks.jsonl"
+_ARRAYS = ("data", "indices", "indptr")
+_RESERVED = ("content", "source", "chunk")
+
+
+@dataclass
+class SourceDocument:
+    source_id: str
+    fingerprint: Dict[str, Any]
+    load: Callable[[], Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class IngestStats:
+    sources: int = 0
+    indexed: int = 0
+    reused: int = 0
+    removed: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+
+
+def chunk_text(text: str, max_words: int = 200, overlap: int = 40) -> List[str]:
+    """Split text into windows of `max_words` words sharing `overlap` words."""
+    words = text.split()
+    if not words:
+        return []
+    step = max(max_words - overlap, 1)
+    starts = range(0, max(len(words) - overlap, 1), step)
+    return [" ".join(words[start : start + max_words]) for start in starts]
+
+
+def iter_sources(source: str | os.PathLike[str]) -> Iterator[SourceDocument]:
+    """Stream documents from a directory of text files or a JSONL file.
+
+    JSONL records need `text` or `content`; `id` names the record (the line number
+    otherwise) and the remaining fields other than `content`, `source` and `chunk`
+    (which every chunk sets itself) are kept as chunk metadata. Editing either the
+    text or the metadata re-ingests the record.
+    """
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob("*") if p.is_file() and p.suffix in TEXT_SUFFIXES):
+            stat = file.stat()
+            yield SourceDocument(
+                source_id=file.relative_to(path).as_posix(),
+                fingerprint={"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+                load=lambda file=file: (file.read_text(encoding="utf-8"), {}),
+            )
+        return
+    with path.open(encoding="utf-8") as fh:
+        for line_number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = record.pop("text", None) or record.get("content") or ""
+            metadata = {key: value for key, value in record.items() if key not in {"id", *_RESERVED}}
+            yield SourceDocument(
+                source_id=f"{path.name}#{record.get('id', line_number)}",
+                fingerprint={"sha256": _fingerprint(text, metadata)},
+                load=lambda text=text, metadata=metadata: (text, metadata),
+            )
+
+
+def ingest_corpus(
+    source: str | os.PathLike[str],
+    index_dir: str | os.PathLike[str],
+    *,
+    max_words: int = 200,
+    overlap: int = 40,
+    workers: Optional[int] = None,
+) -> IngestStats:
+    """Build or incrementally update the index in `index_dir` from `source`."""
+    _require_numpy()
+    started = time.perf_counter()
+    index_path = Path(index_dir)
+    previous = _read_previous(index_path, max_words, overlap)
+    old_sources: Dict[str, Dict[str, Any]] = previous["manifest"].get("sources", {})
+    vocabulary: Dict[str, int] = previous["vocabulary"]
+    stats = IngestStats()
+
+    sources: Dict[str, Dict[str, Any]] = {}
+    items: List[Dict[str, Any]] = []
+    data: List[Any] = []
+    indices: List[Any] = []
+    lengths: List[Any] = []
+
+    def append_rows(row_items, row_data, row_indices, row_lengths) -> Dict[str, int]:
+        start = len(items)
+        items.extend(row_items)
+        data.append(row_data)
+        indices.append(row_indices)
+        lengths.append(row_lengths)
+        return {"start": start, "stop": len(items)}
+
+    counts = previous["counts"]
+
+    def reuse(source_id: str, fingerprint: Dict[str, Any]) -> None:
+        start, stop = old_sources[source_id]["rows"]["start"], old_sources[source_id]["rows"]["stop"]
+        lo, hi = counts.indptr[start], counts.indptr[stop]
+        rows = append_rows(
+            previous["items"][start:stop],
+            np.asarray(counts.data[lo:hi]),
+            np.asarray(counts.indices[lo:hi]),
+            np.diff(counts.indptr[start : stop + 1]),
+        )
+        sources[source_id] = {"fingerprint": fingerprint, "rows": rows}
+        stats.reused += 1
+
+    def changed_jobs() -> Iterator[Tuple[str, str, Dict[str, Any], int, int]]:
+        """Reuse unchanged sources in passing and yield the rest for tokenization."""
+        for document in iter_sources(source):
+            stats.sources += 1
+            old = old_sources.get(document.source_id)
+            old_fingerprint = old["fingerprint"] if old is not None else {}
+            if old is not None and all(old_fingerprint.get(k) == v for k, v in document.fingerprint.items()):
+                reuse(document.source_id, old_fingerprint)
+                continue
+            text, metadata = document.load()
+            fingerprint = {**document.fingerprint, "sha256": _fingerprint(text, metadata)}
+            if old is not None and old_fingerprint.get("sha256") == fingerprint["sha256"]:
+                reuse(document.source_id, fingerprint)
+                continue
+            sources[document.source_id] = {"fingerprint": fingerprint}
+            yield document.source_id, text, metadata, max_words, overlap
+
+    for source_id, metadata, chunks in _bounded_map(_analyze_source, changed_jobs(), workers):
+        row_items, row_data, row_indices, row_lengths = [], [], [], []
+        for position, (content, term_counts) in enumerate(chunks):
+            row_items.append({**metadata, "content": content, "source": source_id, "chunk": position})
+            row_lengths.append(len(term_counts))
+            for term, count in term_counts.items():
+                row_indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                row_data.append(count)
+        sources[source_id]["rows"] = append_rows(
+            row_items,
+            np.asarray(row_data, dtype=np.float32),
+            np.asarray(row_indices, dtype=np.int32),
+            np.asarray(row_lengths, dtype=np.int64),
+        )
+        stats.indexed += 1
+
+    stats.removed = len(set(old_sources) - set(sources))
+    stats.chunks = len(items)
+    row_lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+    arrays = {
+        "data": np.concatenate(data).astype(np.float32) if data else np.zeros(0, dtype=np.float32),
+        "indices": np.concatenate(indices).astype(np.int32) if indices else np.zeros(0, dtype=np.int32),
+        "indptr": np.concatenate([[0], np.cumsum(row_lengths)]).astype(np.int64),
+    }
+    manifest = {
+        "version": INDEX_VERSION,
+        "max_words": max_words,
+        "overlap": overlap,
+        "sources": sources,
+    }
+    _write_index(index_path, arrays, items, vocabulary, manifest)
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def load_index(index_dir: str | os.PathLike[str], **options: Any) -> SparseVectorMemory:
+    """Open an index written by `ingest_corpus`; the count arrays are memory-mapped."""
+    _require_numpy()
+    path = Path(index_dir)
+    return _load_generation(path, _read_manifest(path), **options)
+
+
+_open_indexes: Dict[Tuple[str, int, Tuple[Tuple[str, Any], ...]], SparseVectorMemory] = {}
+_open_lock = threading.Lock()
+
+
+def open_index(index_dir: str | os.PathLike[str], **options: Any) -> SparseVectorMemory:
+    """Process-wide `load_index`, reopened only when the index is rewritten."""
+    path = os.path.abspath(index_dir)
+    key = (path, os.stat(os.path.join(path, _MANIFEST)).st_mtime_ns, tuple(sorted(options.items())))
+    with _open_lock:
+        memory = _open_indexes.get(key)
+        if memory is None:
+            for stale in [k for k in _open_indexes if k[0] == path]:
+                del _open_indexes[stale]
+            memory = _open_indexes[key] = load_index(path, **options)
+        return memory
+
+
+def _analyze_source(
+    job: Tuple[str, str, Dict[str, Any], int, int]
+) -> Tuple[str, Dict[str, Any], List[Tuple[str, Dict[str, int]]]]:
+    source_id, text, metadata, max_words, overlap = job
+    chunks = chunk_text(text, max_words, overlap)
+    return source_id, metadata, [(chunk, dict(Counter(tokenize(chunk)))) for chunk in chunks]
+
+
+def _bounded_map(function: Callable[[Any], Any], jobs: Iterable[Any], workers: Optional[int]) -> Iterator[Any]:
+    """Ordered `map` over a process pool with a bounded number of pending jobs."""
+    if workers is not None and workers <= 1:
+        yield from map(function, jobs)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = workers * 4
+        pending: Deque[Future] = deque()
+        for job in jobs:
+            pending.append(executor.submit(function, job))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _read_manifest(index_path: Path) -> Dict[str, Any]:
+    manifest = json.loads((index_path / _MANIFEST).read_text(encoding="utf-8"))
+    if manifest.get("version") != INDEX_VERSION or "generation" not in manifest:
+        raise ValueError(
+            f"{index_path} holds index version {manifest.get('version')}, not {INDEX_VERSION}; "
+            "rebuild it with ingest_corpus."
+        )
+    return manifest
+
+
+def _load_generation(index_path: Path, manifest: Dict[str, Any], **options: Any) -> SparseVectorMemory:
+    """The generation `manifest` points to, checked against the manifest's row count."""
+    path = index_path / manifest["generation"]
+    vocabulary = json.loads((path / _VOCABULARY).read_text(encoding="utf-8"))
+    with (path / _CHUNKS).open(encoding="utf-8") as fh:
+        items = [json.loads(line) for line in fh]
+    data, indices, indptr = (np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS)
+    if not len(items) == len(indptr) - 1 == manifest["chunks"]:
+        raise ValueError(f"{path} does not match {index_path / _MANIFEST}; rebuild the index.")
+    counts = sparse.csr_matrix((data, indices, indptr), shape=(len(items), len(vocabulary)), copy=False)
+    return SparseVectorMemory.from_counts(items, vocabulary, counts, **options)
+
+
+def _read_previous(index_path: Path, max_words: int, overlap: int) -> Dict[str, Any]:
+    empty = {"manifest": {}, "vocabulary": {}, "items": [], "counts": None}
+    if not (index_path / _MANIFEST).exists():
+        return empty
+    manifest = json.loads((index_path / _MANIFEST).read_text(encoding="utf-8"))
+    if (manifest.get("version"), manifest.get("max_words"), manifest.get("overlap")) != (
+        INDEX_VERSION,
+        max_words,
+        overlap,
+    ):
+        return empty
+    previous = _load_generation(index_path, manifest)
+    return {
+        "manifest": manifest,
+        "vocabulary": dict(previous.vocabulary),
+        "items": previous.fetch(len(previous)) if len(previous) else [],
+        "counts": previous.counts(),
+    }
+
+
+def _write_index(
+    index_path: Path,
+    arrays: Dict[str, Any],
+    items: List[Dict[str, Any]],
+    vocabulary: Dict[str, int],
+    manifest: Dict[str, Any],
+) -> None:
+    """Write a new generation directory, then atomically point the manifest at it.
+
+    A crash before the manifest is replaced leaves the previous generation in
+    use. The generation the manifest pointed to before stays on disk until the
+    next run, so readers that just read the old manifest can still open it;
+    readers that already mapped older arrays keep their pages until they reopen.
+    """
+    index_path.mkdir(parents=True, exist_ok=True)
+    manifest_path = index_path / _MANIFEST
+    current = None
+    if manifest_path.exists():
+        current = json.loads(manifest_path.read_text(encoding="utf-8")).get("generation")
+    number = int(current.rsplit("-", 1)[1]) + 1 if current and current.startswith("gen-") else 1
+    generation = f"gen-{number:06d}"
+    directory = index_path / generation
+    shutil.rmtree(directory, ignore_errors=True)
+    directory.mkdir()
+    for name in _ARRAYS:
+        _save_array(directory / f"{name}.npy", arrays[name])
+    _write_jsonl(directory / _CHUNKS, items)
+    (directory / _VOCABULARY).write_text(json.dumps(vocabulary, ensure_ascii=False), encoding="utf-8")
+
+    temporary = index_path / f"{_MANIFEST}.tmp-{os.getpid()}"
+    manifest = {**manifest, "generation": generation, "chunks": len(items)}
+    temporary.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(temporary, manifest_path)
+    for stale in index_path.glob("gen-*"):
+        if stale.name not in {generation, current}:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def _write_jsonl(path: Path, items: List[Dict[str, Any]]) -> None:
+    with path.open("w", encoding="utf-8") as fh:
+        for item in items:
+            fh.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def _save_array(path: Path, array: Any) -> None:
+    with path.open("wb") as fh:
+        np.save(fh, array)
+
+
+def _fingerprint(text: str, metadata: Dict[str, Any]) -> str:
+    payload = json.dumps([text, metadata], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _require_numpy() -> None:
+    if np is None or sparse is None:
+        raise ImportError(
+            "Index ingestion requires numpy and scipy; "
+            "pip install 'ai-agent-design-pattern-collection[vector]'."
+        )
+
+
+def main(
+    source: str,
+    index_dir: str,
+    max_words: int = 200,
+    overlap: int = 40,
+    workers: Optional[int] = None,
+) -> None:
+    stats = ingest_corpus(source, index_dir, max_words=max_words, overlap=overlap, workers=workers)
+    print(
+        f"Indexed {stats.indexed} and reused {stats.reused} of {stats.sources} sources "
+        f"({stats.removed} removed) into {stats.chunks} chunks in {stats.elapsed:.2f}s."
+    )
+
+
+if __name__ == "__main__":
+    import typer
+
+    typer.run(main)
@@ -0,0 +1,476 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .base import MemoryStore
+from .text import query_terms, tokenize
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+_MANIFEST = "MANIFEST.json"
+_TERMS = "terms.log"
+# Row-major files written by every segment; `indptr` holds row end offsets and is
+# appended last, so its length is the number of committed rows.
+_ROW_FILES = (("items", None), ("offsets", "q"), ("indices", "i"), ("data", "f"), ("norms", "d"), ("indptr", "q"))
+# Term-major (inverted) copy written for the compacted base segment only.
+_TERM_FILES = (("colptr", "q"), ("rows", "q"), ("vals", "f"))
+_COPY_CHUNK = 1 << 20
+
+
+class _Segment:
+    """Read side of one segment: memory-mapped arrays plus positional item reads."""
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.name = name
+        self.prefix = os.path.join(directory, name)
+        self.arrays: Dict[str, Any] = {
+            key: _map(f"{self.prefix}.{key}", code) for key, code in _ROW_FILES if code is not None
+        }
+        self.term_major: Optional[Dict[str, Any]] = None
+        if os.path.exists(f"{self.prefix}.colptr"):
+            self.term_major = {key: _map(f"{self.prefix}.{key}", code) for key, code in _TERM_FILES}
+        self._fd = os.open(f"{self.prefix}.items", os.O_RDONLY)
+
+    @property
+    def rows(self) -> int:
+        return len(self.arrays["indptr"])
+
+    def view(self, key: str) -> Any:
+        return self.arrays[key][: self.rows] if key in ("offsets", "norms") else self.arrays[key]
+
+    def item(self, row: int) -> Dict[str, Any]:
+        offsets = self.view("offsets")
+        start = int(offsets[row - 1]) if row else 0
+        return json.loads(os.pread(self._fd, int(offsets[row]) - start, start))
+
+    def dots(self, term_ids: Any, weights: Any) -> Tuple[Any, Any]:
+        """Rows sharing a query term and their dot products with the query."""
+        if self.term_major is not None:
+            return self._term_major_dots(term_ids, weights)
+        ends = self.view("indptr")
+        nnz = int(ends[-1]) if len(ends) else 0
+        indices = self.view("indices")[:nnz]
+        positions = np.flatnonzero(np.isin(indices, term_ids))
+        rows = np.searchsorted(ends, positions, side="right")
+        contributions = self.view("data")[positions] * weights[np.searchsorted(term_ids, indices[positions])]
+        return _sum_by_row(rows, contributions)
+
+    def _term_major_dots(self, term_ids: Any, weights: Any) -> Tuple[Any, Any]:
+        colptr, rows, vals = (self.term_major[key] for key in ("colptr", "rows", "vals"))
+        row_parts, value_parts = [], []
+        for term, weight in zip(term_ids.tolist(), weights.tolist(), strict=True):
+            if term + 1 < len(colptr):
+                start, end = int(colptr[term]), int(colptr[term + 1])
+                row_parts.append(rows[start:end])
+                value_parts.append(np.multiply(vals[start:end], weight, dtype=np.float64))
+        if not row_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return _sum_by_row(np.concatenate(row_parts), np.concatenate(value_parts))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _ActiveSegment(_Segment):
+    """Writable tail segment: appends go to disk and to in-memory arrays."""
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.name = name
+        self.prefix = os.path.join(directory, name)
+        self.term_major = None
+        for key, _code in _ROW_FILES:
+            open(f"{self.prefix}.{key}", "ab").close()
+        self._truncate_uncommitted()
+        self.arrays = {}
+        for key, code in _ROW_FILES:
+            if code is not None:
+                values = array(code)
+                with open(f"{self.prefix}.{key}", "rb") as fh:
+                    values.frombytes(fh.read())
+                self.arrays[key] = values
+        self._files = {key: open(f"{self.prefix}.{key}", "ab") for key, _code in _ROW_FILES}
+        self._fd = os.open(f"{self.prefix}.items", os.O_RDONLY)
+
+    def view(self, key: str) -> Any:
+        # Zero-copy; callers must drop the view before the next `append` resizes the array.
+        values = self.arrays[key]
+        return np.frombuffer(values, dtype=values.typecode) if values else np.zeros(0, dtype=values.typecode)
+
+    def append(self, payload: bytes, term_ids: List[int], counts: List[int], norm: float) -> None:
+        offsets, ends = self.arrays["offsets"], self.arrays["indptr"]
+        rows = (
+            ("items", None, payload),
+            ("offsets", offsets, (offsets[-1] if offsets else 0) + len(payload)),
+            ("indices", self.arrays["indices"], term_ids),
+            ("data", self.arrays["data"], counts),
+            ("norms", self.arrays["norms"], norm),
+            ("indptr", ends, (ends[-1] if ends else 0) + len(term_ids)),
+        )
+        for key, values, value in rows:
+            if values is None:
+                self._files[key].write(value)
+            else:
+                chunk = array(values.typecode, value if isinstance(value, list) else [value])
+                self._files[key].write(chunk.tobytes())
+                values.extend(chunk)
+            self._files[key].flush()
+
+    def sync(self) -> None:
+        for fh in self._files.values():
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def close(self) -> None:
+        for fh in self._files.values():
+            fh.close()
+        super().close()
+
+    def _truncate_uncommitted(self) -> None:
+        """Drop bytes written after the last committed `indptr` entry (torn appends)."""
+        ends = _read(f"{self.prefix}.indptr", "q")
+        rows = len(ends)
+        offsets = _read(f"{self.prefix}.offsets", "q")[:rows]
+        lengths = {
+            "indptr": rows,
+            "offsets": rows,
+            "norms": rows,
+            "indices": ends[-1] if rows else 0,
+            "data": ends[-1] if rows else 0,
+        }
+        for key, code in _ROW_FILES:
+            size = (offsets[-1] if rows else 0) if code is None else lengths[key] * array(code).itemsize
+            with open(f"{self.prefix}.{key}", "r+b") as fh:
+                fh.truncate(size)
+
+
+class PersistentVectorMemory(MemoryStore):
+    """Disk-backed keyword memory built from append-only segments (requires numpy).
+
+    Items go to an append-only log next to their term ids, counts and norms; sealed
+    segments are memory-mapped, so reopening a large memory costs little more than
+    reading the manifest and vocabulary, and read-only worker processes share pages
+    through the OS page cache. Once `max_segments` full segments accumulate they are
+    compacted into one base segment that also stores an inverted (term-major) copy.
+    Scores match `KeywordVectorMemory`. One writer process per directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        readonly: bool = False,
+        segment_rows: int = 65536,
+        max_segments: int = 8,
+    ) -> None:
+        if np is None:
+            raise ImportError(
+                "PersistentVectorMemory requires numpy; "
+                "pip install 'ai-agent-design-pattern-collection[vector]'."
+            )
+        self.directory = directory
+        self.readonly = readonly
+        self.segment_rows = segment_rows
+        self.max_segments = max_segments
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._terms: Dict[str, int] = {}
+        self._terms_file = None
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+            if not os.path.exists(self._path(_MANIFEST)):
+                self._write_manifest({"base": None, "segments": [], "next_id": 1})
+        self.refresh()
+
+    def __len__(self) -> int:
+        return sum(segment.rows for segment in self._segments)
+
+    def refresh(self) -> None:
+        """Reattach to the segments currently listed in the manifest."""
+        with self._lock:
+            self._close_segments()
+            manifest = self._read_manifest()
+            names = ([manifest["base"]] if manifest["base"] else []) + manifest["segments"]
+            segments: List[_Segment] = [_Segment(self.directory, name) for name in names]
+            if not self.readonly and segments and segments[-1].term_major is None:
+                if segments[-1].rows < self.segment_rows:
+                    segments[-1].close()
+                    segments[-1] = _ActiveSegment(self.directory, segments[-1].name)
+            self._segments = segments
+            self._load_terms()
+
+    def add(self, item: Dict[str, Any]) -> None:
+        if self.readonly:
+            raise PermissionError("PersistentVectorMemory was opened read-only.")
+        vector = Counter(tokenize(item.get("content", "")))
+        payload = json.dumps(item, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            term_ids = [self._term_id(term) for term in vector]
+            self._terms_file.flush()
+            norm = math.sqrt(sum(v * v for v in vector.values()))
+            self._active().append(payload, term_ids, list(vector.values()), norm)
+
+    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = list(self._rows_from_end(limit))
+            return [segment.item(row) for segment, row in reversed(rows)]
+
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        """Top `limit` items by cosine similarity; ties keep insertion order.
+
+        Each segment contributes only its own top `limit` (plus ties), so a query
+        materializes O(segments * limit) candidates however many rows match.
+        """
+        if limit <= 0:
+            return []
+        query_vec = query_terms(text)
+        query_norm = math.sqrt(sum(v * v for _t, v in query_vec))
+        with self._lock:
+            known = sorted((self._terms[t], c) for t, c in query_vec if t in self._terms)
+            term_ids = np.array([term for term, _ in known], dtype=np.int64)
+            weights = np.array([count for _, count in known], dtype=np.float64)
+            positions, scores, owners = [], [], []
+            offset = 0
+            for number, segment in enumerate(self._segments):
+                if known and query_norm:
+                    rows, dots = segment.dots(term_ids, weights)
+                    rows, segment_scores = _best(rows, dots / (segment.view("norms")[rows] * query_norm), limit)
+                    positions.append(rows + offset)
+                    scores.append(segment_scores)
+                    owners.append(np.full(len(rows), number, dtype=np.int64))
+                offset += segment.rows
+            results: List[Tuple[Dict[str, Any], float]] = []
+            matched: set = set()
+            if positions:
+                position, score, owner = (np.concatenate(parts) for parts in (positions, scores, owners))
+                # Every segment kept all its matches whenever fewer than `limit` rows matched overall,
+                # so `matched` is complete exactly when padding needs it.
+                matched = set(position.tolist())
+                starts = np.cumsum([0] + [segment.rows for segment in self._segments])
+                for pos in np.lexsort((position, -score))[:limit].tolist():
+                    segment = self._segments[int(owner[pos])]
+                    row = int(position[pos] - starts[int(owner[pos])])
+                    results.append((segment.item(row), float(score[pos])))
+            for segment, row in self._unmatched_rows(matched, limit - len(results)):
+                results.append((segment.item(row), 0.0))
+            return results
+
+    def compact(self) -> None:
+        """Fold every segment into a single base segment with an inverted copy."""
+        if self.readonly:
+            raise PermissionError("PersistentVectorMemory was opened read-only.")
+        with self._lock:
+            manifest = self._read_manifest()
+            name = f"base-{manifest['next_id']:06d}"
+            self._write_compacted(name)
+            old = [segment.name for segment in self._segments]
+            self._write_manifest({"base": name, "segments": [], "next_id": manifest["next_id"] + 1})
+            self.refresh()
+            for segment_name in old:
+                for key, _code in _ROW_FILES + _TERM_FILES:
+                    path = os.path.join(self.directory, f"{segment_name}.{key}")
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def sync(self) -> None:
+        """Flush appended data to stable storage."""
+        with self._lock:
+            for segment in self._segments:
+                if isinstance(segment, _ActiveSegment):
+                    segment.sync()
+            if self._terms_file is not None:
+                self._terms_file.flush()
+                os.fsync(self._terms_file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_segments()
+            if self._terms_file is not None:
+                self._terms_file.close()
+                self._terms_file = None
+
+    def _active(self) -> _ActiveSegment:
+        segment = self._segments[-1] if self._segments else None
+        if isinstance(segment, _ActiveSegment):
+            if segment.rows < self.segment_rows:
+                return segment
+            segment.close()
+            self._segments[-1] = _Segment(self.directory, segment.name)
+        if sum(1 for s in self._segments if s.term_major is None) >= self.max_segments:
+            self.compact()
+        manifest = self._read_manifest()
+        name = f"seg-{manifest['next_id']:06d}"
+        active = _ActiveSegment(self.directory, name)
+        manifest["segments"].append(name)
+        manifest["next_id"] += 1
+        self._write_manifest(manifest)
+        self._segments.append(active)
+        return active
+
+    def _write_compacted(self, name: str) -> None:
+        """Stream every segment into `name`, holding one segment's arrays at a time."""
+        prefix = os.path.join(self.directory, name)
+        row_files = {key: open(f"{prefix}.{key}.tmp", "wb") for key, _code in _ROW_FILES}
+        item_bytes = nnz = 0
+        try:
+            for segment in self._segments:
+                rows = segment.rows
+                ends = np.asarray(segment.view("indptr"))
+                offsets = np.asarray(segment.view("offsets"))
+                segment_nnz = int(ends[-1]) if rows else 0
+                _write_array(row_files["offsets"], offsets + item_bytes, "q")
+                _write_array(row_files["indptr"], ends + nnz, "q")
+                _write_array(row_files["indices"], segment.view("indices")[:segment_nnz], "i")
+                _write_array(row_files["data"], segment.view("data")[:segment_nnz], "f")
+                _write_array(row_files["norms"], segment.view("norms"), "d")
+                length = int(offsets[-1]) if rows else 0
+                for start in range(0, length, _COPY_CHUNK):
+                    row_files["items"].write(os.pread(segment._fd, min(_COPY_CHUNK, length - start), start))
+                item_bytes += length
+                nnz += segment_nnz
+        finally:
+            for fh in row_files.values():
+                fh.close()
+        self._write_term_major(prefix, nnz)
+        for key, _code in _ROW_FILES + _TERM_FILES:
+            os.replace(f"{prefix}.{key}.tmp", f"{prefix}.{key}")
+
+    def _write_term_major(self, prefix: str, nnz: int) -> None:
+        """Inverted copy built by scattering each segment's postings into place."""
+        vocabulary = len(self._terms)
+        totals = np.zeros(vocabulary, dtype=np.int64)
+        for segment in self._segments:
+            ends = segment.view("indptr")
+            segment_nnz = int(ends[-1]) if len(ends) else 0
+            totals += np.bincount(segment.view("indices")[:segment_nnz], minlength=vocabulary)
+        colptr = np.concatenate([[0], np.cumsum(totals)]).astype(np.int64)
+        with open(f"{prefix}.colptr.tmp", "wb") as fh:
+            _write_array(fh, colptr, "q")
+        for key, code in (("rows", "q"), ("vals", "f")):
+            with open(f"{prefix}.{key}.tmp", "wb") as fh:
+                fh.truncate(nnz * np.dtype(code).itemsize)
+        if not nnz:
+            return
+        out_rows = np.memmap(f"{prefix}.rows.tmp", dtype=np.int64, mode="r+", shape=(nnz,))
+        out_vals = np.memmap(f"{prefix}.vals.tmp", dtype=np.float32, mode="r+", shape=(nnz,))
+        cursor = colptr[:-1].copy()
+        row_offset = 0
+        for segment in self._segments:
+            ends = np.asarray(segment.view("indptr"))
+            segment_nnz = int(ends[-1]) if len(ends) else 0
+            terms = np.asarray(segment.view("indices")[:segment_nnz], dtype=np.int64)
+            order = np.argsort(terms, kind="stable")
+            sorted_terms = terms[order]
+            counts = np.bincount(sorted_terms, minlength=vocabulary)
+            rank = np.arange(segment_nnz) - (np.cumsum(counts) - counts)[sorted_terms]
+            destination = cursor[sorted_terms] + rank
+            row_of = np.repeat(np.arange(len(ends)) + row_offset, np.diff(ends, prepend=0))
+            out_rows[destination] = row_of[order]
+            out_vals[destination] = np.asarray(segment.view("data")[:segment_nnz])[order]
+            cursor += counts
+            row_offset += len(ends)
+        out_rows.flush()
+        out_vals.flush()
+        del out_rows, out_vals
+
+    def _rows_from_end(self, limit: int) -> Iterator[Tuple[_Segment, int]]:
+        for segment in reversed(self._segments):
+            for row in range(segment.rows - 1, -1, -1):
+                if limit <= 0:
+                    return
+                limit -= 1
+                yield segment, row
+
+    def _unmatched_rows(self, matched: set, needed: int) -> Iterator[Tuple[_Segment, int]]:
+        offset = 0
+        for segment in self._segments:
+            for row in range(segment.rows):
+                if needed <= 0:
+                    return
+                if offset + row not in matched:
+                    needed -= 1
+                    yield segment, row
+            offset += segment.rows
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._terms.get(term)
+        if term_id is None:
+            term_id = self._terms[term] = len(self._terms)
+            self._terms_file.write(term.encode("utf-8") + b"\n")
+        return term_id
+
+    def _load_terms(self) -> None:
+        path = self._path(_TERMS)
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                lines = fh.read().split(b"\n")
+            # A torn final line (no newline) was never referenced by a committed row.
+            terms = [line.decode("utf-8") for line in lines[:-1]]
+            if not self.readonly and lines[-1]:
+                with open(path, "r+b") as fh:
+                    fh.truncate(sum(len(line) + 1 for line in lines[:-1]))
+        else:
+            terms = []
+        self._terms = {term: index for index, term in enumerate(terms)}
+        if not self.readonly and self._terms_file is None:
+            self._terms_file = open(path, "ab")
+
+    def _close_segments(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self._segments = []
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        with open(self._path(_MANIFEST), encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        temporary = self._path(_MANIFEST + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh)
+        os.replace(temporary, self._path(_MANIFEST))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+
+def _map(path: str, code: str) -> Any:
+    dtype = np.dtype(code)
+    size = os.path.getsize(path) // dtype.itemsize
+    if size == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size,))
+
+
+def _read(path: str, code: str) -> array:
+    values = array(code)
+    with open(path, "rb") as fh:
+        data = fh.read()
+    values.frombytes(data[: len(data) - len(data) % values.itemsize])
+    return values
+
+
+def _write_array(fh: Any, values: Any, code: str) -> None:
+    fh.write(np.asarray(values, dtype=np.dtype(code)).tobytes())
+
+
+def _best(rows: Any, scores: Any, keep: int) -> Tuple[Any, Any]:
+    """The `keep` highest-scoring rows plus any ties with the last, via argpartition."""
+    if len(scores) > keep:
+        threshold = scores[np.argpartition(scores, -keep)[-keep]]
+        chosen = scores >= threshold
+        rows, scores = rows[chosen], scores[chosen]
+    return rows, scores
+
+
+def _sum_by_row(rows: Any, values: Any) -> Tuple[Any, Any]:
+    unique, inverse = np.unique(rows, return_inverse=True)
+    return unique, np.bincount(inverse, weights=values, minlength=len(unique))
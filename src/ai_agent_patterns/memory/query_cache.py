@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .base import SearchableMemoryStore
+from .text import query_terms
+
+
+@dataclass
+class QueryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    generation: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedMemoryStore:
+    """Bounded LRU of `query` results in front of a `SearchableMemoryStore`.
+
+    Results are keyed on the query's token counts and `limit`, so "Billing?" and
+    "billing" share an entry. Each entry records the store generation it was
+    computed at; every write made through this wrapper bumps the generation, as
+    does the passing of a TTL given to `add`/`upsert`, so a hit is never older
+    than the last write. Writes made to `inner` directly bypass invalidation.
+    """
+
+    def __init__(self, inner: SearchableMemoryStore, max_entries: int = 1024) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.inner = inner
+        self.max_entries = max_entries
+        self.stats = QueryCacheStats()
+        self._results: "OrderedDict[Hashable, Tuple[int, List[Tuple[Dict[str, Any], float]]]]" = OrderedDict()
+        self._deadlines: List[float] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.inner)  # type: ignore[arg-type]
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    @property
+    def generation(self) -> int:
+        return self.stats.generation
+
+    def add(self, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self.extend([item], ttl_seconds=ttl_seconds)
+
+    def extend(self, items: Iterable[Dict[str, Any]], *, ttl_seconds: Optional[float] = None) -> None:
+        options = {} if ttl_seconds is None else {"ttl_seconds": ttl_seconds}
+        extend = getattr(self.inner, "extend", None)
+        if extend is not None:
+            extend(items, **options)
+        else:
+            for item in items:
+                self.inner.add(item, **options)
+        self._invalidate(ttl_seconds)
+
+    def upsert(self, key: str, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self.inner.upsert(key, item, ttl_seconds=ttl_seconds)  # type: ignore[attr-defined]
+        self._invalidate(ttl_seconds)
+
+    def delete(self, key: str) -> bool:
+        deleted = self.inner.delete(key)  # type: ignore[attr-defined]
+        if deleted:
+            self._invalidate()
+        return deleted
+
+    def purge_expired(self) -> int:
+        purged = self.inner.purge_expired()  # type: ignore[attr-defined]
+        if purged:
+            self._invalidate()
+        return purged
+
+    def compact(self) -> None:
+        self.inner.compact()  # type: ignore[attr-defined]
+        self._invalidate()
+
+    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return self.inner.fetch(limit)
+
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        key = (tuple(sorted(query_terms(text))), limit)
+        with self._lock:
+            if self._deadlines and self._deadlines[0] <= time.monotonic():
+                self._expire()
+            generation = self.stats.generation
+            entry = self._results.get(key)
+            if entry is not None:
+                if entry[0] == generation:
+                    self._results.move_to_end(key)
+                    self.stats.hits += 1
+                    return list(entry[1])
+                self.stats.stale += 1
+            self.stats.misses += 1
+        results = self.inner.query(text, limit=limit)
+        with self._lock:
+            # If a write landed while `inner` was scoring, the generation has moved on
+            # and this entry is stale from the start.
+            self._results[key] = (generation, results)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+                self.stats.evictions += 1
+        return list(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def _invalidate(self, ttl_seconds: Optional[float] = None) -> None:
+        # Publish queued writes first, or a query could cache a result that misses them.
+        flush = getattr(self.inner, "flush", None)
+        if flush is not None:
+            flush()
+        with self._lock:
+            self.stats.generation += 1
+            if ttl_seconds is not None:
+                heapq.heappush(self._deadlines, time.monotonic() + ttl_seconds)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._deadlines and self._deadlines[0] <= now:
+            heapq.heappop(self._deadlines)
+        self.stats.generation += 1
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import EmbeddingConfig, MemoryConfig, SessionConfig
+from ..llm.base import estimate_tokens
+from ..llm.cache import SQLiteResponseStore
+from .base import SearchableMemoryStore
+from .concurrent import ConcurrentConversationBuffer, ConcurrentKeywordVectorMemory
+
+
+def _publish(store: SearchableMemoryStore) -> None:
+    """Make the session's own writes visible to its next query (batching stores queue them)."""
+    flush = getattr(store, "flush", None)
+    if flush is not None:
+        flush()
+
+
+@dataclass
+class SessionStats:
+    active: int = 0
+    tokens: int = 0
+    created: int = 0
+    hits: int = 0
+    rehydrated: int = 0
+    evicted: int = 0
+    expired: int = 0
+    spilled: int = 0
+
+
+@dataclass
+class Session:
+    """Conversation and long-term memory belonging to one `session_id`."""
+
+    session_id: str
+    conversation: ConcurrentConversationBuffer = field(default_factory=ConcurrentConversationBuffer)
+    vectors: SearchableMemoryStore = field(default_factory=ConcurrentKeywordVectorMemory)
+    last_access: float = 0.0
+    _vector_tokens: int = field(default=0, repr=False)
+    _store: Optional["SessionStore"] = field(default=None, repr=False)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated footprint: live conversation turns plus every long-term item."""
+        return self.conversation.tokens + self._vector_tokens
+
+    def remember(self, entry: Dict[str, Any], *, long_term: bool = True) -> None:
+        """Add `entry` to the conversation and, if `long_term`, to the vector memory."""
+        before = self.tokens
+        self.conversation.add(entry)
+        if long_term:
+            self.vectors.add(entry)
+            _publish(self.vectors)
+            self._vector_tokens += estimate_tokens(str(entry.get("content", "")))
+        if self._store is not None:
+            self._store._grew(self, self.tokens - before)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "conversation": self.conversation.fetch(limit=self.conversation.capacity),
+                "vectors": self._long_term(),
+            },
+            ensure_ascii=False,
+        )
+
+    def _long_term(self) -> List[Dict[str, Any]]:
+        count = len(self.vectors)  # type: ignore[arg-type]
+        return list(self.vectors.fetch(limit=count)) if count else []
+
+    @classmethod
+    def from_json(
+        cls,
+        session_id: str,
+        payload: str,
+        capacity: int,
+        vectors: Callable[[], SearchableMemoryStore] = ConcurrentKeywordVectorMemory,
+    ) -> "Session":
+        data = json.loads(payload)
+        session = cls(
+            session_id=session_id,
+            conversation=ConcurrentConversationBuffer(capacity=capacity),
+            vectors=vectors(),
+        )
+        for entry in data["conversation"]:
+            session.conversation.add(entry)
+        for item in data["vectors"]:
+            session.vectors.add(item)
+        _publish(session.vectors)
+        session._vector_tokens = sum(estimate_tokens(str(item.get("content", ""))) for item in data["vectors"])
+        return session
+
+
+_PURGE_EVERY = 256
+
+
+class SessionStore:
+    """LRU of live sessions with idle expiry and a global token cap.
+
+    Sessions beyond `max_sessions`, idle longer than `idle_ttl_seconds`, or pushed
+    out by `max_total_tokens` are evicted least recently used first. With
+    `spill_path` they are written to SQLite and rehydrated on their next `get`;
+    otherwise they are dropped. A session evicted while a caller still holds it
+    is handed back as the same object, so there is never a second copy of it.
+    Spilled rows expire after `spill_ttl_seconds` and are purged periodically.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        idle_ttl_seconds: Optional[float] = None,
+        max_total_tokens: Optional[int] = None,
+        spill_path: Optional[str] = None,
+        conversation_capacity: int = 20,
+        vectors: Callable[[], SearchableMemoryStore] = ConcurrentKeywordVectorMemory,
+        spill_ttl_seconds: Optional[float] = None,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_total_tokens = max_total_tokens
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.conversation_capacity = conversation_capacity
+        self.vectors = vectors
+        self.spill = SQLiteResponseStore(spill_path) if spill_path else None
+        self.stats = SessionStats()
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        # Every session handed out and still referenced, evicted or not.
+        self._handles: "weakref.WeakValueDictionary[str, Session]" = weakref.WeakValueDictionary()
+        self._writes_since_purge = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(
+        cls, config: SessionConfig, vectors: Callable[[], SearchableMemoryStore] = ConcurrentKeywordVectorMemory
+    ) -> "SessionStore":
+        return cls(
+            max_sessions=config.max_sessions,
+            idle_ttl_seconds=config.idle_ttl_seconds,
+            max_total_tokens=config.max_total_tokens,
+            spill_path=config.spill_path,
+            conversation_capacity=config.conversation_capacity,
+            vectors=vectors,
+            spill_ttl_seconds=config.spill_ttl_seconds,
+        )
+
+    def get(self, session_id: str) -> Session:
+        """Return the live session, rehydrating or creating it as needed."""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                self.stats.hits += 1
+            else:
+                session = self._handles.get(session_id)
+                if session is not None:
+                    self.stats.rehydrated += 1
+                else:
+                    session = self._load(session_id)
+                    session._store = self
+                    self._handles[session_id] = session
+                self._sessions[session_id] = session
+                self.stats.tokens += session.tokens
+            session.last_access = now
+            self._enforce(now, keep=session_id)
+            return session
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def evict(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._release(session)
+
+    def close(self) -> None:
+        """Spill every live session and close the spill store."""
+        with self._lock:
+            while self._sessions:
+                _session_id, session = self._sessions.popitem(last=False)
+                self._release(session)
+            if self.spill is not None:
+                self.spill.close()
+
+    def _load(self, session_id: str) -> Session:
+        stored = self.spill.get(session_id, time.time()) if self.spill is not None else None
+        if stored is None:
+            self.stats.created += 1
+            return Session(
+                session_id,
+                conversation=ConcurrentConversationBuffer(capacity=self.conversation_capacity),
+                vectors=self.vectors(),
+            )
+        self.stats.rehydrated += 1
+        return Session.from_json(session_id, stored[0], self.conversation_capacity, self.vectors)
+
+    def _grew(self, session: Session, tokens: int) -> None:
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                self.stats.tokens += tokens
+                self._enforce(time.monotonic(), keep=session.session_id)
+            elif self.spill is not None:
+                # Evicted while a run still held it: keep the spilled copy current.
+                self._write_spill(session)
+
+    def _enforce(self, now: float, keep: str) -> None:
+        if self.idle_ttl_seconds is not None:
+            # Access order is LRU order, so idle sessions are all at the front.
+            while len(self._sessions) > 1:
+                session_id, session = next(iter(self._sessions.items()))
+                if session_id == keep or now - session.last_access < self.idle_ttl_seconds:
+                    break
+                del self._sessions[session_id]
+                self._release(session)
+                self.stats.expired += 1
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions
+            or (self.max_total_tokens is not None and self.stats.tokens > self.max_total_tokens)
+        ):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                self._sessions.move_to_end(session_id)
+                session_id = next(iter(self._sessions))
+            self._release(self._sessions.pop(session_id))
+            self.stats.evicted += 1
+        self.stats.active = len(self._sessions)
+
+    def _release(self, session: Session) -> None:
+        self.stats.tokens -= session.tokens
+        if self.spill is not None:
+            self._write_spill(session)
+            self.stats.spilled += 1
+        self.stats.active = len(self._sessions)
+
+    def _write_spill(self, session: Session) -> None:
+        assert self.spill is not None
+        now = time.time()
+        expires_at = now + self.spill_ttl_seconds if self.spill_ttl_seconds is not None else None
+        self.spill.set(session.session_id, session.to_json(), expires_at)
+        self._writes_since_purge += 1
+        if expires_at is not None and self._writes_since_purge >= _PURGE_EVERY:
+            self._writes_since_purge = 0
+            self.spill.purge_expired(now)
+
+
+_shared_stores: Dict[Tuple[SessionConfig, MemoryConfig, EmbeddingConfig], SessionStore] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_session_store(
+    config: SessionConfig,
+    memory: Optional[MemoryConfig] = None,
+    embedding: Optional[EmbeddingConfig] = None,
+) -> SessionStore:
+    """Process-wide store per config triple, shared by every agent built with it.
+
+    Each session's long-term memory is an empty `memory.backend` store.
+    """
+    from ..factory import memory_backend
+
+    memory = memory or MemoryConfig()
+    embedding = embedding or EmbeddingConfig()
+    key = (config, memory, embedding)
+    with _shared_lock:
+        store = _shared_stores.get(key)
+        if store is None:
+            store = _shared_stores[key] = SessionStore.from_config(config, lambda: memory_backend(memory, embedding))
+        return store
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from .base import MemoryStore
+from .text import query_terms, tokenize
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+    sparse = None  # type: ignore[assignment]
+
+WEIGHTINGS = ("cosine", "bm25")
+
+
+@dataclass
+class SparseVectorMemory(MemoryStore):
+    """Corpus kept as a CSR term-document matrix (requires numpy and scipy).
+
+    `weighting="cosine"` scores like `KeywordVectorMemory`; `"bm25"` applies Okapi
+    BM25 with `k1` and `b`. Items are appended to a raw term-frequency buffer and the
+    weighted matrix is rebuilt lazily on the next query, so bulk ingestion followed
+    by querying pays the build once. `query_batch` scores many queries with a single
+    sparse product. `from_counts` starts from an existing (e.g. memory-mapped) count
+    matrix, which is what `memory.ingest.open_index` uses.
+    """
+
+    weighting: str = "cosine"
+    k1: float = 1.5
+    b: float = 0.75
+    _items: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False)
+    _vocabulary: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _indptr: array = field(default_factory=lambda: array("q", [0]), init=False, repr=False)
+    _indices: array = field(default_factory=lambda: array("i"), init=False, repr=False)
+    _counts: array = field(default_factory=lambda: array("f"), init=False, repr=False)
+    _base: Any = field(default=None, init=False, repr=False)
+    _matrix: Any = field(default=None, init=False, repr=False)
+    _term_major: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if np is None or sparse is None:
+            raise ImportError(
+                "SparseVectorMemory requires numpy and scipy; "
+                "pip install 'ai-agent-design-pattern-collection[vector]'."
+            )
+        if self.weighting not in WEIGHTINGS:
+            raise ValueError(f"Unsupported weighting: {self.weighting}")
+
+    @classmethod
+    def from_counts(
+        cls,
+        items: List[Dict[str, Any]],
+        vocabulary: Dict[str, int],
+        counts: Any,
+        **options: Any,
+    ) -> "SparseVectorMemory":
+        """Wrap a CSR term-frequency matrix whose rows line up with `items`."""
+        if counts.shape[0] != len(items):
+            raise ValueError("counts must have one row per item.")
+        memory = cls(**options)
+        memory._items = list(items)
+        memory._vocabulary = dict(vocabulary)
+        memory._base = counts
+        return memory
+
+    @property
+    def vocabulary(self) -> Dict[str, int]:
+        return self._vocabulary
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        counts = Counter(tokenize(item.get("content", "")))
+        for term, count in counts.items():
+            self._indices.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+            self._counts.append(count)
+        self._indptr.append(len(self._indices))
+        self._items.append(item)
+        self._matrix = self._term_major = None
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        for item in items:
+            self.add(item)
+
+    def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
+        return self._items[-limit:]
+
+    def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
+        return self.query_batch([text], limit=limit)[0]
+
+    def query_batch(
+        self, texts: Sequence[str], limit: int = 3
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Top `limit` items per query; ties keep insertion order."""
+        if limit <= 0 or not self._items:
+            return [[] for _ in texts]
+        if self._term_major is None:
+            # Term-major copy so each product only touches the rows of the query terms.
+            self._term_major = self.matrix().T.tocsr()
+        scores = (self._query_matrix(texts) @ self._term_major).tocsr()
+        return [
+            self._top_k(scores.indices[start:end], scores.data[start:end], limit)
+            for start, end in zip(scores.indptr[:-1], scores.indptr[1:], strict=True)
+        ]
+
+    def matrix(self) -> Any:
+        """Weighted document matrix, rebuilt after additions."""
+        if self._matrix is None:
+            counts = self.counts()
+            self._matrix = self._cosine(counts) if self.weighting == "cosine" else self._bm25(counts)
+        return self._matrix
+
+    def counts(self) -> Any:
+        """Raw term-frequency matrix: the `from_counts` base followed by added rows."""
+        columns = len(self._vocabulary)
+        base_rows = 0 if self._base is None else self._base.shape[0]
+        # Copies: a live numpy view would stop the arrays from growing on `add`.
+        added = sparse.csr_matrix(
+            (
+                np.array(self._counts, dtype=np.float32),
+                np.array(self._indices, dtype=np.int32),
+                np.array(self._indptr, dtype=np.int64),
+            ),
+            shape=(len(self._items) - base_rows, columns),
+        )
+        if self._base is None:
+            return added
+        base = self._base
+        if base.shape[1] != columns:
+            base = sparse.csr_matrix((base.data, base.indices, base.indptr), shape=(base_rows, columns))
+        return sparse.vstack([base, added], format="csr") if added.shape[0] else base
+
+    def _cosine(self, counts: Any) -> Any:
+        norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return sparse.diags(inverse.astype(np.float32)) @ counts
+
+    def _bm25(self, counts: Any) -> Any:
+        documents = counts.shape[0]
+        frequencies = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log1p((documents - frequencies + 0.5) / (frequencies + 0.5))
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        average = lengths.mean() or 1.0
+        rows = np.repeat(np.arange(documents), np.diff(counts.indptr))
+        tf = counts.data
+        saturation = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * lengths[rows] / average))
+        weights = (idf[counts.indices] * saturation).astype(np.float32)
+        return sparse.csr_matrix((weights, counts.indices, counts.indptr), shape=counts.shape)
+
+    def _query_matrix(self, texts: Sequence[str]) -> Any:
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+        for row, text in enumerate(texts):
+            counts = query_terms(text)
+            # Unknown terms still count towards the cosine norm, as in KeywordVectorMemory.
+            norm = math.sqrt(sum(v * v for _term, v in counts)) if self.weighting == "cosine" else 1.0
+            for term, count in counts:
+                column = self._vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    values.append(count / norm)
+        return sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, columns)),
+            shape=(len(texts), len(self._vocabulary)),
+        )
+
+    def _top_k(self, indices: Any, scores: Any, limit: int) -> List[Tuple[Dict[str, Any], float]]:
+        positive = scores > 0
+        indices, scores = indices[positive], scores[positive]
+        if len(scores) > limit:
+            threshold = scores[np.argpartition(scores, -limit)[-limit]]
+            keep = scores >= threshold
+            indices, scores = indices[keep], scores[keep]
+        order = np.lexsort((indices, -scores))[:limit]
+        results = [(self._items[index], float(scores[pos])) for pos, index in zip(order, indices[order], strict=True)]
+        if len(results) < limit:
+            matched = set(indices.tolist())
+            for index, item in enumerate(self._items):
+                if index not in matched:
+                    results.append((item, 0.0))
+                    if len(results) == limit:
+                        break
+        return results
+
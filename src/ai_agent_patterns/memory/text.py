@@ -0,0 +1,65 @@
+"""Text analysis shared by the memory stores: tokenization and token interning.
+
+A token is a whitespace-separated word, lower-cased, with every character that
+is not alphanumeric removed ("Sync!" -> "sync", "e-mail" -> "email").
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Everything `str.isalnum` rejects except whitespace; `\w` is `isalnum` plus "_".
+_DROP = re.compile(r"[^\w\s]|_")
+_ASCII_DROP = {code: None for code in range(128) if not (chr(code).isalnum() or chr(code).isspace())}
+
+QUERY_CACHE_SIZE = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    lowered = text.lower()
+    if lowered.isascii():
+        return lowered.translate(_ASCII_DROP).split()
+    return _DROP.sub("", lowered).split()
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def query_terms(text: str) -> Tuple[Tuple[str, int], ...]:
+    """Memoized `(token, count)` pairs of `text`, in first-occurrence order.
+
+    Agents re-issue the same query strings constantly, so query paths share this
+    cache; `query_terms.cache_info()` reports its hit rate.
+    """
+    return tuple(Counter(tokenize(text)).items())
+
+
+class TokenTable:
+    """Interning table assigning each distinct token a dense integer ID."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def get(self, token: str) -> Optional[int]:
+        return self._ids.get(token)
+
+    def token(self, token_id: int) -> str:
+        return self._tokens[token_id]
+
+    def intern(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self._tokens)
+            self._tokens.append(token)
+        return token_id
+
+    def encode(self, tokens: Iterable[str]) -> array:
+        """Token IDs of `tokens` as a compact `array('I')`, interning new tokens."""
+        intern = self.intern
+        return array("I", [intern(token) for token in tokens])
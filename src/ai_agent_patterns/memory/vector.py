@@ -1,20 +1,19 @@
 from __future__ import annotations
 
+import bisect
+import heapq
 import math
+import time
+from array import array
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Tuple
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .base import MemoryStore
+from .text import TokenTable, query_terms, tokenize
 
-
-def tokenize(text: str) -> List[str]:
-    tokens: List[str] = []
-    for raw in text.split():
-        cleaned = "".join(ch for ch in raw.lower() if ch.isalnum())
-        if cleaned:
-            tokens.append(cleaned)
-    return tokens
+__all__ = ["KeywordVectorMemory", "cosine_similarity", "tokenize", "vector_norm"]
 
 
 def cosine_similarity(a: Counter[str], b: Counter[str]) -> float:
@@ -27,24 +26,226 @@ def cosine_similarity(a: Counter[str], b: Counter[str]) -> float:
     return numerator / (denom_a * denom_b)
 
 
+def vector_norm(vector: Counter[str]) -> float:
+    return math.sqrt(sum(v * v for v in vector.values()))
+
+
+def _deadline(ttl_seconds: Optional[float]) -> Optional[float]:
+    return None if ttl_seconds is None else time.monotonic() + ttl_seconds
+
+
+@dataclass
+class _KeywordIndex:
+    """Rows of a `KeywordVectorMemory`; `compact` swaps in a new one wholesale."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    documents: List[array] = field(default_factory=list)
+    norms: array = field(default_factory=lambda: array("d"))
+    postings: List[array] = field(default_factory=list)
+    frequencies: List[array] = field(default_factory=list)
+    dead: bytearray = field(default_factory=bytearray)
+    expires: Dict[int, float] = field(default_factory=dict)
+    keys: Dict[str, int] = field(default_factory=dict)
+    row_keys: Dict[int, str] = field(default_factory=dict)
+    tombstones: int = 0
+
+    def live(self, row: int, now: float) -> bool:
+        if self.dead[row]:
+            return False
+        expiry = self.expires.get(row)
+        return expiry is None or expiry > now
+
+
 @dataclass
 class KeywordVectorMemory(MemoryStore):
-    """Lightweight vector-like memory without external deps."""
+    """Lightweight vector-like memory without external deps.
+
+    Tokens are interned to integer IDs and each item is kept as an `array('I')`
+    of them. `add` computes the norm once and appends `(item, count)` to
+    per-term postings, so `query` scores only items sharing a term with the
+    query, straight from the postings.
+
+    Items added with `upsert` have a key that `delete` and later upserts use.
+    Any item can carry `ttl_seconds`. Removed and expired rows are tombstoned,
+    which hides them from `query` and `fetch`. Once tombstones exceed
+    `compact_ratio` of the rows, `compact` rebuilds the postings from the stored
+    token IDs, without re-tokenizing.
+    """
 
     _items: List[Dict[str, Any]] = field(default_factory=list)
+    compact_ratio: float = 0.25
+    _terms: TokenTable = field(default_factory=TokenTable, init=False, repr=False)
+    _index: _KeywordIndex = field(default_factory=_KeywordIndex, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        items, self._items = self._items, self._index.items
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        index = self._index
+        return len(index.items) - index.tombstones
 
-    def add(self, item: Dict[str, Any]) -> None:
-        self._items.append(item)
+    def add(self, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        self._append(item, None, _deadline(ttl_seconds))
+
+    def upsert(self, key: str, item: Dict[str, Any], *, ttl_seconds: Optional[float] = None) -> None:
+        """Store `item` under `key`, replacing the item previously stored under it."""
+        self._append(item, key, _deadline(ttl_seconds))
+
+    def delete(self, key: str) -> bool:
+        """Remove the item stored under `key`; `False` if there is none."""
+        row = self._index.keys.pop(key, None)
+        if row is None:
+            return False
+        self._index.row_keys.pop(row, None)
+        self._kill(row)
+        return True
+
+    def purge_expired(self) -> int:
+        """Tombstone every item whose TTL has passed; returns how many."""
+        index, now = self._index, time.monotonic()
+        expired = [row for row, expiry in index.expires.items() if expiry <= now and not index.dead[row]]
+        for row in expired:
+            key = index.row_keys.pop(row, None)
+            if key is not None:
+                del index.keys[key]
+            self._tombstone(index, row)
+        if expired:
+            self._check_compaction(index)
+        return len(expired)
+
+    def compact(self) -> None:
+        """Drop tombstoned and expired rows, renumbering the survivors."""
+        old, now = self._index, time.monotonic()
+        new = _KeywordIndex()
+        for row, item in enumerate(old.items):
+            if not old.live(row, now):
+                continue
+            fresh = len(new.items)
+            new.items.append(item)
+            new.documents.append(old.documents[row])
+            new.norms.append(old.norms[row])
+            if row in old.expires:
+                new.expires[fresh] = old.expires[row]
+            key = old.row_keys.get(row)
+            if key is not None:
+                new.keys[key] = fresh
+                new.row_keys[fresh] = key
+            self._post(new, fresh, old.documents[row])
+        new.dead = bytearray(len(new.items))
+        self._index, self._items = new, new.items
 
     def fetch(self, limit: int = 5) -> List[Dict[str, Any]]:
-        return self._items[-limit:]
+        return self._fetch(self._index, len(self._index.items), limit)
 
     def query(self, text: str, limit: int = 3) -> List[Tuple[Dict[str, Any], float]]:
-        query_vec = Counter(tokenize(text))
-        scored = []
-        for item in self._items:
-            content = item.get("content", "")
-            score = cosine_similarity(query_vec, Counter(tokenize(content)))
-            scored.append((item, score))
-        scored.sort(key=lambda pair: pair[1], reverse=True)
-        return scored[:limit]
+        """Top `limit` items by cosine similarity; ties keep insertion order."""
+        return self._query(self._index, len(self._index.items), text, limit)
+
+    def _append(self, item: Dict[str, Any], key: Optional[str], expires_at: Optional[float]) -> None:
+        index = self._index
+        row = len(index.items)
+        document = self._terms.encode(tokenize(item.get("content", "")))
+        index.documents.append(document)
+        index.norms.append(math.sqrt(sum(count * count for count in Counter(document).values())))
+        index.dead.append(0)
+        if expires_at is not None:
+            index.expires[row] = expires_at
+        index.items.append(item)
+        self._post(index, row, document)
+        if key is not None:
+            previous = index.keys.get(key)
+            index.keys[key] = row
+            index.row_keys[row] = key
+            if previous is not None:
+                index.row_keys.pop(previous, None)
+                self._kill(previous)
+
+    @staticmethod
+    def _post(index: _KeywordIndex, row: int, document: array) -> None:
+        for term_id, count in Counter(document).items():
+            while term_id >= len(index.postings):
+                index.postings.append(array("I"))
+                index.frequencies.append(array("I"))
+            # Row before frequency: a concurrent reader cuts postings by row.
+            index.postings[term_id].append(row)
+            index.frequencies[term_id].append(count)
+
+    def _kill(self, row: int) -> None:
+        index = self._index
+        if self._tombstone(index, row):
+            self._check_compaction(index)
+
+    @staticmethod
+    def _tombstone(index: _KeywordIndex, row: int) -> bool:
+        if index.dead[row]:
+            return False
+        index.dead[row] = 1
+        index.tombstones += 1
+        return True
+
+    def _check_compaction(self, index: _KeywordIndex) -> None:
+        if index.tombstones > self.compact_ratio * len(index.items):
+            self._schedule_compaction()
+
+    def _schedule_compaction(self) -> None:
+        self.compact()
+
+    @staticmethod
+    def _fetch(index: _KeywordIndex, size: int, limit: int) -> List[Dict[str, Any]]:
+        if not (index.tombstones or index.expires):
+            return index.items[max(0, size - limit) : size]
+        now = time.monotonic()
+        newest: List[Dict[str, Any]] = []
+        for row in range(size - 1, -1, -1):
+            if len(newest) >= limit:
+                break
+            if index.live(row, now):
+                newest.append(index.items[row])
+        newest.reverse()
+        return newest
+
+    def _query(
+        self, index: _KeywordIndex, size: int, text: str, limit: int
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """`query` over the first `size` rows of `index`; later appends are ignored."""
+        if limit <= 0:
+            return []
+        terms = query_terms(text)
+        query_norm = math.sqrt(sum(weight * weight for _token, weight in terms))
+        filtered = bool(index.tombstones or index.expires)
+        now = time.monotonic()
+        dots = self._dots(index, size, terms)
+        if filtered:
+            dots = {row: dot for row, dot in dots.items() if index.live(row, now)}
+        norms = index.norms
+        best = heapq.nlargest(
+            limit,
+            ((dot / (norms[row] * query_norm), row) for row, dot in dots.items()),
+            key=lambda pair: (pair[0], -pair[1]),
+        )
+        results = [(index.items[row], score) for score, row in best]
+        if len(results) < limit:
+            for row in range(size):
+                if row not in dots and (not filtered or index.live(row, now)):
+                    results.append((index.items[row], 0.0))
+                    if len(results) == limit:
+                        break
+        return results
+
+    def _dots(
+        self, index: _KeywordIndex, size: int, terms: Sequence[Tuple[str, int]]
+    ) -> Dict[int, int]:
+        """Query-document dot products over rows below `size`, bounded even if postings grow."""
+        dots: Dict[int, int] = {}
+        for token, weight in terms:
+            term_id = self._terms.get(token)
+            if term_id is None or term_id >= len(index.postings):
+                continue
+            postings = index.postings[term_id]
+            end = bisect.bisect_left(postings, size)
+            counts = index.frequencies[term_id]
+            for row, count in zip(islice(postings, end), islice(counts, end), strict=True):
+                dots[row] = dots.get(row, 0) + weight * count
+        return dots
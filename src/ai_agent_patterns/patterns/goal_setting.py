@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import List
 
 from ..config import AgentConfig, DemoConfig
-from ..core import Agent
+from ..core import Agent, map_in_threads
 from ..factory import resolve_llm
 from ..types import AgentRunResult, PatternMetadata
 from . import register_pattern
@@ -31,9 +31,11 @@ def build_agent(config: AgentConfig) -> Agent:
         return state
 
     def generate_checkpoints(state):
-        for goal in goals:
+        def plan_goal(goal: str) -> str:
             prompt = f"Break down goal into 3 checkpoints:\nGoal: {goal}"
-            checkpoints[goal] = llm.generate(prompt, config=config, context={"intent": "plan"})
+            return llm.generate(prompt, config=config, context={"intent": "plan"})
+
+        checkpoints.update(zip(goals, map_in_threads(plan_goal, goals), strict=True))
         combined = "\n".join(f"{goal}: {checkpoints[goal]}" for goal in goals)
         state.scratchpad["checkpoints"] = combined
         state.transcript.append({"step": "generate_checkpoints", "content": combined})
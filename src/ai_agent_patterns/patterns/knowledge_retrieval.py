@@ -4,8 +4,8 @@ from typing import List
 
 from ..config import AgentConfig, DemoConfig
 from ..core import Agent
-from ..factory import resolve_llm
-from ..memory import KeywordVectorMemory
+from ..factory import resolve_llm, resolve_memory
+from ..memory import CachedMemoryStore
 from ..types import AgentRunResult, PatternMetadata
 from . import register_pattern
 
@@ -28,9 +28,12 @@ METADATA = PatternMetadata(
 
 def build_agent(config: AgentConfig) -> Agent:
     llm = resolve_llm(config)
-    store = KeywordVectorMemory()
-    for doc in KNOWLEDGE_BASE:
-        store.add({"content": doc})
+    store = resolve_memory(config)
+    if config.memory.query_cache_size is not None:
+        store = CachedMemoryStore(store, max_entries=config.memory.query_cache_size)
+    if config.memory.index_path is None:
+        for doc in KNOWLEDGE_BASE:
+            store.add({"content": doc})
 
     def retrieve(state):
         results: List[str] = [item["content"] for item, _score in store.query(state.input_text, limit=2)]
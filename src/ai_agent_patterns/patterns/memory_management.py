@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from ..config import AgentConfig, DemoConfig
 from ..core import Agent
-from ..factory import resolve_llm
-from ..memory import ConversationBuffer, KeywordVectorMemory
+from ..factory import memory_backend, resolve_llm
+from ..memory.concurrent import ConcurrentConversationBuffer
+from ..memory.sessions import Session, shared_session_store
 from ..types import AgentRunResult, PatternMetadata
 from . import register_pattern
 
@@ -19,19 +20,28 @@ METADATA = PatternMetadata(
 
 def build_agent(config: AgentConfig) -> Agent:
     llm = resolve_llm(config)
-    conversation = ConversationBuffer()
-    vector_memory = KeywordVectorMemory()
+    sessions = shared_session_store(config.sessions, config.memory, config.embedding)
+    # Runs without a `session_id` keep memory private to this agent, outside the shared store,
+    # so it is freed with the agent instead of lingering (or spilling) as an orphaned session.
+    private = Session(
+        "agent",
+        conversation=ConcurrentConversationBuffer(capacity=config.sessions.conversation_capacity),
+        vectors=memory_backend(config.memory, config.embedding),
+    )
+
+    def session(state):
+        session_id = state.context.get("session_id")
+        return private if session_id is None else sessions.get(str(session_id))
 
     def ingest(state):
-        entry = {"role": "user", "content": state.input_text}
-        conversation.add(entry)
-        vector_memory.add(entry)
+        session(state).remember({"role": "user", "content": state.input_text})
         state.transcript.append({"step": "memory_ingest", "content": state.input_text})
         return state
 
     def recall(state):
-        recent = conversation.fetch(limit=3)
-        similar = [item for item, _score in vector_memory.query(state.input_text, limit=2)]
+        memory = session(state)
+        recent = memory.conversation.fetch(limit=3, token_budget=config.max_tokens)
+        similar = [item for item, _score in memory.vectors.query(state.input_text, limit=2)]
         context_blocks = [item["content"] for item in recent + similar]
         context_text = "\n".join(context_blocks[-5:])
         state.scratchpad["memory_context"] = context_text
@@ -46,7 +56,7 @@ def build_agent(config: AgentConfig) -> Agent:
             f"Question: {state.input_text}"
         )
         answer = llm.generate(prompt, config=config, context={"intent": "summarize"})
-        conversation.add({"role": "assistant", "content": answer})
+        session(state).remember({"role": "assistant", "content": answer}, long_term=False)
         state.output = answer
         state.transcript.append({"step": "memory_response", "content": answer})
         return state
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
-
 from ..config import AgentConfig, DemoConfig
-from ..core import Agent
+from ..core import Agent, map_in_threads
 from ..factory import resolve_llm
 from ..types import AgentRunResult, PatternMetadata
 from . import register_pattern
@@ -31,15 +29,10 @@ def build_agent(config: AgentConfig) -> Agent:
 
     def execute_parallel(state):
         tasks = state.scratchpad["fanout_tasks"]
-        with ThreadPoolExecutor(max_workers=min(len(tasks), 4)) as executor:
-            outputs = list(
-                executor.map(
-                    lambda task: llm.generate(
-                        f"Address sub-task: {task}", config=config, context={"intent": "summarize"}
-                    ),
-                    tasks,
-                )
-            )
+        outputs = map_in_threads(
+            lambda task: llm.generate(f"Address sub-task: {task}", config=config, context={"intent": "summarize"}),
+            tasks,
+        )
         state.scratchpad["parallel_outputs"] = outputs
         state.transcript.append({"step": "execute_parallel", "content": "\n".join(outputs)})
         return state
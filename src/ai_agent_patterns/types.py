@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Protocol
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence
 
 from .config import AgentConfig
 
@@ -14,6 +15,24 @@ class LLMClient(Protocol):
     def generate(self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None) -> str:
         ...
 
+    async def agenerate(
+        self, prompt: str, *, config: AgentConfig, context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        ...
+
+
+class EmbeddingClient(Protocol):
+    """Protocol implemented by text embedding providers.
+
+    `embed_batch` returns one `dimensions`-long vector per text, in order.
+    """
+
+    name: str
+    dimensions: int
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        ...
+
 
 @dataclass(slots=True)
 class PatternMetadata:
@@ -34,6 +53,7 @@ class AgentState:
 
 
 AgentStep = Callable[[AgentState], AgentState]
+AsyncAgentStep = Callable[[AgentState], Awaitable[AgentState]]
 
 
 @dataclass(slots=True)
@@ -41,6 +61,8 @@ class AgentRunResult:
     pattern: str
     output: str
     transcript: List[Dict[str, Any]]
+    input_index: Optional[int] = None
+    error: Optional[Exception] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -56,3 +78,38 @@ class AgentRunResult:
             content = step.get("content", "")
             lines.append(f"{idx}. **{operation}** — {content}")
         return "\n".join(lines)
+
+
+@dataclass(slots=True)
+class AgentEvent:
+    """Incremental event emitted by `Agent.stream`.
+
+    `kind` is one of "step_started", "token", "step_finished" or "final"; the
+    final event carries the complete `AgentRunResult`.
+    """
+
+    kind: str
+    step: Optional[str] = None
+    content: str = ""
+    result: Optional[AgentRunResult] = None
+
+
+@dataclass(slots=True)
+class BatchStats:
+    """Aggregate counters updated while `Agent.run_many` streams results."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    started_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return max(end - self.started_at, 0.0)
+
+    @property
+    def throughput(self) -> float:
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed else 0.0
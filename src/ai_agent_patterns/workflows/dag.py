@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import contextvars
+import copy
+import logging
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from ..types import AgentState, AgentStep
+
+logger = logging.getLogger("ai_agent_patterns.dag")
+
+OUTPUT_KEY = "output"
+
+
+@dataclass(frozen=True)
+class DagStep:
+    """AgentStep annotated with the scratchpad keys it reads and writes.
+
+    Use the pseudo-key "output" for `AgentState.output`. A step declared with
+    `reads=None` has unknown dependencies and acts as a barrier.
+    """
+
+    step: AgentStep
+    reads: Optional[FrozenSet[str]] = frozenset()
+    writes: FrozenSet[str] = frozenset()
+
+    @property
+    def name(self) -> str:
+        return getattr(self.step, "__name__", type(self.step).__name__)
+
+    @property
+    def is_barrier(self) -> bool:
+        return self.reads is None
+
+    def __call__(self, state: AgentState) -> AgentState:
+        return self.step(state)
+
+
+def declare_step(
+    step: AgentStep, *, reads: Optional[Iterable[str]] = (), writes: Iterable[str] = ()
+) -> DagStep:
+    return DagStep(
+        step=step,
+        reads=None if reads is None else frozenset(reads),
+        writes=frozenset(writes),
+    )
+
+
+def build_step_graph(steps: Sequence[DagStep]) -> Dict[int, Set[int]]:
+    """Map each step index to the earlier steps it must wait for."""
+    predecessors: Dict[int, Set[int]] = {index: set() for index in range(len(steps))}
+    for later, second in enumerate(steps):
+        for earlier in range(later):
+            first = steps[earlier]
+            if first.is_barrier or second.is_barrier or _conflicts(first, second):
+                predecessors[later].add(earlier)
+    return predecessors
+
+
+def run_dag(
+    steps: Iterable[Union[DagStep, AgentStep]],
+    state: AgentState,
+    *,
+    max_workers: Optional[int] = None,
+) -> AgentState:
+    """Execute steps with maximal parallelism allowed by their declared keys.
+
+    Every step runs against its own deep copy of the scratchpad (values that
+    cannot be deep-copied are shared), so in-place mutations such as
+    `list.append` stay private to the step until it completes. Changes are then
+    detected by comparing values with the scratchpad the step started from, and
+    declared writes are merged back; transcript entries are appended in
+    declaration order once all steps finish, so the result is deterministic.
+    """
+    specs = [step if isinstance(step, DagStep) else DagStep(step, reads=None) for step in steps]
+    if not specs:
+        return state
+    for entries in _schedule(specs, build_step_graph(specs), state, max_workers):
+        state.transcript.extend(entries)
+    return state
+
+
+def dag_step(
+    steps: Iterable[Union[DagStep, AgentStep]], *, max_workers: Optional[int] = None, name: str = "dag"
+) -> AgentStep:
+    """Wraps `run_dag` so a dependency graph can be dropped into `Agent.steps`."""
+    specs = list(steps)
+
+    def _run(state: AgentState) -> AgentState:
+        return run_dag(specs, state, max_workers=max_workers)
+
+    _run.__name__ = name
+    return _run
+
+
+def _dependents(predecessors: Dict[int, Set[int]]) -> Dict[int, List[int]]:
+    dependents: Dict[int, List[int]] = defaultdict(list)
+    for index, preds in predecessors.items():
+        for pred in preds:
+            dependents[pred].append(index)
+    return dependents
+
+
+def _schedule(
+    specs: Sequence[DagStep],
+    predecessors: Dict[int, Set[int]],
+    state: AgentState,
+    max_workers: Optional[int],
+) -> List[List[Dict[str, object]]]:
+    """Run `specs` as their predecessors finish, merging into `state`; returns transcripts."""
+    dependents = _dependents(predecessors)
+    transcripts: List[List[Dict[str, object]]] = [[] for _ in specs]
+    with ThreadPoolExecutor(max_workers=max_workers or len(specs), thread_name_prefix="dag-step") as executor:
+        running: Dict[Future, Tuple[int, AgentState]] = {}
+
+        def launch(index: int) -> None:
+            baseline = _branch(state)
+            run = contextvars.copy_context().run
+            running[executor.submit(run, specs[index].step, _branch(baseline))] = (index, baseline)
+
+        for index, preds in predecessors.items():
+            if not preds:
+                launch(index)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda item: running[item][0]):
+                index, baseline = running.pop(future)
+                result = future.result()
+                _merge(state, baseline, result, specs[index])
+                transcripts[index] = result.transcript
+                for dependent in dependents[index]:
+                    predecessors[dependent].discard(index)
+                    if not predecessors[dependent]:
+                        launch(dependent)
+    return transcripts
+
+
+def _conflicts(first: DagStep, second: DagStep) -> bool:
+    assert first.reads is not None and second.reads is not None
+    return bool(
+        first.writes & second.reads or first.reads & second.writes or first.writes & second.writes
+    )
+
+
+def _private(value: Any) -> Any:
+    try:
+        return copy.deepcopy(value)
+    except Exception:  # locks, clients and other uncopyable handles stay shared
+        return value
+
+
+def _differs(before: Any, after: Any) -> bool:
+    if before is after:
+        return False
+    try:
+        return bool(before != after)
+    except Exception:  # e.g. numpy arrays, whose != is elementwise
+        return True
+
+
+def _branch(state: AgentState) -> AgentState:
+    return AgentState(
+        input_text=state.input_text,
+        context=dict(state.context),
+        scratchpad={key: _private(value) for key, value in state.scratchpad.items()},
+        transcript=[],
+        output=state.output,
+    )
+
+
+def _changed_keys(baseline: AgentState, result: AgentState) -> Set[str]:
+    changed = {
+        key
+        for key, value in result.scratchpad.items()
+        if key not in baseline.scratchpad or _differs(baseline.scratchpad[key], value)
+    }
+    if _differs(baseline.output, result.output):
+        changed.add(OUTPUT_KEY)
+    return changed
+
+
+def _merge(state: AgentState, baseline: AgentState, result: AgentState, spec: DagStep) -> None:
+    changed = _changed_keys(baseline, result)
+    if spec.is_barrier:
+        keys = changed
+    else:
+        keys = spec.writes
+        undeclared = changed - spec.writes
+        if undeclared:
+            logger.warning("Step %s wrote undeclared keys %s; ignored.", spec.name, sorted(undeclared))
+    for key in sorted(keys):
+        if key == OUTPUT_KEY:
+            state.output = result.output
+        elif key in result.scratchpad:
+            state.scratchpad[key] = result.scratchpad[key]
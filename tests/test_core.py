@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_agent_patterns import Agent, AgentConfig, DemoConfig, registry
+from ai_agent_patterns.core import async_llm_step, llm_step, stream_events
+from ai_agent_patterns.llm import MockLLMClient
+from ai_agent_patterns.types import BatchStats
+
+
+def test_agent_arun_mixes_sync_and_async_steps() -> None:
+    def draft(state):
+        state.scratchpad["draft"] = state.input_text.upper()
+        state.transcript.append({"step": "draft", "content": state.scratchpad["draft"]})
+        return state
+
+    async def polish(state):
+        await asyncio.sleep(0)
+        state.output = state.scratchpad["draft"] + "!"
+        state.transcript.append({"step": "polish", "content": state.output})
+        return state
+
+    agent = Agent(name="mixed", llm=MockLLMClient(), steps=[draft, polish], config=AgentConfig())
+    result = asyncio.run(agent.arun("hello"))
+    assert result.output == "HELLO!"
+    assert [entry["step"] for entry in result.transcript] == ["draft", "polish"]
+
+
+def test_async_llm_step_matches_sync_generate() -> None:
+    def summarize(state):
+        return f"Summarize: {state.input_text}"
+
+    agent = Agent(name="async-llm", llm=MockLLMClient(), steps=[], config=AgentConfig())
+    agent.steps = [async_llm_step(agent, summarize)]
+    result = asyncio.run(agent.arun("outage report"))
+    expected = MockLLMClient().generate("Summarize: outage report", config=AgentConfig(), context={})
+    assert result.output == expected
+
+
+class BarrierClient(MockLLMClient):
+    """Blocks every call until `parties` calls are in flight at once."""
+
+    def __init__(self, parties: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=10)
+
+    def generate(self, prompt, *, config, context=None):
+        self.barrier.wait()
+        return super().generate(prompt, config=config, context=context)
+
+
+def _barrier_agent(parties: int) -> Agent:
+    agent = Agent(name="barrier", llm=BarrierClient(parties), steps=[], config=AgentConfig())
+    agent.steps = [llm_step(agent, lambda state: f"Summarize: {state.input_text}")]
+    return agent
+
+
+def test_arun_runs_more_than_32_sync_llm_steps_at_once_on_a_sized_executor() -> None:
+    agent = _barrier_agent(48)
+
+    async def gather():
+        with ThreadPoolExecutor(max_workers=48) as executor:
+            runs = (agent.arun(f"ticket {idx}", executor=executor) for idx in range(48))
+            return await asyncio.gather(*runs)
+
+    assert len(asyncio.run(gather())) == 48
+
+
+def test_run_many_asyncio_backend_keeps_max_concurrency_llm_calls_in_flight() -> None:
+    agent = _barrier_agent(48)
+    stats = BatchStats()
+    inputs = [f"ticket {idx}" for idx in range(96)]
+    results = list(agent.run_many(inputs, max_concurrency=48, backend="asyncio", stats=stats))
+    assert stats.completed == 96 and all(result.error is None for result in results)
+
+
+def test_run_many_streams_all_results_with_stats() -> None:
+    agent = registry.get("prompt_chaining").build_agent(AgentConfig())
+    inputs = [f"ticket {idx}" for idx in range(12)]
+    expected = [agent.run(text).output for text in inputs]
+
+    for backend in ("thread", "asyncio"):
+        stats = BatchStats()
+        results = list(agent.run_many(inputs, max_concurrency=4, backend=backend, stats=stats))
+        assert sorted(result.input_index for result in results) == list(range(12))
+        assert [result.output for result in sorted(results, key=lambda r: r.input_index)] == expected
+        assert stats.completed == 12 and stats.failed == 0
+        assert stats.throughput > 0
+
+    ordered = list(agent.run_many(inputs, max_concurrency=3, ordered=True))
+    assert [result.input_index for result in ordered] == list(range(12))
+
+
+@pytest.mark.parametrize("backend", ["thread", "process", "asyncio"])
+def test_run_many_isolates_failing_inputs(backend) -> None:
+    agent = registry.get("learning_adaptation").build_agent(AgentConfig())
+    inputs = [f"ticket {idx}" for idx in range(6)]
+    contexts = [{"feedback_score": "not a number"} if idx in (1, 4) else None for idx in range(6)]
+    stats = BatchStats()
+    results = list(agent.run_many(inputs, contexts, max_concurrency=2, backend=backend, stats=stats))
+
+    assert sorted(result.input_index for result in results) == list(range(6))
+    failed = sorted(result.input_index for result in results if result.error is not None)
+    assert failed == [1, 4]
+    assert all(isinstance(result.error, ValueError) for result in results if result.error is not None)
+    assert all(result.output for result in results if result.error is None)
+    assert stats.completed == 4 and stats.failed == 2
+
+
+def test_agent_stream_emits_step_token_and_final_events() -> None:
+    agent = registry.get("prompt_chaining").build_agent(AgentConfig())
+    expected = agent.run("Reset my password").output
+
+    events = list(agent.stream("Reset my password"))
+    kinds = [event.kind for event in events]
+    assert kinds[0] == "step_started"
+    assert "token" in kinds
+    assert kinds[-1] == "final"
+    assert events[-1].result is not None and events[-1].result.output == expected
+
+    async def collect():
+        return [event async for event in agent.astream("Reset my password")]
+
+    async_events = asyncio.run(collect())
+    assert [event.kind for event in async_events] == kinds
+
+
+def test_mock_generate_stream_reassembles_to_generate() -> None:
+    client = MockLLMClient(chunk_size=2)
+    config = AgentConfig()
+    chunks = list(client.generate_stream("Summarize the outage.", config=config, context={"intent": "plan"}))
+    assert len(chunks) > 1
+    assert "".join(chunks) == client.generate("Summarize the outage.", config=config, context={"intent": "plan"})
+
+
+@pytest.mark.parametrize("pattern", ["goal_setting", "parallelization"])
+def test_stream_carries_tokens_from_pattern_worker_threads(pattern) -> None:
+    agent = registry.get(pattern).build_agent(AgentConfig())
+    text = "Improve onboarding docs\nReduce ticket backlog" if pattern == "goal_setting" else "billing; outage"
+    events = list(agent.stream(text))
+    fanned_out = {"goal_setting": "generate_checkpoints", "parallelization": "execute_parallel"}[pattern]
+    tokens = "".join(event.content for event in events if event.kind == "token" and event.step == fanned_out)
+    assert tokens and events[-1].result is not None
+
+    async def collect():
+        return [event async for event in agent.astream(text)]
+
+    async_events = asyncio.run(collect())
+    assert any(event.kind == "token" and event.step == fanned_out for event in async_events)
+
+
+def test_stream_events_replays_a_pattern_demo_with_its_own_context() -> None:
+    definition = registry.get("learning_adaptation")
+    demo_config = DemoConfig(agent_config=AgentConfig(), input_text="Tune the triage prompt")
+    expected = definition.demo(demo_config)
+    events = list(stream_events(lambda: definition.demo(demo_config)))
+    assert [event.kind for event in events][0] == "step_started" and events[-1].kind == "final"
+    assert events[-1].result is not None and events[-1].result.output == expected.output
+    assert events[-1].result.transcript == expected.transcript
@@ -1,7 +1,44 @@
 from __future__ import annotations
 
-from ai_agent_patterns.config import AgentConfig
-from ai_agent_patterns.llm import MockLLMClient
+import asyncio
+import dataclasses
+import os
+import sqlite3
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import pytest
+
+from ai_agent_patterns import BatchingConfig, RateLimitConfig, ResilienceConfig, SimulationConfig
+from ai_agent_patterns.config import AgentConfig, CacheConfig, HTTPConfig
+from ai_agent_patterns.factory import ClientPool, resolve_embedder
+from ai_agent_patterns.llm import (
+    BatchingLLMClient,
+    CachingEmbeddingClient,
+    CachingLLMClient,
+    HTTPPool,
+    LLMError,
+    MockLLMClient,
+    OpenAILLMClient,
+    RateLimitedLLMClient,
+    RateLimiter,
+    ResilientLLMClient,
+    ResponseCache,
+    SimulatedLLMClient,
+    SimulatedRateLimitError,
+    SimulatedServerError,
+    SingleFlightLLMClient,
+    TokenBucket,
+)
+from ai_agent_patterns.llm import cache as cache_module
+from ai_agent_patterns.llm.cache import shared_response_cache
+from ai_agent_patterns.llm.ratelimit import is_overload
+from ai_agent_patterns.llm.resilience import is_retryable
+from ai_agent_patterns.memory import HashingEmbedder
 
 
 def test_mock_llm_consistency() -> None:
@@ -10,3 +47,691 @@ def test_mock_llm_consistency() -> None:
     out1 = client.generate("Summarize the outage.", config=config, context={"intent": "summarize"})
     out2 = client.generate("Summarize the outage.", config=config, context={"intent": "summarize"})
     assert out1 == out2
+
+
+def test_caching_client_serves_repeats_from_memory_and_disk(tmp_path) -> None:
+    class CountingClient(MockLLMClient):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls = 0
+
+        def generate(self, prompt, *, config, context=None):
+            self.calls += 1
+            return super().generate(prompt, config=config, context=context)
+
+    config = AgentConfig()
+    path = str(tmp_path / "responses.sqlite")
+    inner = CountingClient()
+    client = CachingLLMClient(inner, ResponseCache(max_entries=1, path=path))
+    first = client.generate("Route this ticket", config=config)
+    assert client.generate("Route this ticket", config=config) == first
+    client.generate("Another prompt", config=config)
+    assert inner.calls == 2
+    assert client.stats.memory_hits == 1 and client.stats.evictions == 1
+
+    restarted = CachingLLMClient(inner, ResponseCache(max_entries=4, path=path))
+    assert restarted.generate("Route this ticket", config=config) == first
+    assert restarted.stats.disk_hits == 1
+    assert inner.calls == 2
+
+    hotter = AgentConfig(temperature=0.9)
+    restarted.generate("Route this ticket", config=hotter)
+    assert inner.calls == 3
+
+
+def test_sqlite_tier_keeps_stored_expiry_and_purges_expired_rows(tmp_path, monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", types.SimpleNamespace(time=lambda: now[0]))
+    path = str(tmp_path / "responses.sqlite")
+    writer = ResponseCache(ttl_seconds=100, path=path)
+    writer.set("old", "value")
+
+    now[0] += 90
+    reader = ResponseCache(ttl_seconds=100, path=path)
+    assert reader.get("old") == "value" and reader.stats.disk_hits == 1
+    now[0] += 20
+    assert reader.get("old") is None
+
+    for index in range(cache_module._PURGE_EVERY):
+        writer.set(f"key-{index}", "value")
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses WHERE key = 'old'").fetchone()[0] == 0
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count descriptors")
+def test_sqlite_tier_does_not_leak_connections_across_thread_pools(tmp_path) -> None:
+    cache = ResponseCache(max_entries=1, path=str(tmp_path / "responses.sqlite"))
+    cache.set("warm", "up")
+
+    def touch(index: int) -> None:
+        cache.set(f"key-{index}", "value")
+        cache.get("warm")
+
+    before = len(os.listdir("/proc/self/fd"))
+    for round_index in range(20):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(touch, range(round_index * 4, round_index * 4 + 4)))
+    assert len(os.listdir("/proc/self/fd")) <= before + 2
+    assert cache.store is not None and cache.store.get("key-79", 0.0) == ("value", None)
+    cache.close()
+
+
+def test_openai_client_reuses_sdk_client_and_http_pool(monkeypatch) -> None:
+    created = []
+
+    class FakeOpenAI:
+        def __init__(self, **kwargs) -> None:
+            created.append(kwargs)
+            self.responses = types.SimpleNamespace(
+                create=lambda **request: types.SimpleNamespace(output_text=f"echo:{request['input']}")
+            )
+
+    fake_httpx = types.SimpleNamespace(
+        Client=lambda **options: types.SimpleNamespace(options=options, close=lambda: None),
+        Timeout=lambda timeout, connect: (timeout, connect),
+        Limits=lambda **limits: limits,
+    )
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(OpenAI=FakeOpenAI))
+    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    pool = HTTPPool(HTTPConfig(max_connections=4, timeout=3.0))
+    client = OpenAILLMClient(pool=pool)
+    config = AgentConfig()
+    assert client.generate("one", config=config) == "echo:one"
+    assert client.generate("two", config=config) == "echo:two"
+    assert len(created) == 1
+    http_client = created[0]["http_client"]
+    assert http_client is pool.client()
+    assert http_client.options["limits"]["max_connections"] == 4
+    assert http_client.options["timeout"] == (3.0, 5.0)
+
+
+def test_http_pool_close_closes_async_clients_on_their_loops(monkeypatch) -> None:
+    closed = []
+
+    class FakeAsyncClient:
+        def __init__(self, **options) -> None:
+            self.options = options
+
+        async def aclose(self) -> None:
+            closed.append(self)
+
+    fake_httpx = types.SimpleNamespace(
+        AsyncClient=FakeAsyncClient,
+        Timeout=lambda timeout, connect: (timeout, connect),
+        Limits=lambda **limits: limits,
+    )
+    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+
+    async def open_client(pool):
+        return pool.async_client()
+
+    idle = HTTPPool()
+    loop = asyncio.new_event_loop()
+    try:
+        client = loop.run_until_complete(open_client(idle))
+        idle.close()
+        assert closed == [client]
+    finally:
+        loop.close()
+
+    async def close_from_the_loop():
+        running = HTTPPool()
+        client = running.async_client()
+        running.close()
+        await asyncio.sleep(0)
+        return client
+
+    client = asyncio.run(close_from_the_loop())
+    assert closed[-1] is client
+
+
+def test_client_pool_shares_clients_per_config() -> None:
+    pool = ClientPool()
+    pool.warm_up([AgentConfig()])
+    first = pool.get(AgentConfig(temperature=0.9))
+    assert pool.get(AgentConfig()) is first
+    cached = pool.get(AgentConfig(cache=CacheConfig(max_entries=8)))
+    assert cached is not first
+    assert pool.stats.builds == 2 and pool.stats.hits == 2 and pool.stats.size == 2
+
+    pool.shutdown()
+    assert pool.stats.size == 0
+    assert pool.get(AgentConfig()) is not first
+
+
+@pytest.mark.parametrize(
+    ("layer", "outermost"),
+    [
+        ({"batching": BatchingConfig(window_seconds=0.001)}, BatchingLLMClient),
+        ({"rate_limit": RateLimitConfig(requests_per_second=50)}, RateLimitedLLMClient),
+        ({"resilience": ResilienceConfig()}, ResilientLLMClient),
+        ({"single_flight": True}, SingleFlightLLMClient),
+        (
+            {"provider": "simulated", "simulation": SimulationConfig(first_token_seconds=0, tokens_per_second=0)},
+            SimulatedLLMClient,
+        ),
+    ],
+)
+def test_client_pool_builds_each_client_layer(layer, outermost) -> None:
+    pool = ClientPool()
+    client = pool.get(AgentConfig(**layer))
+    assert isinstance(client, outermost) and client.generate("hello", config=AgentConfig())
+    pool.shutdown()
+
+
+def test_caching_embedding_client_batches_misses_and_reuses_vectors(tmp_path) -> None:
+    class CountingEmbedder(HashingEmbedder):
+        batches: list
+
+        def embed_batch(self, texts):
+            self.batches.append(list(texts))
+            return super().embed_batch(texts)
+
+    inner = CountingEmbedder(dimensions=32)
+    inner.batches = []
+    path = str(tmp_path / "embeddings.sqlite")
+    client = CachingEmbeddingClient(inner, ResponseCache(path=path), batch_size=3)
+    texts = [f"document {idx}" for idx in range(7)] + ["document 0", "document 3"]
+    vectors = client.embed_batch(texts)
+
+    assert [len(batch) for batch in inner.batches] == [3, 3, 1] and client.requests == 3
+    assert vectors == [HashingEmbedder(dimensions=32).embed(text) for text in texts]
+    assert client.embed_batch(texts[:7]) == vectors[:7] and client.requests == 3
+
+    reopened = CachingEmbeddingClient(inner, ResponseCache(path=path), batch_size=3)
+    assert reopened.embed_batch(texts) == vectors
+    assert reopened.requests == 0 and reopened.stats.disk_hits == 7
+    assert reopened.embed("document 7") == HashingEmbedder(dimensions=32).embed("document 7")
+    assert reopened.requests == 1
+
+
+def test_caching_embedding_client_keeps_queries_out_of_the_document_cache() -> None:
+    client = CachingEmbeddingClient(HashingEmbedder(dimensions=32), ResponseCache(max_entries=2))
+    documents = client.embed_batch(["billing refund", "login error"])
+    queries = [f"question {idx}" for idx in range(5)]
+    assert [client.embed_query(query) for query in queries] == [
+        HashingEmbedder(dimensions=32).embed(query) for query in queries
+    ]
+    assert client.requests == 6 and client.stats.evictions == 0
+    assert client.embed_batch(["billing refund", "login error"]) == documents and client.requests == 6
+
+
+def test_embedding_cache_is_separate_from_an_equal_llm_response_cache() -> None:
+    llm_cache = CacheConfig(max_entries=10_000)
+    assert AgentConfig().embedding.cache == llm_cache
+    embedder = resolve_embedder(AgentConfig())
+    assert isinstance(embedder, CachingEmbeddingClient)
+    assert embedder.cache is not shared_response_cache(llm_cache)
+
+
+class BatchRecordingClient(MockLLMClient):
+    """Records each provider batch and fails any batch that carries a ``boom`` prompt."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = []
+
+    def generate_batch(self, prompts, *, config, contexts=None):
+        self.batches.append(list(prompts))
+        if "boom" in prompts:
+            raise RuntimeError("provider failed")
+        return super().generate_batch(prompts, config=config, contexts=contexts)
+
+
+class ShortBatchClient(MockLLMClient):
+    """Drops the last response of every batch, like a provider that silently truncates."""
+
+    def generate_batch(self, prompts, *, config, contexts=None):
+        return super().generate_batch(prompts, config=config, contexts=contexts)[:-1]
+
+
+def test_batching_client_coalesces_concurrent_calls_and_routes_results() -> None:
+    config = AgentConfig()
+    inner = BatchRecordingClient()
+    client = BatchingLLMClient(inner, window_seconds=60, max_batch=8)
+    prompts = [f"Summarize ticket {idx}" for idx in range(16)]
+    context = {"intent": "summarize"}
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        outputs = list(pool.map(lambda p: client.generate(p, config=config, context=context), prompts))
+    client.close()
+    assert outputs == [MockLLMClient().generate(p, config=config, context=context) for p in prompts]
+    assert sorted(len(batch) for batch in inner.batches) == [8, 8]
+    assert client.stats.requests == 16 and client.stats.mean_batch_size == 8
+
+
+def test_batching_client_serves_async_callers() -> None:
+    config = AgentConfig()
+    inner = BatchRecordingClient()
+    client = BatchingLLMClient(inner, window_seconds=60, max_batch=4)
+    prompts = [f"Summarize ticket {idx}" for idx in range(4)]
+
+    async def burst():
+        return await asyncio.gather(*(client.agenerate(p, config=config) for p in prompts))
+
+    assert list(asyncio.run(burst())) == [MockLLMClient().generate(p, config=config) for p in prompts]
+    client.close()
+    assert len(inner.batches) == 1
+
+
+def test_batching_client_only_batches_calls_with_identical_configs() -> None:
+    plain, stopped = AgentConfig(), AgentConfig(extras={"stop": ["\n"]})
+    inner = BatchRecordingClient()
+    client = BatchingLLMClient(inner, window_seconds=60, max_batch=4)
+    calls = [("a0", plain), ("b0", stopped), ("a1", plain), ("b1", stopped)]
+    futures = [client.submit(prompt, config=config) for prompt, config in calls]
+    assert all(future.result(timeout=5) for future in futures)
+    client.close()
+    assert sorted(inner.batches) == [["a0", "a1"], ["b0", "b1"]]
+
+
+def test_batching_client_fails_every_call_in_a_failed_batch() -> None:
+    config = AgentConfig()
+    client = BatchingLLMClient(BatchRecordingClient(), window_seconds=60, max_batch=2)
+    failing = [client.submit(prompt, config=config) for prompt in ("boom", "ok")]
+    for future in failing:
+        with pytest.raises(RuntimeError, match="provider failed"):
+            future.result(timeout=5)
+    client.close()
+
+
+def test_batching_client_fails_every_call_when_a_batch_comes_back_short() -> None:
+    config = AgentConfig()
+    client = BatchingLLMClient(ShortBatchClient(), window_seconds=60, max_batch=3)
+    futures = [client.submit(f"q{idx}", config=config) for idx in range(3)]
+    for future in futures:
+        with pytest.raises(LLMError, match="2 responses for 3 prompts"):
+            future.result(timeout=5)
+    client.close()
+
+
+def test_batching_client_answers_a_lone_call() -> None:
+    config = AgentConfig()
+    plain = BatchingLLMClient(MockLLMClient(), window_seconds=0.05, max_batch=4)
+    assert plain.generate("route this", config=config) == "Routing decision: escalate_to_specialist"
+    plain.close()
+
+
+def test_client_pool_shutdown_closes_batching_clients() -> None:
+    pool = ClientPool()
+    batched = pool.get(AgentConfig(batching=BatchingConfig(window_seconds=0.001)))
+    assert isinstance(batched, BatchingLLMClient)
+    pool.shutdown()
+    with pytest.raises(RuntimeError, match="closed"):
+        batched.generate("hello", config=AgentConfig())
+    with pytest.raises(RuntimeError, match="closed"):
+        batched.submit("hello", config=AgentConfig())
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class GatedClient(MockLLMClient):
+    """Holds every call until `release` is set, recording peak concurrency; can answer 429."""
+
+    def __init__(self, *, fail: bool = False) -> None:
+        super().__init__()
+        self.active = self.peak = 0
+        self.fail = fail
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, *, config, context=None):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait()
+        with self.lock:
+            self.active -= 1
+        if self.fail:
+            raise RateLimitError("slow down")
+        return super().generate(prompt, config=config, context=context)
+
+
+def _wait_for(predicate) -> None:
+    deadline = time.monotonic() + 5
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert predicate()
+
+
+def test_rate_limiter_caps_concurrency() -> None:
+    config = AgentConfig()
+    inner = GatedClient()
+    limiter = RateLimiter(RateLimitConfig(initial_concurrency=4, max_concurrency=6))
+    client = RateLimitedLLMClient(inner, limiter)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(client.generate, f"q{idx}", config=config) for idx in range(16)]
+        _wait_for(lambda: inner.active == 4 and limiter.stats.queue_depth == 12)
+        inner.release.set()
+    assert all(future.result() for future in futures)
+    assert 4 <= inner.peak <= 6 and 4 < limiter.limit <= 6
+    assert client.stats.requests == 16 and client.stats.peak_queue_depth == 12
+    assert client.stats.waited > 0 and limiter.stats.in_flight == 0
+
+
+def test_rate_limiter_backs_off_once_per_round_on_overload() -> None:
+    config = AgentConfig()
+    inner = GatedClient(fail=True)
+    limiter = RateLimiter(RateLimitConfig(initial_concurrency=6, max_concurrency=6))
+    client = RateLimitedLLMClient(inner, limiter)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(client.generate, f"q{idx}", config=config) for idx in range(6)]
+        _wait_for(lambda: inner.active == 6)
+        inner.release.set()
+    assert all(isinstance(future.exception(), RateLimitError) for future in futures)
+    assert limiter.stats.overloads == 6 and limiter.limit == 3
+    assert limiter.stats.in_flight == 0 and limiter.stats.queue_depth == 0
+
+
+def test_rate_limiter_shares_slots_between_threads_and_coroutines() -> None:
+    config = AgentConfig()
+    inner = GatedClient()
+    limiter = RateLimiter(RateLimitConfig(initial_concurrency=2, max_concurrency=2))
+    client = RateLimitedLLMClient(inner, limiter)
+
+    async def mixed():
+        return await asyncio.gather(*(client.agenerate(f"a{idx}", config=config) for idx in range(8)))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = [pool.submit(client.generate, f"t{idx}", config=config) for idx in range(8)]
+        _wait_for(lambda: inner.active == 2 and limiter.stats.queue_depth == 2)
+        inner.release.set()
+        assert len(asyncio.run(mixed())) == 8
+        assert all(future.result() for future in threaded)
+    assert inner.peak == 2 and limiter.stats.in_flight == 0
+
+
+def test_token_bucket_spaces_requests_past_its_burst() -> None:
+    now = [0.0]
+    bucket = TokenBucket(rate=100, capacity=2, clock=lambda: now[0])
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.01)
+    now[0] += 0.02
+    assert bucket.reserve() == 0 and bucket.reserve() == pytest.approx(0.01)
+
+
+class ServiceUnavailableError(Exception):
+    status_code = 503
+
+
+class FlakyClient(MockLLMClient):
+    """Fails the next `failures` attempts with a 503. Attempts numbered in
+    `stalled` block until `release` is set; those also in `doomed` then fail."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.failures = 0
+        self.stalled = set()
+        self.doomed = set()
+        self.release = threading.Event()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _attempt(self):
+        with self.lock:
+            self.calls += 1
+            if self.failures:
+                self.failures -= 1
+                raise ServiceUnavailableError("try again")
+            return self.calls
+
+    def generate(self, prompt, *, config, context=None):
+        call = self._attempt()
+        if call in self.stalled:
+            self.release.wait()
+        if call in self.doomed:
+            raise ServiceUnavailableError("gave up")
+        return super().generate(prompt, config=config, context=context)
+
+    async def agenerate(self, prompt, *, config, context=None):
+        call = self._attempt()
+        while call in self.stalled and not self.release.is_set():
+            await asyncio.sleep(0.001)
+        if call in self.doomed:
+            raise ServiceUnavailableError("gave up")
+        return super().generate(prompt, config=config, context=context)
+
+
+class MissingKeyClient(MockLLMClient):
+    def generate(self, prompt, *, config, context=None):
+        raise LLMError("Missing environment variables: OPENAI_API_KEY")
+
+
+HEDGING = ResilienceConfig(max_attempts=3, backoff_base=0.001, hedge_min_samples=5)
+
+
+def _warmed_resilient_client() -> Tuple[FlakyClient, ResilientLLMClient]:
+    inner = FlakyClient()
+    client = ResilientLLMClient(inner, HEDGING, seed=1)
+    for _ in range(10):
+        client.generate("route me", config=AgentConfig())
+    assert client.hedge_delay(AgentConfig()) is not None
+    return inner, client
+
+
+def test_resilient_client_retries_transient_errors() -> None:
+    config = AgentConfig()
+    inner = FlakyClient()
+    client = ResilientLLMClient(inner, HEDGING, seed=1)
+    inner.failures = 2
+    assert client.generate("route me", config=config) == MockLLMClient().generate("route me", config=config)
+    assert client.stats.retries == 2 and client.hedge_delay(config) is None
+    inner.failures = 3
+    with pytest.raises(ServiceUnavailableError):
+        client.generate("route me", config=config)
+    assert client.stats.failures == 1
+
+
+def test_resilient_client_does_not_retry_configuration_errors() -> None:
+    client = ResilientLLMClient(MissingKeyClient())
+    with pytest.raises(LLMError):
+        client.generate("x", config=AgentConfig())
+    assert client.stats.retries == 0 and client.stats.failures == 1
+
+
+def test_resilient_client_hedge_answers_while_a_sync_attempt_stalls() -> None:
+    config = AgentConfig()
+    inner, client = _warmed_resilient_client()
+    inner.stalled = {inner.calls + 1}
+    assert client.generate("route me", config=config) == MockLLMClient().generate("route me", config=config)
+    assert not inner.release.is_set()
+    assert client.stats.hedges == 1 and client.stats.hedge_wins == 1
+    inner.release.set()
+    client.close()
+
+
+def test_resilient_client_hedge_answers_while_an_async_attempt_stalls() -> None:
+    config = AgentConfig()
+    inner, client = _warmed_resilient_client()
+    inner.stalled = {inner.calls + 1}
+    assert asyncio.run(client.agenerate("route me", config=config)) == MockLLMClient().generate(
+        "route me", config=config
+    )
+    assert not inner.release.is_set()
+    assert client.stats.hedges == 1 and client.stats.hedge_wins == 1
+    client.close()
+
+
+def test_resilient_client_takes_the_hedge_when_a_stalled_attempt_fails() -> None:
+    config = AgentConfig()
+    inner, client = _warmed_resilient_client()
+    first = inner.calls + 1
+    inner.stalled = {first, first + 1}
+    inner.doomed = {first}
+    with ThreadPoolExecutor(max_workers=1) as caller:
+        pending = caller.submit(client.generate, "route me", config=config)
+        while inner.calls < first + 1:
+            time.sleep(0.001)
+        inner.release.set()
+        assert pending.result() == MockLLMClient().generate("route me", config=config)
+    assert client.stats.hedge_wins == 1 and client.stats.retries == 0
+    client.close()
+
+
+class GatedEchoClient(MockLLMClient):
+    """Answers once `release` is set, counting provider calls; the prompt ``fail`` raises instead."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, *, config, context=None):
+        with self.lock:
+            self.calls += 1
+        self.release.wait()
+        if prompt == "fail":
+            raise RuntimeError("provider failed")
+        return super().generate(prompt, config=config, context=context)
+
+    async def agenerate(self, prompt, *, config, context=None):
+        with self.lock:
+            self.calls += 1
+        while not self.release.is_set():
+            await asyncio.sleep(0.001)
+        return super().generate(prompt, config=config, context=context)
+
+
+async def _until(predicate) -> None:
+    while not predicate():
+        await asyncio.sleep(0.001)
+
+
+def test_single_flight_client_shares_identical_in_flight_calls() -> None:
+    config = AgentConfig()
+    inner = GatedEchoClient()
+    client = SingleFlightLLMClient(inner)
+    prompts = ["route ticket"] * 8 + ["route other"] * 4
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        futures = [pool.submit(client.generate, prompt, config=config) for prompt in prompts]
+        _wait_for(lambda: client.stats.suppressed == 10)
+        inner.release.set()
+    outputs = [future.result() for future in futures]
+    assert outputs == [MockLLMClient().generate(prompt, config=config) for prompt in prompts]
+    assert inner.calls == 2 and client.stats.leaders == 2
+
+
+def test_single_flight_client_shares_a_leader_failure() -> None:
+    config = AgentConfig()
+    inner = GatedEchoClient()
+    client = SingleFlightLLMClient(inner)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        failures = [pool.submit(client.generate, "fail", config=config) for _ in range(3)]
+        _wait_for(lambda: client.stats.suppressed == 2)
+        inner.release.set()
+    for future in failures:
+        with pytest.raises(RuntimeError, match="provider failed"):
+            future.result()
+    assert inner.calls == 1
+
+
+def test_single_flight_client_survives_cancelled_followers() -> None:
+    config = AgentConfig()
+    inner = GatedEchoClient()
+    client = SingleFlightLLMClient(inner)
+
+    async def burst():
+        leader = asyncio.ensure_future(client.agenerate("summary", config=config))
+        await _until(lambda: inner.calls == 1)
+        followers = [asyncio.ensure_future(client.agenerate("summary", config=config)) for _ in range(3)]
+        await _until(lambda: client.stats.suppressed == 3)
+        followers[0].cancel()
+        inner.release.set()
+        results = await asyncio.gather(leader, *followers[1:])
+        threaded = await asyncio.to_thread(client.generate, "summary", config=config)
+        return results, threaded
+
+    results, threaded = asyncio.run(burst())
+    assert len(set(results)) == 1 and inner.calls == 2 and threaded == results[0]
+
+
+def test_single_flight_client_reruns_for_followers_of_a_cancelled_leader() -> None:
+    config = AgentConfig()
+    inner = GatedEchoClient()
+    client = SingleFlightLLMClient(inner)
+
+    async def cancelled_leader():
+        leader = asyncio.ensure_future(client.agenerate("again", config=config))
+        await _until(lambda: inner.calls == 1)
+        follower = asyncio.ensure_future(client.agenerate("again", config=config))
+        await _until(lambda: client.stats.suppressed == 1)
+        leader.cancel()
+        inner.release.set()
+        return await follower
+
+    assert asyncio.run(cancelled_leader()) == MockLLMClient().generate("again", config=config)
+    assert inner.calls == 2 and client.stats.suppressed == 1
+
+
+TIMING = SimulationConfig(
+    latency="fixed", first_token_seconds=0.02, tokens_per_second=200, output_tokens=8, output_tokens_sigma=0
+)
+INSTANT = SimulationConfig(latency="fixed", first_token_seconds=0, tokens_per_second=0)
+
+
+def _draws(settings: SimulationConfig, config: AgentConfig):
+    """(first-token wait, output tokens) of 200 requests, with waits recorded instead of slept."""
+    waits = []
+    client = SimulatedLLMClient(settings, sleep=waits.append)
+    draws = []
+    for _ in range(200):
+        waits.clear()
+        text = client.generate("Summarize the outage.", config=config)
+        draws.append((waits[0], len(text.split())))
+    assert client.stats.output_tokens == sum(tokens for _latency, tokens in draws)
+    return draws
+
+
+def test_simulated_client_models_latency_and_streaming() -> None:
+    config = AgentConfig(max_tokens=16)
+    waits = []
+    client = SimulatedLLMClient(TIMING, sleep=waits.append)
+    text = client.generate("Summarize the outage.", config=config)
+    assert waits == [0.02, pytest.approx(8 / 200)]
+    assert len(text.split()) == 8 and client.stats.output_tokens == 8
+    assert client.stats.busy_seconds == pytest.approx(0.06)
+
+    waits.clear()
+    chunks = list(client.generate_stream("Summarize the outage.", config=config))
+    assert "".join(chunks) == text and len(chunks) == 8
+    assert waits == [0.02] + [pytest.approx(1 / 200)] * 7
+    assert asyncio.run(client.agenerate("Summarize the outage.", config=config)) == text
+    assert client.stats.requests == 3 and client.stats.busy_seconds == pytest.approx(0.175)
+
+
+def test_simulated_client_draws_reproducible_lognormal_and_histogram_timings() -> None:
+    config = AgentConfig(max_tokens=16)
+    lognormal = SimulationConfig(output_tokens=10, output_tokens_sigma=0.5, seed=3)
+    assert _draws(lognormal, config) == _draws(lognormal, config)
+    assert len({tokens for _latency, tokens in _draws(lognormal, config)}) > 3
+    assert max(tokens for _latency, tokens in _draws(lognormal, config)) <= config.max_tokens
+    replay = SimulationConfig(latency="histogram", histogram=((0.1, 9.0), (2.0, 1.0)))
+    latencies = [latency for latency, _tokens in _draws(replay, config)]
+    assert set(latencies) == {0.1, 2.0} and 150 < latencies.count(0.1) < 200
+    with pytest.raises(ValueError):
+        SimulatedLLMClient(SimulationConfig(latency="histogram"))
+    assert SimulatedLLMClient().config == SimulationConfig()
+
+
+def test_simulated_client_injects_retryable_faults() -> None:
+    config = AgentConfig()
+    faulty = SimulatedLLMClient(dataclasses.replace(INSTANT, rate_limit_rate=0.2, error_rate=0.2))
+    outcomes = []
+    for _ in range(200):
+        try:
+            faulty.generate("hi", config=config)
+            outcomes.append("ok")
+        except SimulatedRateLimitError as exc:
+            assert is_overload(exc) and is_retryable(exc)
+            outcomes.append("429")
+        except SimulatedServerError as exc:
+            assert is_retryable(exc) and not is_overload(exc)
+            outcomes.append("503")
+    assert faulty.stats.rate_limited == outcomes.count("429") and 20 < outcomes.count("429") < 60
+    assert faulty.stats.errors == outcomes.count("503") and 20 < outcomes.count("503") < 60
+    resilient = ResilientLLMClient(faulty, ResilienceConfig(max_attempts=8, backoff_base=0.0001), seed=0)
+    assert all(resilient.generate("hi", config=config) for _ in range(50))
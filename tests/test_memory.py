@@ -0,0 +1,551 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_agent_patterns import (
+    AgentConfig,
+    EmbeddingConfig,
+    MemoryConfig,
+    registry,
+    resolve_embedder,
+    resolve_memory,
+)
+from ai_agent_patterns.llm import CachingEmbeddingClient
+from ai_agent_patterns.memory import (
+    CachedMemoryStore,
+    ConcurrentConversationBuffer,
+    ConcurrentKeywordVectorMemory,
+    ConversationBuffer,
+    HashingEmbedder,
+    KeywordVectorMemory,
+    LSHVectorMemory,
+    MutableMemoryStore,
+    PersistentVectorMemory,
+    SessionStore,
+    SparseVectorMemory,
+    estimate_tokens,
+)
+from ai_agent_patterns.memory import ann as ann_module
+from ai_agent_patterns.memory import query_cache as query_cache_module
+from ai_agent_patterns.memory import sessions as sessions_module
+from ai_agent_patterns.memory import vector as vector_module
+from ai_agent_patterns.memory.ingest import ingest_corpus, load_index
+from ai_agent_patterns.memory.sessions import shared_session_store
+from ai_agent_patterns.memory.text import TokenTable, query_terms
+from ai_agent_patterns.memory.vector import cosine_similarity, tokenize
+
+
+def _brute_force_query(items, text, limit):
+    query_vec = Counter(tokenize(text))
+    scored = [(item, cosine_similarity(query_vec, Counter(tokenize(item["content"])))) for item in items]
+    scored.sort(key=lambda pair: pair[1], reverse=True)
+    return scored[:limit]
+
+
+def test_keyword_vector_memory_matches_brute_force_cosine() -> None:
+    rng = random.Random(7)
+    vocabulary = ["outage", "billing", "refund", "latency", "login", "invoice", "error", "agent", "Sync!"]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(0, 8)))} for _ in range(200)]
+    memory = KeywordVectorMemory()
+    for item in items:
+        memory.add(item)
+
+    for text in ["billing refund", "outage outage latency", "nothing matches", "", "sync ERROR agent"]:
+        for limit in (1, 3, 250):
+            expected = [(id(item), score) for item, score in _brute_force_query(items, text, limit)]
+            assert [(id(item), score) for item, score in memory.query(text, limit=limit)] == expected
+
+
+def test_sparse_memory_matches_keyword_cosine_and_ranks_bm25() -> None:
+    pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+
+    rng = random.Random(11)
+    vocabulary = ["outage", "billing", "refund", "latency", "login", "invoice", "error", "agent"]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(1, 8)))} for _ in range(300)]
+    keyword = KeywordVectorMemory()
+    sparse = SparseVectorMemory()
+    for item in items:
+        keyword.add(item)
+        sparse.add(item)
+
+    queries = ["billing refund", "outage latency latency", "unknown words only"]
+    for expected, actual in zip([keyword.query(q, limit=5) for q in queries], sparse.query_batch(queries, limit=5), strict=True):
+        assert [id(item) for item, _ in actual] == [id(item) for item, _ in expected]
+        assert [score for _, score in actual] == pytest.approx([score for _, score in expected], abs=1e-6)
+
+    bm25 = SparseVectorMemory(weighting="bm25")
+    bm25.add({"content": "billing dispute resolution guide"})
+    bm25.add({"content": "outage incident response playbook"})
+    top_item, score = bm25.query("respond to an outage incident", limit=1)[0]
+    assert "outage" in top_item["content"] and score > 0
+
+
+def test_knowledge_retrieval_uses_configured_memory_backend() -> None:
+    pytest.importorskip("scipy")
+
+    config = AgentConfig(memory=MemoryConfig(backend="sparse", weighting="bm25"))
+    result = registry.get("knowledge_retrieval").build_agent(config).run("Billing dispute timeline")
+    assert "Billing disputes" in result.transcript[0]["content"]
+
+
+def test_ingest_corpus_builds_mmap_index_and_reindexes_only_changed_files(tmp_path) -> None:
+    pytest.importorskip("scipy")
+
+    corpus = tmp_path / "docs"
+    corpus.mkdir()
+    (corpus / "billing.md").write_text("Billing disputes are resolved within five business days.", encoding="utf-8")
+    (corpus / "outage.txt").write_text(" ".join(["outage runbook escalation"] * 100), encoding="utf-8")
+    index = tmp_path / "index"
+
+    first = ingest_corpus(corpus, index, max_words=50, overlap=10, workers=1)
+    assert (first.indexed, first.reused) == (2, 0)
+    memory = load_index(index)
+    assert len(memory) == first.chunks > 2
+    top, _score = memory.query("billing dispute", limit=1)[0]
+    assert top["source"] == "billing.md"
+
+    (corpus / "billing.md").write_text("Refunds for billing errors ship within ten days.", encoding="utf-8")
+    os.utime(corpus / "outage.txt")
+    second = ingest_corpus(corpus, index, max_words=50, overlap=10, workers=2)
+    assert (second.indexed, second.reused, second.sources) == (1, 1, 2)
+
+    reloaded = load_index(index, weighting="bm25")
+    assert reloaded.query("refunds", limit=1)[0][0]["content"].startswith("Refunds")
+    assert reloaded.query("outage escalation", limit=1)[0][0]["source"] == "outage.txt"
+
+    config = AgentConfig(memory=MemoryConfig(index_path=str(index)))
+    result = registry.get("knowledge_retrieval").build_agent(config).run("How long do refunds take?")
+    assert "Refunds" in result.transcript[0]["content"]
+
+    faq = tmp_path / "faq.jsonl"
+    faq.write_text(json.dumps({"id": "q1", "text": "Reset SSO login", "team": "identity"}) + "\n", encoding="utf-8")
+    ingest_corpus(faq, tmp_path / "faq-index", workers=1)
+    assert load_index(tmp_path / "faq-index").query("sso", limit=1)[0][0] == {
+        "content": "Reset SSO login",
+        "source": "faq.jsonl#q1",
+        "chunk": 0,
+        "team": "identity",
+    }
+
+
+def test_ingest_keeps_reserved_fields_reingests_metadata_edits_and_swaps_atomically(
+    tmp_path, monkeypatch
+) -> None:
+    pytest.importorskip("scipy")
+
+    faq = tmp_path / "faq.jsonl"
+    index = tmp_path / "index"
+    record = {"id": "q1", "text": "Reset SSO login", "content": "stale", "chunk": 9, "team": "identity"}
+    faq.write_text(json.dumps(record) + "\n", encoding="utf-8")
+    ingest_corpus(faq, index, workers=1)
+    item = load_index(index).query("sso", limit=1)[0][0]
+    assert (item["content"], item["source"], item["chunk"]) == ("Reset SSO login", "faq.jsonl#q1", 0)
+
+    faq.write_text(json.dumps({**record, "team": "security"}) + "\n", encoding="utf-8")
+    stats = ingest_corpus(faq, index, workers=1)
+    assert (stats.indexed, stats.reused) == (1, 0)
+    assert load_index(index).query("sso", limit=1)[0][0]["team"] == "security"
+
+    faq.write_text(json.dumps({"id": "q1", "text": "Rotate API keys"}) + "\n", encoding="utf-8")
+
+    def crash(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        ingest_corpus(faq, index, workers=1)
+    monkeypatch.undo()
+    assert load_index(index).query("sso", limit=1)[0][0]["team"] == "security"
+    assert ingest_corpus(faq, index, workers=1).indexed == 1
+    assert load_index(index).query("rotate keys", limit=1)[0][0]["content"] == "Rotate API keys"
+    assert len(list(index.glob("gen-*"))) == 2
+
+
+def test_persistent_memory_reloads_compacts_and_matches_keyword_scores(tmp_path) -> None:
+    pytest.importorskip("numpy")
+
+    rng = random.Random(5)
+    vocabulary = ["outage", "billing", "refund", "latency", "login", "invoice", "error", "agent"]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(0, 6))), "n": i} for i in range(120)]
+    keyword = KeywordVectorMemory()
+    path = str(tmp_path / "memory")
+    memory = PersistentVectorMemory(path, segment_rows=16, max_segments=3)
+    for item in items[:100]:
+        keyword.add(item)
+        memory.add(item)
+    memory.close()
+
+    reader = PersistentVectorMemory(path, readonly=True)
+    writer = PersistentVectorMemory(path, segment_rows=16, max_segments=3)
+    assert len(reader) == len(writer) == 100
+    for item in items[100:]:
+        keyword.add(item)
+        writer.add(item)
+    assert writer.fetch(2) == items[-2:]
+
+    for store in (writer, reader):
+        expected_items = keyword._items[: len(store)]
+        baseline = KeywordVectorMemory(list(expected_items))
+        for text in ["billing refund", "outage latency latency", "unknown", ""]:
+            expected = [(item["n"], score) for item, score in baseline.query(text, limit=7)]
+            assert [(item["n"], score) for item, score in store.query(text, limit=7)] == expected
+
+    writer.compact()
+    assert len(writer) == 120 and len(list((tmp_path / "memory").glob("seg-*"))) == 0
+    expected = [(item["n"], score) for item, score in keyword.query("login error", limit=5)]
+    assert [(item["n"], score) for item, score in writer.query("login error", limit=5)] == expected
+    reader.refresh()
+    assert [(item["n"], score) for item, score in reader.query("login error", limit=5)] == expected
+
+
+def test_conversation_buffer_tracks_tokens_and_fetches_within_budget() -> None:
+    buffer = ConversationBuffer(capacity=4, max_tokens=30)
+    for idx in range(6):
+        buffer.add({"role": "user", "content": f"turn {idx} " + "x" * 32})
+    assert [item["content"][:6] for item in buffer.fetch(limit=10)] == ["turn 3", "turn 4", "turn 5"]
+    assert buffer.stats.entries == 3 and buffer.stats.evicted == 3
+    assert buffer.tokens == 3 * 10
+
+    assert [item["content"][:6] for item in buffer.fetch(limit=10, token_budget=25)] == ["turn 4", "turn 5"]
+    assert buffer.fetch(limit=1) == buffer.fetch(limit=10)[-1:]
+
+
+def test_session_store_evicts_spills_and_rehydrates(tmp_path, monkeypatch) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(sessions_module.time, "monotonic", lambda: clock[0])
+    store = SessionStore(max_sessions=2, idle_ttl_seconds=60, spill_path=str(tmp_path / "sessions.sqlite"))
+    store.get("a").remember({"role": "user", "content": "billing refund"})
+    store.get("b").remember({"role": "user", "content": "login error"})
+    store.get("c")
+    assert "a" not in store and store.stats.evicted == 1 and store.stats.spilled == 1
+
+    restored = store.get("a")
+    assert restored.conversation.fetch() == [{"role": "user", "content": "billing refund"}]
+    assert restored.vectors.query("refund", limit=1)[0][1] > 0
+    assert store.stats.rehydrated == 1 and "b" not in store
+
+    clock[0] = 120.0
+    store.get("d")
+    assert "a" not in store and "c" not in store and store.stats.expired == 2
+    assert store.stats.tokens == store.get("d").tokens == 0
+
+    capped = SessionStore(max_total_tokens=10)
+    capped.get("x").remember({"content": "y" * 20})
+    capped.get("z").remember({"content": "y" * 20})
+    assert "x" not in capped and "z" in capped and capped.stats.tokens == capped.get("z").tokens
+    store.close()
+
+
+def test_session_store_reuses_live_evicted_sessions_and_prunes_spill(tmp_path, monkeypatch) -> None:
+    store = SessionStore(max_sessions=1, spill_path=str(tmp_path / "sessions.sqlite"), spill_ttl_seconds=60)
+    held = store.get("a")
+    held.remember({"role": "user", "content": "first"})
+    store.get("b")
+    assert "a" not in store
+    held.remember({"role": "user", "content": "second"})
+    assert store.get("a") is held
+    store.get("b")
+    contents = [entry["content"] for entry in held.conversation.fetch()]
+    assert contents == ["first", "second"]
+
+    assert store.spill is not None and store.spill.get("a", time.time()) is not None
+    monkeypatch.setattr(sessions_module, "_PURGE_EVERY", 1)
+    later = time.time() + 3600
+    monkeypatch.setattr(sessions_module.time, "time", lambda: later)
+    store.get("c")
+    assert store.spill.get("a", 0.0) is None and store.spill.get("b", 0.0) is not None
+    store.close()
+
+
+def test_memory_management_isolates_sessions() -> None:
+    agent = registry.get("memory_management").build_agent(AgentConfig())
+    agent.run("my invoice number is 4411", context={"session_id": "alice"})
+    agent.run("my laptop shows a login error", context={"session_id": "bob"})
+    alice = agent.run("what is my invoice number", context={"session_id": "alice"})
+    bob = agent.run("what is my invoice number", context={"session_id": "bob"})
+    recalled = {
+        name: next(step["content"] for step in result.transcript if step.get("step") == "memory_recall")
+        for name, result in (("alice", alice), ("bob", bob))
+    }
+    assert "4411" in recalled["alice"] and "4411" not in recalled["bob"]
+
+    store = shared_session_store(AgentConfig().sessions, AgentConfig().memory, AgentConfig().embedding)
+    created = store.stats.created
+    anonymous = registry.get("memory_management").build_agent(AgentConfig())
+    anonymous.run("my invoice number is 7788")
+    recall = anonymous.run("what is my invoice number")
+    assert "7788" in next(step["content"] for step in recall.transcript if step.get("step") == "memory_recall")
+    assert store.stats.created == created
+
+
+def test_hashing_embedder_is_deterministic_and_normalised() -> None:
+    first, second = HashingEmbedder(dimensions=64), HashingEmbedder(dimensions=64)
+    vector = first.embed("Billing refund refund!")
+    assert vector == second.embed("billing REFUND refund")
+    assert abs(sum(value * value for value in vector) - 1.0) < 1e-9
+    assert first.embed("") == [0.0] * 64
+    assert HashingEmbedder(dimensions=64, seed=1).embed("billing") != first.embed("billing")
+
+
+def test_lsh_vector_memory_matches_exact_search_when_probing_every_bucket() -> None:
+    pytest.importorskip("numpy")
+
+    rng = random.Random(11)
+    vocabulary = [f"term{idx}" for idx in range(60)]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(1, 10))), "n": n} for n in range(400)]
+    memory = LSHVectorMemory(dimensions=128, tables=4, bits=4, exact_threshold=0)
+    memory.extend(items[:300])
+    for item in items[300:]:
+        memory.add(item)
+
+    for text in ["term1 term2", "term5 term5 term40", "unknown words", ""]:
+        exact = [(item["n"], score) for item, score in memory.query_exact(text, limit=5)]
+        assert [(item["n"], score) for item, score in memory.query(text, limit=5, probes=15)] == exact
+        narrow = memory.query(text, limit=5, probes=0)
+        assert len(narrow) == 5 and all(score <= exact[0][1] for _item, score in narrow)
+
+
+def test_lsh_backend_selected_through_memory_config() -> None:
+    pytest.importorskip("numpy")
+
+    config = AgentConfig(memory=MemoryConfig(backend="lsh", lsh_probes=4))
+    store = resolve_memory(config)
+    assert isinstance(store, LSHVectorMemory) and store.probes == 4
+
+    for name in ("knowledge_retrieval", "memory_management"):
+        result = registry.get(name).build_agent(config).run("billing dispute", context={"session_id": "lsh"})
+        assert result.output
+
+
+def test_concurrent_stores_stay_consistent_under_parallel_reads_and_writes() -> None:
+    rng = random.Random(5)
+    vocabulary = ["outage", "billing", "refund", "latency", "login", "invoice"]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(1, 6))), "n": n} for n in range(2000)]
+    memory = ConcurrentKeywordVectorMemory(batch_size=16)
+    buffer = ConcurrentConversationBuffer(capacity=8)
+
+    def write(chunk):
+        for item in chunk:
+            memory.add(item)
+            buffer.add(item)
+
+    def read(text):
+        for _ in range(50):
+            results = memory.query(text, limit=5)
+            assert all(score >= 0 for _item, score in results)
+            recent = buffer.fetch(limit=8)
+            assert len(recent) <= 8 and len({id(entry) for entry in recent}) == len(recent)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(write, items[start::4]) for start in range(4)]
+        futures += [pool.submit(read, text) for text in ("billing refund", "login", "outage latency", "")]
+        for future in futures:
+            future.result()
+
+    memory.flush()
+    assert len(memory) == len(items)
+    baseline = KeywordVectorMemory(list(memory._items))
+    for text in ("billing refund", "invoice invoice login", ""):
+        assert memory.query(text, limit=10) == baseline.query(text, limit=10)
+    assert buffer.stats.added == len(items) and buffer.stats.entries == 8
+    assert buffer.tokens == sum(estimate_tokens(entry["content"]) for entry in buffer.fetch(limit=8))
+
+
+def test_concurrent_keyword_memory_publishes_from_writers_not_readers() -> None:
+    memory = ConcurrentKeywordVectorMemory(batch_size=100, flush_interval=0.05)
+    memory.add({"content": "billing refund"})
+    assert memory.query("billing") == [] and len(memory) == 0
+    deadline = time.monotonic() + 5
+    while not len(memory) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [item["content"] for item, _score in memory.query("billing")] == ["billing refund"]
+
+    eager = ConcurrentKeywordVectorMemory(flush_interval=0)
+    eager.add({"content": "login error"})
+    assert len(eager) == 1
+
+
+def test_concurrent_keyword_memories_share_one_flusher_thread() -> None:
+    stores = [ConcurrentKeywordVectorMemory(batch_size=100, flush_interval=0.01) for _ in range(20)]
+    for index, store in enumerate(stores):
+        store.add({"content": f"ticket {index}"})
+    flushers = [thread for thread in threading.enumerate() if thread.name == "keyword-memory-flusher"]
+    assert len(flushers) == 1
+    deadline = time.monotonic() + 5
+    while not all(len(store) for store in stores) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert all(len(store) == 1 for store in stores)
+
+
+def test_keyword_backend_reads_its_own_writes() -> None:
+    store = resolve_memory(AgentConfig())
+    store.add({"content": "refunds are issued within five business days"})
+    assert [item["content"] for item, _score in store.query("refunds")] == [
+        "refunds are issued within five business days"
+    ]
+
+    config = AgentConfig(memory=MemoryConfig(query_cache_size=None))
+    result = registry.get("knowledge_retrieval").build_agent(config).run("How long do refunds take?")
+    assert result.transcript[0]["content"]
+
+
+def test_lsh_memory_takes_vectors_from_the_configured_embedder() -> None:
+    pytest.importorskip("numpy")
+
+    config = AgentConfig(memory=MemoryConfig(backend="lsh"), embedding=EmbeddingConfig(dimensions=64))
+    embedder = resolve_embedder(config)
+    assert isinstance(embedder, CachingEmbeddingClient) and embedder is resolve_embedder(config)
+    store = resolve_memory(config)
+    assert store.embedder is embedder and store.dimensions == 64
+
+    requests = embedder.requests
+    store.extend([{"content": "billing refund"}, {"content": "login error"}])
+    assert embedder.requests == requests + 1
+    resolve_memory(config).extend([{"content": "billing refund"}, {"content": "login error"}])
+    assert embedder.requests == requests + 1
+    misses = embedder.stats.misses
+    assert store.query("refund billing", limit=1)[0][0]["content"] == "billing refund"
+    assert embedder.requests == requests + 2 and embedder.stats.misses == misses
+
+
+@pytest.mark.parametrize("precision, max_bytes_per_row", [("float16", 2 * 128), ("int8", 128 + 4)])
+def test_quantized_lsh_memory_shrinks_vectors_and_reranks_exactly(precision, max_bytes_per_row) -> None:
+    pytest.importorskip("numpy")
+
+    rng = random.Random(13)
+    vocabulary = [f"term{idx}" for idx in range(80)]
+    items = [{"content": " ".join(rng.choices(vocabulary, k=rng.randint(2, 12))), "n": n} for n in range(500)]
+    full = LSHVectorMemory(dimensions=128, exact_threshold=10_000)
+    quantized = LSHVectorMemory(dimensions=128, exact_threshold=10_000, precision=precision)
+    reranked = LSHVectorMemory(dimensions=128, exact_threshold=10_000, precision=precision, rerank=20)
+    for memory in (full, quantized, reranked):
+        memory.extend(items)
+
+    assert quantized.vector_bytes() <= len(items) * max_bytes_per_row < full.vector_bytes()
+    assert abs(quantized.embeddings() - full.embeddings()).max() < 0.01
+    for text in ["term1 term2 term3", "term7 term7 term50", "term79"]:
+        expected = full.query(text, limit=5)
+        approximate = quantized.query(text, limit=5)
+        assert len({id(item) for item, _ in expected} & {id(item) for item, _ in approximate}) >= 4
+        exact = reranked.query(text, limit=5)
+        assert [id(item) for item, _ in exact] == [id(item) for item, _ in expected]
+        assert all(abs(a - b) < 1e-5 for (_, a), (_, b) in zip(exact, expected, strict=True))
+
+
+def test_tokenize_matches_per_character_reference_and_interns_ids() -> None:
+    def reference(text):
+        cleaned = ("".join(ch for ch in raw.lower() if ch.isalnum()) for raw in text.split())
+        return [token for token in cleaned if token]
+
+    rng = random.Random(17)
+    alphabet = "abcXYZ019 _-!?.,'\t\nÉéßİıΣσ中文٣́  "
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert tokenize(text) == reference(text)
+
+    table = TokenTable()
+    ids = table.encode(tokenize("Refund the refund, then REFUND!"))
+    assert ids == array("I", [0, 1, 0, 2, 0]) and len(table) == 3
+    assert table.get("then") == 2 and table.get("missing") is None and table.token(1) == "the"
+
+    query_terms.cache_clear()
+    assert query_terms("Login error: login") == (("login", 2), ("error", 1))
+    query_terms("Login error: login")
+    assert query_terms.cache_info().hits == 1
+
+
+def _mutate_and_compare(memory, monkeypatch, module) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: clock[0])
+    rng = random.Random(19)
+    vocabulary = ["outage", "billing", "refund", "latency", "login", "invoice", "error", "agent"]
+    live = {}
+    for step in range(300):
+        key = f"doc{rng.randint(0, 60)}"
+        action = rng.random()
+        if action < 0.6:
+            item = {"content": " ".join(rng.choices(vocabulary, k=rng.randint(1, 6))), "step": step}
+            ttl = 5.0 if rng.random() < 0.2 else None
+            memory.upsert(key, item, ttl_seconds=ttl)
+            live.pop(key, None)
+            live[key] = (item, None if ttl is None else clock[0] + ttl)
+        elif action < 0.8:
+            _item, expires = live.pop(key, (None, 0.0))
+            deleted = memory.delete(key)
+            if expires is None or expires > clock[0]:
+                assert deleted
+        else:
+            clock[0] += 1.0
+    survivors = [item for item, expires in live.values() if expires is None or expires > clock[0]]
+    getattr(memory, "flush", lambda: None)()
+
+    def check() -> None:
+        fresh = type(memory)() if isinstance(memory, KeywordVectorMemory) else memory.__class__(
+            dimensions=memory.dimensions, tables=memory.tables, bits=memory.bits, exact_threshold=10**6
+        )
+        for item in survivors:
+            fresh.add(item)
+        getattr(fresh, "flush", lambda: None)()
+        assert [item["step"] for item in memory.fetch(limit=10)] == [item["step"] for item in survivors[-10:]]
+        for text in ["billing refund", "outage latency latency", "nothing", ""]:
+            expected = [(item["step"], round(score, 5)) for item, score in fresh.query(text, limit=len(live) + 5)]
+            actual = [(item["step"], round(score, 5)) for item, score in memory.query(text, limit=len(live) + 5)]
+            assert actual == expected
+
+    check()
+    memory.purge_expired()
+    assert len(memory) == len(survivors)
+    check()
+    memory.compact()
+    assert len(memory) == len(survivors)
+    check()
+
+
+def test_keyword_memories_upsert_delete_expire_and_compact(monkeypatch) -> None:
+    for memory in (KeywordVectorMemory(), ConcurrentKeywordVectorMemory(batch_size=8)):
+        assert isinstance(memory, KeywordVectorMemory)
+        store: MutableMemoryStore = memory
+        _mutate_and_compare(store, monkeypatch, vector_module)
+        assert not memory.delete("missing")
+
+
+def test_lsh_memory_upsert_delete_expire_and_compact(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+
+    _mutate_and_compare(LSHVectorMemory(dimensions=128, tables=4, bits=4, exact_threshold=10**6), monkeypatch, ann_module)
+
+
+def test_cached_memory_store_serves_hits_until_a_write_or_ttl_invalidates(monkeypatch) -> None:
+    clock = [50.0]
+    monkeypatch.setattr(query_cache_module.time, "monotonic", lambda: clock[0])
+    inner = ConcurrentKeywordVectorMemory()
+    store = CachedMemoryStore(inner, max_entries=2)
+    store.add({"content": "billing dispute resolved"})
+    store.add({"content": "outage runbook"})
+
+    first = store.query("Billing?", limit=1)
+    assert store.query("billing", limit=1) == first and store.stats.hits == 1
+    store.query("billing", limit=2)
+    store.query("outage", limit=1)
+    assert store.stats.evictions == 1 and len(store) == 2
+
+    store.upsert("faq", {"content": "billing billing faq"}, ttl_seconds=10)
+    assert store.query("billing", limit=1)[0][0]["content"] == "billing billing faq"
+    assert store.stats.misses == 4
+    assert store.query("billing", limit=1)[0][0]["content"] == "billing billing faq"
+    assert store.stats.hits == 2
+
+    clock[0] += 11
+    assert store.query("billing", limit=1) == first
+    assert store.stats.stale == 1 and store.stats.hit_rate == 2 / 7
+    assert store.delete("faq") and not store.delete("faq")
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import logging
+import threading
+
 from ai_agent_patterns.memory import KeywordVectorMemory
+from ai_agent_patterns.types import AgentState
+from ai_agent_patterns.workflows.dag import build_step_graph, declare_step, run_dag
 
 
 def test_keyword_vector_memory_similarity() -> None:
@@ -13,3 +18,53 @@ def test_keyword_vector_memory_similarity() -> None:
     top_item, score = results[0]
     assert "outage" in top_item["content"]
     assert score > 0
+
+
+def test_run_dag_runs_independent_steps_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def writer(key: str):
+        def _run(state):
+            barrier.wait()
+            state.scratchpad[key] = key.upper()
+            state.transcript.append({"step": key, "content": key})
+            return state
+
+        _run.__name__ = key
+        return declare_step(_run, writes=[key])
+
+    def combine(state):
+        state.output = state.scratchpad["left"] + state.scratchpad["right"]
+        state.transcript.append({"step": "combine", "content": state.output})
+        return state
+
+    steps = [writer("left"), writer("right"), declare_step(combine, reads=["left", "right"], writes=["output"])]
+    assert build_step_graph(steps) == {0: set(), 1: set(), 2: {0, 1}}
+
+    state = run_dag(steps, AgentState(input_text="x"))
+    assert state.output == "LEFTRIGHT"
+    assert [entry["step"] for entry in state.transcript] == ["left", "right", "combine"]
+
+
+def test_run_dag_merges_in_place_mutations_by_value(caplog) -> None:
+    def tag(state):
+        state.scratchpad["tags"].append("billing")
+        state.scratchpad["notes"].append("unexpected")
+        return state
+
+    def count(state):
+        state.scratchpad["count"] = len(state.scratchpad["tags"])
+        return state
+
+    steps = [
+        declare_step(tag, reads=["tags"], writes=["tags"]),
+        declare_step(count, reads=["tags"], writes=["count"]),
+    ]
+    initial = AgentState(input_text="x", scratchpad={"tags": ["urgent"], "notes": []})
+    with caplog.at_level(logging.WARNING, logger="ai_agent_patterns.dag"):
+        state = run_dag(steps, initial)
+
+    assert state.scratchpad["tags"] == ["urgent", "billing"]
+    assert state.scratchpad["count"] == 2
+    assert state.scratchpad["notes"] == []
+    assert "undeclared keys ['notes']" in caplog.text